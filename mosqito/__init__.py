@@ -3,11 +3,13 @@ from mosqito.sound_level_meter.noct_spectrum.noct_synthesis import noct_synthesi
 from mosqito.sound_level_meter.comp_spectrum import comp_spectrum
 
 from mosqito.sq_metrics.loudness.loudness_ecma.loudness_ecma import loudness_ecma
+from mosqito.sq_metrics.loudness.loudness_ecma.ecma418_analysis import Ecma418Analysis
 from mosqito.sq_metrics.loudness.loudness_zwst.loudness_zwst import loudness_zwst
 from mosqito.sq_metrics.loudness.loudness_zwst.loudness_zwst_freq import loudness_zwst_freq
 from mosqito.sq_metrics.loudness.loudness_zwst.loudness_zwst_perseg import loudness_zwst_perseg
 
 from mosqito.sq_metrics.loudness.loudness_zwtv.loudness_zwtv import loudness_zwtv
+from mosqito.sq_metrics.loudness.loudness_zwtv.loudness_zwtv_stream import LoudnessZwtvStream
 
 from mosqito.sq_metrics.loudness.utils.equal_loudness_contours import equal_loudness_contours
 
@@ -22,6 +24,7 @@ from mosqito.sq_metrics.tonality.tone_to_noise_ecma.tnr_ecma_freq import tnr_ecm
 from mosqito.sq_metrics.roughness.roughness_dw.roughness_dw import roughness_dw
 from mosqito.sq_metrics.roughness.roughness_dw.roughness_dw_freq import roughness_dw_freq
 from mosqito.sq_metrics.roughness.roughness_ecma.roughness_ecma import roughness_ecma
+from mosqito.sq_metrics.roughness.roughness_ecma.roughness_ecma_stream import RoughnessEcmaStream
 
 from mosqito.sq_metrics.sharpness.sharpness_din.sharpness_din_st import sharpness_din_st
 from mosqito.sq_metrics.sharpness.sharpness_din.sharpness_din_tv import sharpness_din_tv
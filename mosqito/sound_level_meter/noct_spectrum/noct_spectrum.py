@@ -9,9 +9,10 @@ from mosqito.sound_level_meter.noct_spectrum._n_oct_time_filter import (
     _n_oct_time_filter,
 )
 from mosqito.sound_level_meter.noct_spectrum._center_freq import _center_freq
+from mosqito.utils._parallel_map import _parallel_map
 
 
-def noct_spectrum(sig, fs, fmin, fmax, n=3, G=10, fr=1000):
+def noct_spectrum(sig, fs, fmin, fmax, n=3, G=10, fr=1000, workers=1):
     """Compute nth-octave band spectrum
 
     This function computes the rms level of a signal for each third octave band
@@ -36,6 +37,11 @@ def noct_spectrum(sig, fs, fmin, fmax, n=3, G=10, fr=1000):
         Reference frequency. Shall be set to 1 kHz for audible frequency
         range, to 1 Hz for infrasonic range (f < 20 Hz) and to 1 MHz for
         ultrasonic range (f > 31.5 kHz)
+    workers : int, optional
+        Number of threads used to filter the bands in parallel.
+        Default is 1
+        Experimental: the speed-up has only been measured on a
+        single-core machine so far, where there is none.
 
     Returns
     -------
@@ -85,8 +91,10 @@ def noct_spectrum(sig, fs, fmin, fmax, n=3, G=10, fr=1000):
     alpha_vec, _, _ = _filter_bandwidth(fc_vec, n=n)
 
     # Calculation of the rms level of the signal in each band
-    spec = []
-    for fc, alpha in zip(fc_vec, alpha_vec):
-        spec.append(_n_oct_time_filter(sig, fs, fc, alpha))
+    spec = _parallel_map(
+        lambda band: _n_oct_time_filter(sig, fs, *band),
+        zip(fc_vec, alpha_vec),
+        workers,
+    )
 
     return squeeze(array(spec)), fpref
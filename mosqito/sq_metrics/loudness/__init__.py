@@ -8,6 +8,7 @@ Loudness ECMA
    :maxdepth: 1
    
    /source/reference/mosqito.sq_metrics.loudness.loudness_ecma.loudness_ecma
+   /source/reference/mosqito.sq_metrics.loudness.loudness_ecma.ecma418_analysis
    
 Stationnary loudness ISO 532-1:2017
 ============================
@@ -27,11 +28,15 @@ Time-varying loudness ISO 532-1:2017
    :maxdepth: 1
 
    /source/reference/mosqito.sq_metrics.loudness.loudness_zwtv.loudness_zwtv
+   /source/reference/mosqito.sq_metrics.loudness.loudness_zwtv.loudness_zwtv_stream
 """
 
 __all__ = ['loudness']
 
 from mosqito.sq_metrics.loudness.loudness_ecma.loudness_ecma import loudness_ecma
+from mosqito.sq_metrics.loudness.loudness_ecma.ecma418_analysis import (
+    Ecma418Analysis,
+)
 from mosqito.sq_metrics.loudness.loudness_zwst.loudness_zwst import loudness_zwst
 from mosqito.sq_metrics.loudness.loudness_zwst.loudness_zwst_freq import (
     loudness_zwst_freq,
@@ -40,3 +45,6 @@ from mosqito.sq_metrics.loudness.loudness_zwst.loudness_zwst_perseg import (
     loudness_zwst_perseg,
 )
 from mosqito.sq_metrics.loudness.loudness_zwtv.loudness_zwtv import loudness_zwtv
+from mosqito.sq_metrics.loudness.loudness_zwtv.loudness_zwtv_stream import (
+    LoudnessZwtvStream,
+)
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from functools import lru_cache
+
 import numpy as np
 import scipy.signal as sp_signal
 
@@ -9,11 +11,21 @@ from mosqito.sq_metrics.loudness.loudness_ecma._ear_filter_design import (
 from mosqito.sq_metrics.loudness.loudness_ecma._auditory_filters_centre_freq import (
     _auditory_filters_centre_freq,
 )
-from mosqito.sq_metrics.loudness.loudness_ecma._gammatone import _gammatone
+from mosqito.sq_metrics.loudness.loudness_ecma._gammatone import _gammatone_sos
 from mosqito.utils import time_segmentation
+from mosqito.utils._parallel_map import _parallel_map
+
+
+# Sampling rate reduction factors of the multirate filter bank, passband
+# edge of the anti-aliasing filters, relative to the reduced Nyquist
+# frequency, and minimum number of samples per period of the centre
+# frequencies at the reduced sampling rates
+MULTIRATE_FACTORS = (8, 4, 2)
+PASSBAND_EDGE = 0.81
+SAMPLES_PER_PERIOD = 12
 
 
-def _band_pass_signals(sig, sb, sh):
+def _band_pass_signals(sig, sb, sh, workers=1, bands=None, factors=None):
     """Compute the band-pass signals as per Clause 5.1.2 to 5.1.5 of
     ECMA-418-2:2020
 
@@ -24,10 +36,22 @@ def _band_pass_signals(sig, sb, sh):
     ----------
     signal: numpy.array
         'Pa', time signal values. The sampling frequency of the signal must be 48000 Hz.
+        The band-pass signals of a float32 signal are in single precision.
     sb: int or list of int
         block size.
     sh: int or list of int
         Hop size.
+    workers: int, optional
+        Number of threads used to filter the bands in parallel.
+        Default is 1
+    bands: array of int, optional
+        Indices of the critical bands to be filtered, the other ones being
+        skipped. By default, all the 53 bands are filtered.
+    factors: array of int, optional
+        Sampling rate reduction factor of each of the 53 bands (see
+        _multirate_factors), the band-pass signal of band z being computed
+        at 48000 / factors[z] Hz. By default, all the bands are computed at
+        48000 Hz.
     Returns
     -------
     block_array_rect: list of numpy.array
@@ -50,29 +74,27 @@ def _band_pass_signals(sig, sb, sh):
 
     # AUDITORY FILTERING BANK (5.1.3)
 
-    # Order of the Outer and Middle ear filter
-    filter_order_k = 5
-    # Sampling frequency
-    fs = 48000.00
-    # Auditory filters centre frequencies
-    centre_freq = _auditory_filters_centre_freq()
+    # The filters are computed in double precision, the band-pass signals of
+    # a single precision signal are stored in single precision
+    dtype = _band_dtype(sig)
 
-    block_bandpass_signals = []
-    for band_number in range(53):
-        bm_mod, am_mod = _gammatone(centre_freq[band_number], k=filter_order_k, fs=fs)
-
-        band_pass_signal = (
-            2.0
-            * (
-                sp_signal.lfilter(
-                    bm_mod,
-                    am_mod,
-                    signal_filtered,
-                    axis=0,
-                )
-            ).real
-        )
-        block_bandpass_signals.append(band_pass_signal)
+    # Signal decimated for each sampling rate of the multirate filter bank
+    if factors is None:
+        factors = np.ones(53, dtype=int)
+    rate_signals = {
+        factor: _decimated_signal(signal_filtered, factor)
+        for factor in np.unique(factors)
+    }
+
+    def _band_pass_signal(band_number):
+        factor = factors[band_number]
+        return _gammatone_filter(
+            rate_signals[factor], band_number, factor=factor
+        ).astype(dtype, copy=False)
+
+    if bands is None:
+        bands = range(53)
+    block_bandpass_signals = _parallel_map(_band_pass_signal, bands, workers)
     return block_bandpass_signals
 
 def _rectified_band_pass_signals(sig, sb, sh):
@@ -112,28 +134,12 @@ def _rectified_band_pass_signals(sig, sb, sh):
 
     # AUDITORY FILTERING BANK (5.1.3)
 
-    # Order of the Outer and Middle ear filter
-    filter_order_k = 5
     # Sampling frequency
     fs = 48000.00
-    # Auditory filters centre frequencies
-    centre_freq = _auditory_filters_centre_freq()
 
     block_array_rect = []
     for band_number in range(53):
-        bm_mod, am_mod = _gammatone(centre_freq[band_number], k=filter_order_k, fs=fs)
-
-        band_pass_signal = (
-            2.0
-            * (
-                sp_signal.lfilter(
-                    bm_mod,
-                    am_mod,
-                    signal_filtered,
-                    axis=0,
-                )
-            ).real
-        )
+        band_pass_signal = _gammatone_filter(signal_filtered, band_number)
 
         # SEGMENTATION OF THE SIGNAL INTO BLOCKS (5.1.4)
 
@@ -158,4 +164,267 @@ def _rectified_band_pass_signals(sig, sb, sh):
 
         block_array_rect.append(np.clip(block_array.T, a_min=0.00, a_max=None))
 
-    return block_array_rect
\ No newline at end of file
+    return block_array_rect
+
+
+def _gammatone_filter(sig, band_number, zi=None, factor=1):
+    """Band-pass signal of an auditory filter (ECMA-418-2:2022 equations 16
+    and 17), computed with the real second-order sections of the filter
+
+    Parameters
+    ----------
+    sig: numpy.array
+        Time signal values, size (n_samples,) or (n_samples, n_channels).
+        The sampling frequency of the signal must be 48000 / factor Hz.
+    band_number: int
+        Index of the critical band (0 to 52)
+    zi : numpy.ndarray, optional
+        Initial states of the second-order sections, size (5, 2) or
+        (5, 2, n_channels). If provided, the final states are returned as
+        well.
+    factor : int, optional
+        Sampling rate reduction factor of the signal. Default is 1
+
+    Outputs
+    -------
+    band_pass_signal: numpy.array
+        Band-pass signal, same size as sig
+    zf : numpy.ndarray
+        Final states of the second-order sections (only if zi is given)
+    """
+    # sosfilt needs writeable sections, the cached ones are copied
+    sos = _gammatone_bank(factor)[band_number].copy()
+    if zi is None:
+        return sp_signal.sosfilt(sos, sig, axis=0)
+    return sp_signal.sosfilt(sos, sig, axis=0, zi=zi)
+
+
+def _band_pass_chunks(sig, spans, workers=1, factors=None):
+    """Band-pass signals over successive spans of a time signal
+
+    The signal is filtered chunk by chunk, the filter states being carried
+    from one chunk to the next one, so that the band-pass signals are the
+    ones of _band_pass_signals applied to the complete signal. Only the
+    samples of the current span are kept in memory.
+
+    Parameters
+    ----------
+    sig: numpy.array
+        Time signal values, size (n_samples,) or (n_samples, n_channels).
+        The sampling frequency of the signal must be 48000 Hz. The band-pass
+        signals of a float32 signal are in single precision.
+    spans: iterable
+        (start, stop) sample indices of the spans, the starts and the stops
+        being non-decreasing.
+    workers: int, optional
+        Number of threads used to filter the bands in parallel.
+        Default is 1
+    factors: array of int, optional
+        Sampling rate reduction factor of each band, see _band_pass_signals.
+        The outer and middle ear filter and the decimation are then applied
+        to the complete signal, only the auditory filters being computed
+        span by span. The band-pass signal of band z over a span (start,
+        stop) covers the samples start // factors[z] to
+        ceil(stop / factors[z]) of its sampling rate.
+
+    Outputs
+    -------
+    bandpass_signals: list of numpy.array
+        Band-pass signals of the 53 bands over each span (generator)
+    """
+    if factors is None:
+        factors = np.ones(53, dtype=int)
+        rate_signals = None
+    else:
+        signal_filtered = sp_signal.sosfilt(_ear_filter_design(), sig, axis=0)
+        rate_signals = {
+            factor: _decimated_signal(signal_filtered, factor)
+            for factor in np.unique(factors)
+        }
+        del signal_filtered
+    sos_ear = _ear_filter_design()
+    zi_ear = np.zeros((sos_ear.shape[0], 2) + sig.shape[1:])
+    zi_bands = np.zeros((53, 5, 2) + sig.shape[1:])
+    dtype = _band_dtype(sig)
+    bandpass_signals = [np.zeros((0,) + sig.shape[1:], dtype)] * 53
+    buffer_start = buffer_stop = 0
+
+    for start, stop in spans:
+        if stop > buffer_stop:
+            if rate_signals is None:
+                signal_filtered, zi_ear = sp_signal.sosfilt(
+                    sos_ear, sig[buffer_stop:stop], axis=0, zi=zi_ear
+                )
+
+            def _band_pass_signal(band_number):
+                factor = factors[band_number]
+                if rate_signals is None:
+                    signal = signal_filtered
+                else:
+                    signal = rate_signals[factor][
+                        -(-buffer_stop // factor) : -(-stop // factor)
+                    ]
+                band_pass_signal, zi_bands[band_number] = _gammatone_filter(
+                    signal, band_number, zi_bands[band_number], factor
+                )
+                return np.concatenate(
+                    (bandpass_signals[band_number], band_pass_signal.astype(dtype, copy=False))
+                )
+
+            bandpass_signals = _parallel_map(_band_pass_signal, range(53), workers)
+            buffer_stop = stop
+        bandpass_signals = [
+            band_pass_signal[start // factor - buffer_start // factor :]
+            for band_pass_signal, factor in zip(bandpass_signals, factors)
+        ]
+        buffer_start = start
+        yield [
+            band_pass_signal[: -(-stop // factor) - start // factor]
+            for band_pass_signal, factor in zip(bandpass_signals, factors)
+        ]
+
+
+def _band_dtype(sig):
+    """Floating point type of the band-pass signals of a signal: single
+    precision for a single precision signal, double precision otherwise"""
+    return np.float32 if sig.dtype == np.float32 else np.float64
+
+
+@lru_cache(maxsize=None)
+def _gammatone_bank(factor=1):
+    """Second-order sections of the 53 auditory filters, designed once per
+    sampling rate
+
+    Parameters
+    ----------
+    factor: int, optional
+        Sampling rate reduction factor, the filters being designed for a
+        sampling frequency of 48000 / factor Hz. Default is 1
+
+    Outputs
+    -------
+    sos: numpy.array
+        Second-order sections of the real band-pass filters, size (53, 5, 6)
+    """
+    # Order of the auditory filters
+    filter_order_k = 5
+    # Sampling frequency
+    fs = 48000.00 / factor
+    # Auditory filters centre frequencies
+    centre_freq = _auditory_filters_centre_freq()
+
+    sos = np.array(
+        [_gammatone_sos(freq, k=filter_order_k, fs=fs) for freq in centre_freq]
+    )
+    # The cached array is made read-only
+    sos.flags.writeable = False
+    return sos
+
+
+@lru_cache(maxsize=None)
+def _rate_factors(attenuation=60):
+    """Largest sampling rate reduction factor (8, 4, 2 or 1) of each
+    auditory filter
+
+    A band can be filtered at 48000 / factor Hz if the response of its
+    filter at 48 kHz is attenuated by more than attenuation dB above the
+    passband of the anti-aliasing filter of _decimated_signal (81 % of the
+    reduced Nyquist frequency): the anti-aliasing filter and the aliases
+    of its transition band then leave the band-pass signal unchanged. The
+    reduced sampling rate must also be at least SAMPLES_PER_PERIOD times the
+    centre frequency of the band, for the sums of the squared rectified
+    samples of _ecma_block_rms to be accurate.
+
+    Parameters
+    ----------
+    attenuation: float, optional
+        Minimum attenuation [dB]. Default is 60
+
+    Outputs
+    -------
+    factors: numpy.array
+        Sampling rate reduction factors, size (53,)
+    """
+    freqs = np.linspace(0, 24000, 9601)
+    centre_freq = _auditory_filters_centre_freq()
+    factors = np.ones(53, dtype=int)
+    for z, sos in enumerate(_gammatone_bank()):
+        _, response = sp_signal.sosfreqz(sos, worN=freqs, fs=48000)
+        response = abs(response) / abs(response).max()
+        for factor in MULTIRATE_FACTORS:
+            stopband = freqs >= PASSBAND_EDGE * 24000 / factor
+            if (
+                response[stopband].max() < 10 ** (-attenuation / 20)
+                and SAMPLES_PER_PERIOD * centre_freq[z] <= 48000 / factor
+            ):
+                factors[z] = factor
+                break
+    factors.flags.writeable = False
+    return factors
+
+
+def _multirate_factors(sb, sh):
+    """Sampling rate reduction factors of the multirate filter bank for
+    blocks of sb samples with hop sizes sh (at 48 kHz)
+
+    The factor of each band is the one of _rate_factors, reduced so that
+    the block size, the hop size and the start of the first block of the
+    band (Formula 19) and the zero padding of _preprocessing are multiples
+    of it.
+
+    Parameters
+    ----------
+    sb: int or list of int
+        Block size, or list of block sizes per band
+    sh: int or list of int
+        Hop size, or list of hop sizes per band
+
+    Outputs
+    -------
+    factors: numpy.array
+        Sampling rate reduction factors, size (53,)
+    """
+    sb = np.broadcast_to(np.asarray(sb, dtype=int), (53,))
+    sh = np.broadcast_to(np.asarray(sh, dtype=int), (53,))
+    factors = _rate_factors().copy()
+    for z in range(53):
+        while any(n % factors[z] for n in (sb[z], sh[z], sb[0] - sb[z], sb.max())):
+            factors[z] //= 2
+    return factors
+
+
+@lru_cache(maxsize=None)
+def _decimation_filter(factor):
+    """Linear phase low-pass FIR filter of the decimation by factor, flat
+    (1e-5) up to 81 % and attenuating by 100 dB above 114 % of the reduced
+    Nyquist frequency"""
+    h = sp_signal.firwin(48 * factor + 1, 1 / factor, window=("kaiser", 10.0))
+    h.flags.writeable = False
+    return h
+
+
+def _decimated_signal(sig, factor):
+    """Signal filtered by the anti-aliasing filter of _decimation_filter
+    and decimated by factor, along the first axis
+
+    The filter is centred on each output sample, the sample m of the
+    decimated signal corresponding to the sample m * factor of sig.
+
+    Parameters
+    ----------
+    sig: numpy.array
+        Time signal values, size (n_samples,) or (n_samples, n_channels)
+    factor: int
+        Decimation factor (1 to return sig unchanged)
+
+    Outputs
+    -------
+    decimated: numpy.array
+        Decimated signal, size (ceil(n_samples / factor),) or
+        (ceil(n_samples / factor), n_channels)
+    """
+    if factor == 1:
+        return sig
+    decimated = sp_signal.upfirdn(_decimation_filter(factor), sig, 1, factor, axis=0)
+    # Delay of the filter, 24 * factor samples at the original rate
+    return decimated[24 : 24 - (-sig.shape[0] // factor)]
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+from numpy import arange, asarray, unique, linspace
+
+
+def _band_selection(bands=None, bark_range=None):
+    """Indices of the critical bands of ECMA-418-2 (2nd Ed, 2022) to be
+    evaluated, given either as indices or as a range of critical band rates
+
+    Parameters
+    ----------
+    bands : list of int, optional
+        Indices of the critical bands, between 0 and 52.
+    bark_range : tuple of float, optional
+        Lowest and highest critical band rates [Bark], the bands whose
+        critical band rate (0.5 to 26.5 Bark by steps of 0.5 Bark) is
+        within the range being selected.
+
+    Outputs
+    -------
+    bands : numpy.array
+        Sorted indices of the selected critical bands, all the 53 bands if
+        neither bands nor bark_range is given.
+    """
+    if bands is not None and bark_range is not None:
+        raise ValueError("ERROR: bands and bark_range cannot be both given")
+
+    if bark_range is not None:
+        bark_axis = linspace(0.5, 26.5, num=53, endpoint=True)
+        bands = arange(53)[(bark_axis >= bark_range[0]) & (bark_axis <= bark_range[1])]
+        if bands.size == 0:
+            raise ValueError("ERROR: bark_range shall contain at least one critical band rate between 0.5 and 26.5 Bark")
+        return bands
+
+    if bands is None:
+        return arange(53)
+
+    bands = unique(asarray(bands, dtype=int))
+    if bands.size == 0 or bands[0] < 0 or bands[-1] > 52:
+        raise ValueError("ERROR: bands shall be indices between 0 and 52")
+    return bands
@@ -1,17 +1,37 @@
 # -*- coding: utf-8 -*-
 
-from numpy import ones, ceil, linspace, arange, mean, int32
-import numpy as np
+from math import gcd
 
-def _ecma_time_segmentation(signal_block, sb, sh, n_new):
+from numpy import (
+    asarray,
+    ones,
+    ceil,
+    arange,
+    clip,
+    sqrt,
+    concatenate,
+    zeros,
+    moveaxis,
+)
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Sampling frequency must be 48 kHz for ECMA-418-2 (2022)
+FS = 48000
+
+
+def _ecma_time_segmentation(signal_block, sb, sh, n_new, bands=None):
     """Function used for the segmentation of a time signal into
     smaller parts of audio (blocks) following Formulas 18 to 20 (section 5.1.5)
     of ECMA-418-2:2022.
 
+    The blocks are strided views of the band signals, the overlapping
+    samples are thus not copied.
+
     Parameters
     ----------
     signal_block: list
-        List of Numpy arrays containing bandpassed signals per critical band
+        List of Numpy arrays containing bandpassed signals per critical band,
+        each of size (n_samples,) or (n_samples, n_channels)
 
     sb: int or list of int
         Block size, or list of block sizes per band
@@ -22,21 +42,131 @@ def _ecma_time_segmentation(signal_block, sb, sh, n_new):
     n_new : int
         Number of samples in signal after zero padding (Eq. 3)
 
+    bands : array of int, optional
+        Indices of the critical bands of the signals of signal_block, which
+        then only contains the signals of these bands. By default, the 53
+        bands.
+
     Returns
     -------
     block_array: list
-        List of 53 two-dimensional arrays of size (nperseg, nseg)
-        containing the segmented signal per critical band.
+        List of read-only arrays (one per band) of size (nseg, nperseg) or
+        (nseg, nperseg, n_channels) containing the segmented signal per
+        critical band.
 
     time: list
         List of  Numpy arrays of size (nseg,) containing the time axis
         corresponding to each segmented signal. For each block, the time
         value chosen is the mean of the segmented time axis.
     """
+    sb, sh, i_start, L_last = _block_parameters(sb, sh, n_new)
+
+    block_array = []
+    time_array = []
+
+    if bands is None:
+        bands = range(53)
+    for signal, z in zip(signal_block, bands):
+        signal, start = _block_start(signal, i_start[z])
+        # Eq. (18), the window axis of the view is moved after the block axis
+        blocks = sliding_window_view(signal, sb[z], axis=0)
+        blocks = blocks[start : start + L_last[z] * sh[z] : sh[z]]
+        block_array.append(moveaxis(blocks, -1, 1))
+        time_array.append(_block_time(sb[z], sh[z], i_start[z], L_last[z]))
+
+    return block_array, time_array
+
 
-    # Sampling frequency must be 48 kHz for ECMA-418-2 (2022)
-    fs = 48000
+def _ecma_block_rms(signal_block, sb, sh, n_new, bands=None, factors=None):
+    """Root-mean-square values of the rectified blocks of the band signals
+    (Formula 22 of ECMA-418-2:2022), without segmenting the signals.
+
+    The squared rectified signal is summed over chunks of gcd(sb, sh)
+    samples, the energy of each block being the sum of its sb / gcd(sb, sh)
+    consecutive chunks. The memory use is thus proportional to the number
+    of samples, whatever the overlap of the blocks.
+
+    Parameters
+    ----------
+    signal_block: list
+        List of Numpy arrays containing bandpassed signals per critical band,
+        each of size (n_samples,) or (n_samples, n_channels)
+
+    sb: int or list of int
+        Block size, or list of block sizes per band
+
+    sh: int or list of int
+        Hop size, or list of hop sizes per band
 
+    n_new : int
+        Number of samples in signal after zero padding (Eq. 3)
+
+    bands : array of int, optional
+        Indices of the critical bands of the signals of signal_block, as in
+        _ecma_time_segmentation. By default, the 53 bands.
+
+    factors : array of int, optional
+        Sampling rate reduction factor of each of the 53 bands, the signal
+        of band z being sampled at 48000 / factors[z] Hz (see
+        _multirate_factors). The blocks then have sb / factors[z] samples
+        and the same duration. The sum of the samples of each block is
+        corrected for the block edges (Euler-Maclaurin formula), so that
+        it estimates the sum of the samples at 48 kHz. By default, all the
+        signals are sampled at 48 kHz.
+
+    Outputs
+    -------
+    rms_array: list
+        List of arrays (one per band) of size (nseg,) or (nseg, n_channels) containing
+        the root-mean-square value of each rectified block per critical band.
+
+    time: list
+        List of  Numpy arrays of size (nseg,) containing the time axis
+        corresponding to each block, as in _ecma_time_segmentation.
+    """
+    sb, sh, i_start, L_last = _block_parameters(sb, sh, n_new)
+
+    rms_array = []
+    time_array = []
+
+    if bands is None:
+        bands = range(53)
+    for signal, z in zip(signal_block, bands):
+        factor = 1 if factors is None else factors[z]
+        sb_z, sh_z = sb[z] // factor, sh[z] // factor
+        signal, start = _block_start(signal, i_start[z] // factor)
+        n_chunk = gcd(int(sb_z), int(sh_z))
+        n_span = (L_last[z] - 1) * sh_z + sb_z
+        # Rectification (5.1.6) and squaring
+        energy = clip(signal[start : start + n_span], 0, None) ** 2
+        energy = energy.reshape((n_span // n_chunk, n_chunk) + energy.shape[1:])
+        energy = energy.sum(axis=1)
+        # Sum over the chunks of each block
+        energy = sliding_window_view(energy, sb_z // n_chunk, axis=0)
+        energy = energy[:: sh_z // n_chunk].sum(axis=-1)
+        if factor > 1:
+            # The sum at 48 kHz of the samples of a block starting at sample
+            # 0 is close to factor * (sum of e_0 to e_{n-1}) + (factor - 1)
+            # / 2 * (e_n - e_0) for the smooth squared signal e at the
+            # reduced rate, e_n being the first sample after the block
+            first = signal[start : start + n_span - sb_z + 1 : sh_z]
+            after = signal[start + sb_z : start + n_span + 1 : sh_z]
+            # Zero after the end of the signal
+            after = concatenate(
+                (after, zeros((L_last[z] - after.shape[0],) + after.shape[1:]))
+            )
+            energy = energy + (factor - 1) / (2 * factor) * (
+                clip(after, 0, None) ** 2 - clip(first, 0, None) ** 2
+            )
+        rms_array.append(sqrt(2 * energy / sb_z))
+        time_array.append(_block_time(sb[z], sh[z], i_start[z], L_last[z]))
+
+    return rms_array, time_array
+
+
+def _block_parameters(sb, sh, n_new):
+    """Block sizes, hop sizes, start indices and number of blocks per band
+    (Formulas 19 and 20 of ECMA-418-2:2022)"""
     if isinstance(sb, int):
         sb = sb * ones(53, dtype=int)
     elif len(sb) != 53:
@@ -47,26 +177,26 @@ def _ecma_time_segmentation(signal_block, sb, sh, n_new):
     elif len(sh) != 53:
         raise ValueError("ERROR: len(sh) shall be either 1 or 53")
 
+    sb = asarray(sb, dtype=int)
+    sh = asarray(sh, dtype=int)
+
     # Eq. (19)
     i_start = sb[0] - sb
     # Eq. (20) - number of blocks for each critical band
     L_last = (ceil((n_new + sh) / sh) - 1).astype("int")
 
-    block_array = []
-    time_array = []
+    return sb, sh, i_start, L_last
 
-    for z in range(53):
-        signal = signal_block[z]
-        # build time vector for signal
-        time = linspace(0, (signal.shape[0] - 1) / fs, signal.shape[0])
-        # Eq. (18)
-        L = arange(L_last[z])
-        idx = (
-            linspace(L * sh[z] + i_start[z], L * sh[z] + i_start[z] + sb[z], sb[z])
-            .astype(int32)
-            .T
-        )
-        block_array.append(signal[idx])
-        time_array.append(mean(time[idx], axis=1))
 
-    return block_array, time_array
+def _block_start(signal, i_start):
+    """Band signal and index of its first block, zeros being added before
+    the signal if the first block starts before it"""
+    if i_start >= 0:
+        return signal, i_start
+    pad = zeros((-i_start,) + signal.shape[1:], dtype=signal.dtype)
+    return concatenate((pad, signal)), 0
+
+
+def _block_time(sb, sh, i_start, L_last):
+    """Time at the middle of each block of a band [s]"""
+    return (arange(L_last) * sh + i_start + (sb - 1) / 2) / FS
@@ -1,5 +1,6 @@
 
 from scipy.special import comb
+from scipy.signal import zpk2sos
 import numpy as np
 
 
@@ -27,19 +28,7 @@ def _gammatone(freq, k=5, fs=48000):
 
     """
 
-    # ECMA-418-2 constants
-    af_f0 = 81.9289
-    c = 0.1618
-
-    # Bandwidth (ECMA 418-2:2022 equation 10)
-    delta_f = np.sqrt((af_f0**2) + ((c * freq) ** 2))
-
-    # Time constant, delay (ECMA 418-2:2022 equation 8)
-    binom = comb(2 * k - 2, k - 1, exact=True)
-    tau = (1 / (2 ** (2 * k - 1))) * binom * (1.0 / delta_f)
-
-    # "d" coefficient
-    d = np.exp(-1 / (fs * tau))
+    d = _gammatone_pole(freq, k, fs)
 
     # coeff am (ECMA 418-2:2022 equation 14 - index 'm_' goes from 1 to k)
     m_ = np.arange(5) + 1
@@ -63,3 +52,85 @@ def _gammatone(freq, k=5, fs=48000):
     bm_prim_ecma = bm * exponential[:-1]
 
     return bm_prim_ecma, am_prim_ecma
+
+
+def _gammatone_sos(freq, k=5, fs=48000):
+    """ECMA-418-2:2022 Gammatone filter design, real second-order sections
+
+    The band-pass signal of the standard is twice the real part of the
+    output of the complex filter of equations 16 and 17, B(z) / A(z). It is
+    also the output of the real filter (B(z) A*(z) + B*(z) A(z)) / |A(z)|^2,
+    A* and B* having the conjugate coefficients of A and B, which is
+    returned as second-order sections: the pole of A and its conjugate
+    give the denominators, the zeros of the real numerator the numerators.
+
+    Parameters
+    ----------
+    freq: float
+        Center frequency of the filter ['Hz'].
+
+    k: int, optional
+        The order of the filter. Default is "5" according to ECMA-418.2.
+
+    fs: float, optional
+        The sampling frequency of the signal. Default is 48000 Hz.
+
+    Returns
+    -------
+    sos: ndarray
+        Second-order sections of the real band-pass filter, size (k, 6).
+
+    """
+    bm_prim, am_prim = _gammatone(freq, k, fs)
+    # Pole of A(z) = (1 - p z^-1)^k
+    pole = -am_prim[1] / k
+
+    # Real numerator, its first coefficient is zero (bm[0] = 0) and is
+    # kept as a delay of one sample
+    num = 2 * np.convolve(bm_prim, np.conj(am_prim)).real[1:]
+    # Roots in the z-plane, the degree of the numerator being completed by
+    # zeros at the origin
+    zeros = np.concatenate((np.roots(num), np.zeros(2 * k - len(num) + 1)))
+    poles = np.tile([pole, np.conj(pole)], k)
+    sos = zpk2sos(zeros, poles, num[0])
+
+    # Delay of one sample, on a section with a zero at the origin
+    i = np.flatnonzero(sos[:, 2] == 0)[0]
+    sos[i, :3] = [0, sos[i, 0], sos[i, 1]]
+
+    return sos
+
+
+def _gammatone_pole(freq, k=5, fs=48000):
+    """Pole of the ECMA-418-2:2022 gammatone low-pass filter (equations 8
+    and 10 to 13)
+
+    Parameters
+    ----------
+    freq: float
+        Center frequency of the filter ['Hz'].
+
+    k: int, optional
+        The order of the filter. Default is "5" according to ECMA-418.2.
+
+    fs: float, optional
+        The sampling frequency of the signal. Default is 48000 Hz.
+
+    Returns
+    -------
+    d: float
+        Pole of the filter
+    """
+    # ECMA-418-2 constants
+    af_f0 = 81.9289
+    c = 0.1618
+
+    # Bandwidth (ECMA 418-2:2022 equation 10)
+    delta_f = np.sqrt((af_f0**2) + ((c * freq) ** 2))
+
+    # Time constant, delay (ECMA 418-2:2022 equation 8)
+    binom = comb(2 * k - 2, k - 1, exact=True)
+    tau = (1 / (2 ** (2 * k - 1))) * binom * (1.0 / delta_f)
+
+    # "d" coefficient
+    return np.exp(-1 / (fs * tau))
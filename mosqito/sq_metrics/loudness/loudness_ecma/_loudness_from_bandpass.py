@@ -34,20 +34,45 @@ def _loudness_from_bandpass(block_array, rectify=True):
         block_array_rect = np.clip(block_array, a_min=0.00, a_max=None)
     else:
         block_array_rect = block_array
-    n_specific = []
+    rms_array = []
     for band_number in range(53):
         # ROOT-MEAN-SQUARE (section 5.1.6)
         # After the segmentation of the signal into blocks, root-mean square values of each block are calculated
         # according to Formula 17.
-        rms_block_value = sqrt(
-            2 * mean(array(block_array_rect[band_number]) ** 2, axis=1)
+        rms_array.append(
+            sqrt(2 * mean(array(block_array_rect[band_number]) ** 2, axis=1))
         )
 
+    return _loudness_from_rms(rms_array)
+
+
+def _loudness_from_rms(rms_array):
+    """Calculation of the specific loudness according to ECMA-418-2 section 5,
+    from the root-mean-square values of the rectified blocks (section 5.1.6)
+
+    Parameters
+    ----------
+    rms_array: list of numpy.array
+        Root-mean-square values of the blocks of each of the 53 critical
+        bands, each of size (nseg,) or (nseg, n_channels)
+
+    Returns
+    -------
+    n_specific: list of numpy.array
+        Specific Loudness [sone_HMS per Bark]. Each of the 53 element of the list corresponds to the time-dependant
+        specific loudness for a given bark band. Can be a ragged array if a different sb/sh are used for each band.
+
+    bark_axis: numpy.array
+        Bark axis
+
+    """
+    n_specific = []
+    for band_number in range(53):
         # NON-LINEARITY (section 5.1.7)
         # This section covers the other part of the calculations needed to consider the non-linear transformation
         # of sound pressure to specific loudness that does the the auditory system. After this point, the
         # computation is done equally to every block in which we have divided our signal.
-        a_prime = _nonlinearity(rms_block_value)
+        a_prime = _nonlinearity(rms_array[band_number])
 
         # SPECIFIC LOUDNESS CONSIDERING THE THRESHOLD IN QUIET (section 5.1.8)
         # The next calculation helps us obtain the result for the specific loudness - specific loudness with
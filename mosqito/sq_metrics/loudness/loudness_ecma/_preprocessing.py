@@ -1,16 +1,27 @@
 # -*- coding: utf-8 -*-
 
-from numpy import pi, cos, arange, max, ceil, concatenate, zeros
+from numpy import (
+    pi,
+    cos,
+    arange,
+    max,
+    ceil,
+    concatenate,
+    zeros,
+    newaxis,
+    asarray,
+    dtype as np_dtype,
+)
 
 
-def _preprocessing(signal, sb, sh):
+def _preprocessing(signal, sb, sh, dtype="float64"):
     """
     Performs windowing and zero-padding as described in Section 5.1.2 of
     ECMA-418-2 (2nd Ed, 2022) standard for calculating Loudness.
 
     Parameters
     ----------
-    signal : (n_samples,)-shaped numpy.array
+    signal : (n_samples,) or (n_samples, n_channels)-shaped numpy.array
         Array containing the sound signal samples, at sampling frequency 48 kHz
 
     sb : int
@@ -18,23 +29,58 @@ def _preprocessing(signal, sb, sh):
 
     sh : int
         Hop size, in samples
+
+    dtype : {'float64', 'float32'}, optional
+        Precision of the preprocessed signal, and thus of the computation.
+        Default is 'float64'
     """
 
-    n_samples = signal.shape[0]
+    signal = asarray(signal, dtype=_compute_dtype(dtype))
+    n_zeros_start, n_new = _padding(signal.shape[0], sb, sh)
+
+    return _padded_signal(signal, n_zeros_start, int(n_new)), n_new
+
+
+def _compute_dtype(dtype):
+    """Floating point type of the computation, 'float64' or 'float32'"""
+    dtype = np_dtype(dtype)
+    if dtype.name not in ("float64", "float32"):
+        raise ValueError("ERROR: dtype shall be either 'float64' or 'float32'")
+    return dtype
 
-    # Apply windowing function to first 5 ms (240 samples)
-    n_fadein = 240
-    w_fadein = 0.5 - 0.5 * cos(pi * arange(n_fadein) / n_fadein)
-    signal[:240] *= w_fadein
 
+def _padding(n_samples, sb, sh):
+    """Number of zeros added before the signal and number of samples of the
+    signal after zero-padding (Formula 3), as in _preprocessing"""
     # Calculate zero padding at start and end of signal
     sb_max = max(sb)
     sh_max = max(sh)
 
     n_zeros_start = sb_max
     n_new = sh_max * (ceil((n_samples + sh_max + sb_max) / (sh_max)) - 1)
-    n_zeros_end = int(n_new) - n_samples
 
-    signal = concatenate((zeros(n_zeros_start), signal, zeros(n_zeros_end)))
+    return n_zeros_start, n_new
+
+
+def _padded_signal(signal, n_zeros_start, n_new):
+    """Signal with n_zeros_start zeros added before it and zeros added after
+    it up to n_new samples, the first 5 ms of the signal being faded in"""
+    n_zeros_end = n_new - signal.shape[0]
+
+    signal = concatenate(
+        (
+            zeros((n_zeros_start,) + signal.shape[1:], dtype=signal.dtype),
+            signal,
+            zeros((n_zeros_end,) + signal.shape[1:], dtype=signal.dtype),
+        )
+    )
+
+    # Apply windowing function to first 5 ms (240 samples), on the padded
+    # copy to leave the input signal unchanged
+    n_fadein = 240
+    w_fadein = 0.5 - 0.5 * cos(pi * arange(n_fadein) / n_fadein)
+    if signal.ndim > 1:
+        w_fadein = w_fadein[:, newaxis]
+    signal[n_zeros_start : n_zeros_start + n_fadein] *= w_fadein
 
-    return signal, n_new
+    return signal
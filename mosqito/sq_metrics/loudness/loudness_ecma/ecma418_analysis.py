@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+# Third party imports
+import numpy as np
+
+# Local applications imports
+from mosqito.utils.resample import resample
+from mosqito.sq_metrics.loudness.loudness_ecma._preprocessing import (
+    _compute_dtype,
+    _padding,
+    _padded_signal,
+)
+from mosqito.sq_metrics.loudness.loudness_ecma._band_pass_signals import (
+    _band_pass_signals,
+)
+from mosqito.sq_metrics.loudness.loudness_ecma._band_selection import (
+    _band_selection,
+)
+from mosqito.sq_metrics.loudness.loudness_ecma.loudness_ecma import (
+    _loudness_from_band_pass,
+)
+from mosqito.sq_metrics.roughness.roughness_ecma.roughness_ecma import (
+    SB,
+    SH,
+    _block_chunks,
+    _roughness_from_band_pass,
+)
+
+
+class Ecma418Analysis:
+    """
+    Analysis of a time signal with the hearing model of ECMA-418-2
+
+    This class computes several metrics of ECMA-418-2 (2nd Ed, 2022) from a
+    single front end: the outer and middle ear filtering and the auditory
+    filter bank (sections 5.1.3 and 5.1.4) are applied once, when the first
+    metric is computed, and the band-pass signals are kept for the next
+    ones. The signal is zero-padded for the largest blocks of the metrics
+    (the roughness ones, unless larger loudness blocks are requested). As
+    the filters start at rest, the band-pass signals of the metrics with
+    smaller blocks are parts of the same signals, and the results are
+    identical to the ones of loudness_ecma and roughness_ecma.
+
+    Parameters
+    ----------
+    signal : numpy.array
+        Signal time values [Pa], size (Nsamples,), or (Nsamples, Nchannels)
+        for the loudness only.
+    fs : integer
+        Sampling frequency [Hz]. A signal which is not sampled at 48 kHz is
+        resampled once.
+    workers : int, optional
+        Number of threads used to filter the frequency bands in parallel.
+        Default is 1
+        Experimental: the speed-up has only been measured on a
+        single-core machine so far, where there is none.
+    dtype : {'float64', 'float32'}, optional
+        Precision of the band-pass signals and of the computation of the
+        metrics, see loudness_ecma and roughness_ecma. Default is 'float64'
+
+    Attributes
+    ----------
+    signal : numpy.ndarray
+        Signal time values [Pa], sampled at 48 kHz.
+    fs : int
+        Sampling frequency [Hz], 48000.
+
+    Warning
+    -------
+    The band-pass signals of the complete signal are kept in memory (53
+    values of 8 bytes per sample, about 1.2 GB for one minute, half of it
+    in single precision). For long
+    recordings, roughness_ecma with the chunk_blocks option keeps a
+    bounded memory.
+
+    See Also
+    --------
+    .loudness_ecma : Loudness computation based on the hearing model of ECMA 418-2
+    .roughness_ecma : Roughness computation based on the hearing model of ECMA 418-2
+
+    Examples
+    --------
+    .. plot::
+       :include-source:
+
+       >>> from mosqito.sq_metrics import Ecma418Analysis
+       >>> import matplotlib.pyplot as plt
+       >>> import numpy as np
+       >>> fs=48000
+       >>> d=1
+       >>> dB=60
+       >>> fmod = 70
+       >>> fc = 1000
+       >>> time = np.arange(0, d, 1/fs)
+       >>> signal = 0.5 * (1 + np.sin(2 * np.pi * fmod * time)) * np.sin(2 * np.pi * fc * time)
+       >>> rms = np.sqrt(np.mean(np.power(signal, 2)))
+       >>> ampl = 0.00002 * np.power(10, dB / 20) / rms
+       >>> stimulus = signal * ampl
+       >>> analysis = Ecma418Analysis(stimulus, fs)
+       >>> N, N_time, N_spec, bark_axis, time_array = analysis.loudness()
+       >>> R, R_time, R_spec, bark_axis, time_axis = analysis.roughness()
+       >>> plt.plot(time_array[0], N_time)
+       >>> plt.xlabel("Time [s]")
+       >>> plt.ylabel("Loudness [Sone]")
+       >>> plt.title("Roughness = " + f"{R:.2f}" + " [Asper]")
+    """
+
+    def __init__(self, signal, fs, workers=1, dtype="float64"):
+        if fs != 48000:
+            print(
+                "[Warning] Signal resampled to 48 kHz fulfill the standard requirements and allow calculation."
+            )
+            signal = resample(signal, fs, 48000)
+        self.signal = np.asarray(signal, dtype=_compute_dtype(dtype))
+        self.fs = 48000
+        self.workers = workers
+        # Band-pass signals, computed on the first call, and their padding
+        self._bandpass_signals = None
+        self._n_zeros_start, self._n_new = _padding(signal.shape[0], SB, SH)
+
+    def _band_pass(self, sb, sh):
+        """Band-pass signals of the signal zero-padded for blocks sb and hop
+        sizes sh, as in _preprocessing
+
+        Outputs
+        -------
+        bandpass_signals : list of numpy.array
+            Band-pass signals of the 53 critical bands
+        n_new : int
+            Number of samples in signal after zero padding (Eq. 3)
+        """
+        n_zeros_start, n_new = _padding(self.signal.shape[0], sb, sh)
+        if (
+            self._bandpass_signals is None
+            or n_zeros_start > self._n_zeros_start
+            or n_new > self._n_new
+        ):
+            self._n_zeros_start = max(n_zeros_start, self._n_zeros_start)
+            self._n_new = max(n_new, self._n_new)
+            signal = _padded_signal(self.signal, self._n_zeros_start, int(self._n_new))
+            self._bandpass_signals = _band_pass_signals(signal, sb, sh, self.workers)
+
+        # Zeros in excess at the start of the band-pass signals
+        offset = self._n_zeros_start - n_zeros_start
+        stop = self._n_zeros_start + int(n_new)
+        bandpass_signals = [band[offset:stop] for band in self._bandpass_signals]
+        return bandpass_signals, n_new
+
+    def loudness(self, sb=2048, sh=1024, bands=None, bark_range=None):
+        """Specific and total loudness according to ECMA-418-2 (2nd Ed, 2022),
+        Section 5
+
+        Parameters
+        ----------
+        sb: int or list of int
+            Block size.
+        sh: int or list of int
+            Hop size.
+        bands: list of int, optional
+            Indices of the critical bands to be evaluated (0 to 52), the
+            other bands being not segmented. By default, all the bands.
+        bark_range: tuple of float, optional
+            Lowest and highest critical band rates [Bark] of the bands to be
+            evaluated, instead of bands.
+
+        Returns
+        -------
+        Same outputs as loudness_ecma
+        """
+        bands = _band_selection(bands, bark_range)
+        bandpass_signals, n_new = self._band_pass(sb, sh)
+        bandpass_signals = [bandpass_signals[z] for z in bands]
+        return _loudness_from_band_pass(bandpass_signals, sb, sh, n_new, bands)
+
+    def roughness(self, bands=None, bark_range=None):
+        """Specific and total roughness according to ECMA-418-2 (2nd Ed, 2022),
+        Section 7
+
+        Parameters
+        ----------
+        bands: list of int, optional
+            Indices of the critical bands (0 to 52) of the specific
+            roughness to be returned. By default, all the bands.
+        bark_range: tuple of float, optional
+            Lowest and highest critical band rates [Bark] of the bands of
+            the specific roughness to be returned, instead of bands.
+
+        Returns
+        -------
+        Same outputs as roughness_ecma
+        """
+        bandpass_signals, n_new = self._band_pass(SB, SH)
+        chunks, spans = _block_chunks(n_new, bandpass_signals[0].shape[0])
+        bandpass_chunks = (
+            [band[start:stop] for band in bandpass_signals] for start, stop in spans
+        )
+        duration = self.signal.shape[0] / self.fs
+        return _roughness_from_band_pass(
+            bandpass_chunks,
+            chunks,
+            spans,
+            n_new,
+            duration,
+            _band_selection(bands, bark_range),
+        )
@@ -1,14 +1,15 @@
 # -*- coding: utf-8 -*-
 
-from numpy import clip, sqrt, mean, array, linspace, sum, log10
+from numpy import mean, array, linspace, sum, log10, moveaxis, arange
 
 # Project Imports
 from mosqito.sq_metrics.loudness.loudness_ecma._band_pass_signals import (
     _band_pass_signals,
+    _multirate_factors,
 )
 
 from mosqito.sq_metrics.loudness.loudness_ecma._ecma_time_segmentation import (
-    _ecma_time_segmentation,
+    _ecma_block_rms,
 )
 
 from mosqito.sq_metrics.loudness.loudness_ecma._nonlinearity import _nonlinearity
@@ -17,12 +18,26 @@ from mosqito.sq_metrics.loudness.loudness_ecma._preprocessing import (
     _preprocessing,
 )
 
+from mosqito.sq_metrics.loudness.loudness_ecma._band_selection import (
+    _band_selection,
+)
+
 # Data import
 # Threshold in quiet
 from mosqito.sq_metrics.loudness.loudness_ecma._loudness_ecma_data import ltq_z
 
 
-def loudness_ecma(signal, fs, sb=2048, sh=1024):
+def loudness_ecma(
+    signal,
+    fs,
+    sb=2048,
+    sh=1024,
+    workers=1,
+    dtype="float64",
+    bands=None,
+    bark_range=None,
+    multirate=False,
+):
     """Calculation of the specific and total loudness according to ECMA-418-2
     (2nd Ed, 2022), Section 5.
 
@@ -32,23 +47,56 @@ def loudness_ecma(signal, fs, sb=2048, sh=1024):
     Parameters
     ----------
     signal: numpy.array
-        Signal time values [Pa]. The sampling frequency of the signal must be 48000 Hz.
+        Signal time values [Pa], size (Nsamples,) or (Nsamples, Nchannels).
+        The sampling frequency of the signal must be 48000 Hz. The channels
+        of a multichannel signal are processed together.
     sb: int or list of int
         Block size.
     sh: int or list of int
         Hop size.
+    workers: int, optional
+        Number of threads used to filter the frequency bands in parallel.
+        Default is 1
+        Experimental: the speed-up has only been measured on a
+        single-core machine so far, where there is none.
+    dtype: {'float64', 'float32'}, optional
+        Precision of the band-pass signals and of the block values, the
+        filters being computed in double precision. The single precision
+        halves the memory used by the band-pass signals, the loudness values
+        deviating by less than 1e-8 relatively from the double precision
+        ones. Default is 'float64'
+    bands: list of int, optional
+        Indices of the critical bands to be evaluated (0 to 52), the other
+        bands being neither filtered nor segmented. By default, all the 53
+        bands are evaluated.
+    bark_range: tuple of float, optional
+        Lowest and highest critical band rates [Bark] of the bands to be
+        evaluated, instead of bands.
+    multirate: bool, optional
+        If True, the auditory filters of the low frequency bands are
+        computed at 6, 12 or 24 kHz after an anti-aliasing decimation, and
+        their block values at the same rates. The computation time is
+        reduced by about 35 %, the loudness values deviating by less than
+        1e-4 relatively from the ones computed at 48 kHz (see
+        validations/sq_metrics/roughness_ecma/validation_multirate_ecma.py).
+        Default is False
 
     Returns
     -------
     N : float
-        Overall loudness representative value [sone_HMS].
+        Overall loudness representative value [sone_HMS], size (Nchannels,)
+        for a multichannel signal. Partial loudness of the evaluated bands
+        if bands or bark_range is given.
     N_time : numpy.ndarray
-        Loudness over time [sone_HMS], size (Ntime,).
+        Loudness over time [sone_HMS], size (Ntime,) or (Nchannels, Ntime),
+        summed over the evaluated bands.
     N_specific : numpy.ndarray
-        Specific loudness [sone_HMS/bark], size (Nbark, Ntime).
+        Specific loudness [sone_HMS/bark], size (Nbark, Ntime) or
+        (Nchannels, Nbark, Ntime).
 	    Each of the 53 elements of the list corresponds to the time-dependant specific loudness for a given bark band. Can be a ragged array if a different sb/sh are used for each band.
     bark_axis : numpy.ndarray
-        Corresponding bark axis, size (Nbark,).
+        Corresponding bark axis, size (Nbark,), Nbark being the number of
+        evaluated bands.
     time_array : numpy.ndarray
         Time axis, size (Nbark, Ntime).
 
@@ -60,6 +108,7 @@ def loudness_ecma(signal, fs, sb=2048, sh=1024):
     --------
     .loudness_zwst : Zwicker and Fastl loudness computation for a stationary time signal
     .loudness_zwtv : Zwicker and Fastl loudness computation for a non-stationary time signal
+    .Ecma418Analysis : Loudness and roughness computed from a single hearing model front end
 
     References
     ----------
@@ -94,33 +143,64 @@ def loudness_ecma(signal, fs, sb=2048, sh=1024):
         print(
             "[Warning] Signal resampled to 48 kHz fulfill the standard requirements and allow calculation."
         )
-        from scipy.signal import resample
+        from mosqito.utils.resample import resample
 
-        signal = resample(signal, int(48000 * len(signal) / fs))
+        signal = resample(signal, fs, 48000)
         fs = 48000
 
+    # Critical bands to be evaluated
+    bands = _band_selection(bands, bark_range)
+
     # Windowing and zero-padding (5.1.2)
-    signal, n_new = _preprocessing(signal, sb, sh)
+    signal, n_new = _preprocessing(signal, sb, sh, dtype)
 
-    # Computaton of band-pass signals (5.1.3 to 5.1.4)
-    bandpass_signals = _band_pass_signals(signal, sb, sh)
+    # Computaton of band-pass signals (5.1.3 to 5.1.4), at reduced sampling
+    # rates for the low frequency bands in multirate mode
+    factors = _multirate_factors(sb, sh) if multirate else None
+    bandpass_signals = _band_pass_signals(signal, sb, sh, workers, bands, factors)
 
-    # 5.1.5 Segmentation into blocks
-    block_array, time_array = _ecma_time_segmentation(bandpass_signals, sb, sh, n_new)
-    
-    # Segmentation into blocks (5.1.5)
-    #block_array, time_array = _ecma_time_segmentation(bandpass_signals, sb, sh, n_new)
+    return _loudness_from_band_pass(bandpass_signals, sb, sh, n_new, bands, factors)
 
-    # Rectification (5.1.6)
-    block_array_rect = clip(block_array, a_min=0.00, a_max=None)
+
+def _loudness_from_band_pass(
+    bandpass_signals, sb, sh, n_new, bands=None, factors=None
+):
+    """Calculation of the specific and total loudness according to ECMA-418-2
+    (2nd Ed, 2022) from the band-pass signals (section 5.1.5 to 5.1.9)
+
+    Parameters
+    ----------
+    bandpass_signals: list of numpy.array
+        Band-pass signals of the critical bands, of the preprocessed
+        signal, size (Nsamples,) or (Nsamples, Nchannels)
+    sb: int or list of int
+        Block size.
+    sh: int or list of int
+        Hop size.
+    n_new : int
+        Number of samples in signal after zero padding (Eq. 3)
+    bands : array of int, optional
+        Indices of the critical bands of bandpass_signals. By default, the
+        53 bands.
+    factors : array of int, optional
+        Sampling rate reduction factors of the bands of the multirate filter
+        bank. By default, all the band-pass signals are sampled at 48 kHz.
+
+    Outputs
+    -------
+    Same outputs as loudness_ecma
+    """
+    # Segmentation into blocks (5.1.5), rectification (5.1.6) and root mean
+    # square values (eq. 22), computed without segmenting the band signals
+    if bands is None:
+        bands = arange(53)
+    rms_array, time_array = _ecma_block_rms(
+        bandpass_signals, sb, sh, n_new, bands, factors
+    )
 
     # Calculation of specific loudness (5.1.7 to 5.1.9)
     N_spec = []
-    for band_number in range(53):
-        # root mean square values (eq. 22)
-        rms_block_value = sqrt(
-            2 * mean(array(block_array_rect[band_number]) ** 2, axis=1)
-        )
+    for rms_block_value, band_number in zip(rms_array, bands):
         # non-linear transformation of sound pressure to specific loudness
         a_prime = _nonlinearity(rms_block_value)
         # specific loudness considering the lower threshold of hearing.
@@ -134,8 +214,13 @@ def loudness_ecma(signal, fs, sb=2048, sh=1024):
 
     # Single-value loudness (eq. 117)
     e = 1 / log10(2)
-    N = (mean(N_time**e)) ** (1 / e)
+    N = (mean(N_time**e, axis=0)) ** (1 / e)
+
+    # Channels as leading axis
+    if bandpass_signals[0].ndim > 1:
+        N_time = N_time.T
+        N_spec = moveaxis(array(N_spec), -1, 0)
 
-    bark_axis = linspace(0.5, 26.5, num=53, endpoint=True)
+    bark_axis = linspace(0.5, 26.5, num=53, endpoint=True)[bands]
     
     return N, N_time, N_spec, bark_axis, time_array
@@ -1,357 +1,387 @@
 # -*- coding: utf-8 -*-
 
-# Standard library imports
-from numpy import array, append, tile, ones, copy, int32, zeros, arange, roll, logical_not, divide, maximum, minimum, multiply, logical_and, logical_xor, floor, round
+# Third party imports
+from numpy import (
+    array,
+    append,
+    tile,
+    int32,
+    zeros,
+    empty,
+    full,
+    flatnonzero,
+    maximum,
+    minimum,
+    floor,
+    round,
+    searchsorted,
+)
 
 from mosqito.sq_metrics.loudness.loudness_zwst._get_rns_index import _get_rns_index
 
-
-def _calc_slopes(nm):
-    """"""
-    # Upper limits of approximated critical bands in terms of critical
-    # band rate
-    zup = array(
-        [
-            0.9,
-            1.8,
-            2.8,
-            3.5,
-            4.4,
-            5.4,
-            6.6,
-            7.9,
-            9.2,
-            10.6,
-            12.3,
-            13.8,
-            15.2,
-            16.7,
-            18.1,
-            19.3,
-            20.6,
-            21.8,
-            22.7,
-            23.6,
-            24,
-        ]
-    )
-    # Range of specific loudness for the determination of the steepness
-    # of the upper slopes in the specific loudness - critical band rate
-    # pattern
-    rns = array(
-        [
-            21.5,
-            18,
-            15.1,
-            11.5,
-            9,
-            6.1,
-            4.4,
-            3.1,
-            2.13,
-            1.36,
-            0.82,
-            0.42,
-            0.30,
-            0.22,
-            0.15,
-            0.10,
-            0.035,
-            0,
-        ]
-    )
-    # Steepness of the upper slopes in the specific loudness = Critical
-    # band rate pattern for the ranges 'rns' as a function of the number
-    # of the critical band
-    usl = array(
-        [
-            (13, 8.2, 6.3, 5.5, 5.5, 5.5, 5.5, 5.5),
-            (9, 7.5, 6, 5.1, 4.5, 4.5, 4.5, 4.5),
-            (7.8, 6.7, 5.6, 4.9, 4.4, 3.9, 3.9, 3.9),
-            (6.2, 5.4, 4.6, 4.0, 3.5, 3.2, 3.2, 3.2),
-            (4.5, 3.8, 3.6, 3.2, 2.9, 2.7, 2.7, 2.7),
-            (3.7, 3.0, 2.8, 2.35, 2.2, 2.2, 2.2, 2.2),
-            (2.9, 2.3, 2.1, 1.9, 1.8, 1.7, 1.7, 1.7),
-            (2.4, 1.7, 1.5, 1.35, 1.3, 1.3, 1.3, 1.3),
-            (1.95, 1.45, 1.3, 1.15, 1.1, 1.1, 1.1, 1.1),
-            (1.5, 1.2, 0.94, 0.86, 0.82, 0.82, 0.82, 0.82),
-            (0.72, 0.67, 0.64, 0.63, 0.62, 0.62, 0.62, 0.62),
-            (0.59, 0.53, 0.51, 0.50, 0.42, 0.42, 0.42, 0.42),
-            (0.40, 0.33, 0.26, 0.24, 0.24, 0.22, 0.22, 0.22),
-            (0.27, 0.21, 0.20, 0.18, 0.17, 0.17, 0.17, 0.17),
-            (0.16, 0.15, 0.14, 0.12, 0.11, 0.11, 0.11, 0.11),
-            (0.12, 0.11, 0.10, 0.08, 0.08, 0.08, 0.08, 0.08),
-            (0.09, 0.08, 0.07, 0.06, 0.06, 0.06, 0.06, 0.05),
-            (0.06, 0.05, 0.03, 0.02, 0.02, 0.02, 0.02, 0.02),
-        ]
-    )
-
-    # From Ernesto Avedillo 13/feb/2022
-    # Considering the original routine if ig > 7:ig = 7 until ig = 21 so I can append the last column until usl.shape = (18,21)
-    usl_reshaped = append(usl, tile(usl[:, 7], 13).reshape(13, 18).T, axis=1)
-
-    # For test, in case nm has only 1 col.
+# Upper limits of approximated critical bands in terms of critical
+# band rate
+_ZUP = array(
+    [
+        0.9,
+        1.8,
+        2.8,
+        3.5,
+        4.4,
+        5.4,
+        6.6,
+        7.9,
+        9.2,
+        10.6,
+        12.3,
+        13.8,
+        15.2,
+        16.7,
+        18.1,
+        19.3,
+        20.6,
+        21.8,
+        22.7,
+        23.6,
+        24,
+    ]
+)
+# Range of specific loudness for the determination of the steepness
+# of the upper slopes in the specific loudness - critical band rate
+# pattern
+_RNS = array(
+    [
+        21.5,
+        18,
+        15.1,
+        11.5,
+        9,
+        6.1,
+        4.4,
+        3.1,
+        2.13,
+        1.36,
+        0.82,
+        0.42,
+        0.30,
+        0.22,
+        0.15,
+        0.10,
+        0.035,
+        0,
+    ]
+)
+# Steepness of the upper slopes in the specific loudness = Critical
+# band rate pattern for the ranges 'rns' as a function of the number
+# of the critical band
+_USL = array(
+    [
+        (13, 8.2, 6.3, 5.5, 5.5, 5.5, 5.5, 5.5),
+        (9, 7.5, 6, 5.1, 4.5, 4.5, 4.5, 4.5),
+        (7.8, 6.7, 5.6, 4.9, 4.4, 3.9, 3.9, 3.9),
+        (6.2, 5.4, 4.6, 4.0, 3.5, 3.2, 3.2, 3.2),
+        (4.5, 3.8, 3.6, 3.2, 2.9, 2.7, 2.7, 2.7),
+        (3.7, 3.0, 2.8, 2.35, 2.2, 2.2, 2.2, 2.2),
+        (2.9, 2.3, 2.1, 1.9, 1.8, 1.7, 1.7, 1.7),
+        (2.4, 1.7, 1.5, 1.35, 1.3, 1.3, 1.3, 1.3),
+        (1.95, 1.45, 1.3, 1.15, 1.1, 1.1, 1.1, 1.1),
+        (1.5, 1.2, 0.94, 0.86, 0.82, 0.82, 0.82, 0.82),
+        (0.72, 0.67, 0.64, 0.63, 0.62, 0.62, 0.62, 0.62),
+        (0.59, 0.53, 0.51, 0.50, 0.42, 0.42, 0.42, 0.42),
+        (0.40, 0.33, 0.26, 0.24, 0.24, 0.22, 0.22, 0.22),
+        (0.27, 0.21, 0.20, 0.18, 0.17, 0.17, 0.17, 0.17),
+        (0.16, 0.15, 0.14, 0.12, 0.11, 0.11, 0.11, 0.11),
+        (0.12, 0.11, 0.10, 0.08, 0.08, 0.08, 0.08, 0.08),
+        (0.09, 0.08, 0.07, 0.06, 0.06, 0.06, 0.06, 0.05),
+        (0.06, 0.05, 0.03, 0.02, 0.02, 0.02, 0.02, 0.02),
+    ]
+)
+
+# From Ernesto Avedillo 13/feb/2022
+# Considering the original routine if ig > 7:ig = 7 until ig = 21 so I can append
+# the last column until usl.shape = (18,21)
+_USL_RESHAPED = append(_USL, tile(_USL[:, 7], 13).reshape(13, 18).T, axis=1)
+# Position of the upper limit of each band in the 0.1 Bark specific loudness
+# array, the last element gives the start of the first band
+_ZUP_EA = append((_ZUP * 10).astype(int32), 0)
+
+
+def _calc_slopes(nm, specific=True):
+    """Specific loudness pattern and total loudness, by attaching the
+    upper slopes to the main loudness (See ISO 532-1 section 6.2)
+
+    All the frames (columns of nm) are processed together, 0.1 Bark step
+    by 0.1 Bark step, the temporaries being restricted to the frames
+    that are still on a slope. For the total loudness only, the slopes are
+    followed from one change of steepness to the next one instead, the 240
+    values of specific loudness being neither computed nor stored.
+
+    Parameters
+    ----------
+    nm : numpy.ndarray
+        Main loudness per critical band, size (21,) or (21, n_frames)
+    specific : bool, optional
+        If False, only the total loudness is computed. Default is True
+
+    Outputs
+    -------
+    N : float or numpy.ndarray
+        Total loudness, size (n_frames,)
+    N_specific : numpy.ndarray
+        Specific loudness, size (240,) or (240, n_frames), None if specific
+        is False
+    """
     len_1_nm = False
     if len(nm.shape) == 1:
         len_1_nm = True
-        nm = append(nm, nm).reshape(2, 21).T
+        nm = nm.reshape(21, 1)
 
-    # Start values
     data_length = nm.shape[1]
-    nm_wide = nm.shape[0]
-    spec_length = 240
     dec_compare = 8
-    # Working array variables
-    n2_array_specific = ones((spec_length, data_length))
-    z2_array_specific = ones((spec_length, data_length))
-    usl_array_specific = ones((spec_length, data_length))
-    dz_array_specific = ones((spec_length, data_length))
-    rns_values_specific = ones((spec_length, data_length))
-    # Create a zup vector called zup_ea to define the position in the N_spezific array.
-    zup_ea = (copy(zup) * 10).astype(int32)
-    zup_ea = append(zup_ea, 0)
-
-    # Create a complete array of ZUP vectors with shape nm elements in a row
-    zup_array_ea = (ones((nm_wide, data_length)).T * zup).T
-    # crearte an array of z values 0.1 increase
-
-    # Prepare the array N_specific for output
-    # For all cases where nm[:,col-1] < nm[:,col]
-    N_specific = zeros((spec_length, data_length))
-    # I save the first values for first raws defined in zup_ea
-    # N_specific[:zup_ea[0],:] = np.multiply(N_specific[:zup_ea[0],:] , nm[1])
-    # I complete the rest of the matrix extending the array 21  to 240
-    for i in arange(nm_wide - 1):
-        N_specific[zup_ea[i - 1] : zup_ea[i], :] = nm[i]
 
+    # Prepare the array N_specific for output, initialised with the main
+    # loudness of the bands (except the last one)
+    N_specific = None
+    if specific:
+        N_specific = zeros((240, data_length))
+        for i in range(20):
+            N_specific[_ZUP_EA[i - 1] : _ZUP_EA[i], :] = nm[i]
     N = zeros(data_length)
 
-    # nm_aux = np.copy(nm)
-    # nm_aux [0] = nm[1]
-
-    # obtain the rns indexes for each value of the nm matrix.
-    # rns_ind = _get_rns_index (nm, rns ,equal_too = True )
-    rns_ind = _get_rns_index(nm, rns)
-    # save in an array the values corresponding to this index
-    rns_values = rns[rns_ind]
-
-    # search usl_array for each nm cell
-    usl_array_ind = array(
-        [rns_ind.T, ones((zup.shape[0], data_length)).T * arange(21)], dtype=int
-    ).transpose(1, 2, 0)
-    usl_array = usl_reshaped[usl_array_ind[:, :, 0], usl_array_ind[:, :, 1]].T
-    # create a 240 x nm shape[1] array to save the dz values equal to z2-z1
-    dz = zeros((nm_wide, data_length))
-    dz = zup_array_ea - roll(zup_array_ea, 1, axis=0)
-
-    dz[0, :] = zup[1]
-    dz[1, :] = zup[1]
-
-    for i in arange(nm_wide):
-        n2_array_specific[zup_ea[i - 1] : zup_ea[i], :] = nm[i]
-        dz_array_specific[zup_ea[i - 1] : zup_ea[i], :] = dz[i]
-        z2_array_specific[zup_ea[i - 1] : zup_ea[i], :] = zup_array_ea[i]
-        usl_array_specific[zup_ea[i - 1] : zup_ea[i], :] = usl_array[i]
-        rns_values_specific[zup_ea[i - 1] : zup_ea[i], :] = rns_values[i]
-
-    j = 1
+    # Loudness n1 at critical band rate z1, end of the pattern computed so far
     n1_aux = zeros(data_length)
     z1_aux = zeros(data_length)
-
-    for i in arange(nm_wide):
-        # for all cases where nm[i-1]>nm[i]
-        j = zup_ea[i - 1]
-        indexes = _get_rns_index(n2_array_specific[j - 1], rns)
-        rns_values_specific[j] = rns[indexes]
-        usl_array_specific[j] = usl_reshaped[indexes, i - 1]
-
-        mask_n1_bigger_nm = round(n2_array_specific[j - 1], dec_compare) > round(
-            nm[i], dec_compare
-        )
-        # For all n1 <= nm[i] calculate (N = N + n2 * (z2 - z1))
-        N[logical_not(mask_n1_bigger_nm)] += (
-            n2_array_specific[j] * (z2_array_specific[j] - z1_aux)
-        )[logical_not(mask_n1_bigger_nm)]
-        n1_aux[logical_not(mask_n1_bigger_nm)] = copy(n2_array_specific[j])[
-            logical_not(mask_n1_bigger_nm)
-        ]
-        z1_aux[logical_not(mask_n1_bigger_nm)] = copy(z2_array_specific[j])[
-            logical_not(mask_n1_bigger_nm)
-        ]
-
-        if mask_n1_bigger_nm.sum() > 0:
-            # For all n1 > nm[i] calculate z2,dz n2.
-            # This routine
-            # n2 = rns[j]
-            # if n2 < nm[i]:
-            #     n2 = nm[i]
-            # dz = (n1 - n2) / usl[j, ig]
-            # z2 = z1 + dz
-            # if z2 > zup[i]:
-            #     z2 = zup[i]
-            #     dz = z2 - z1
-            #     n2 = n1 - dz * usl[j, ig]
-            # Can be subtituted by
-            # max_rns_nm = max(rns[j],nm[i])
-            # z2_ea = min((n1-max_rns_nm)/usl[j,ig]+z1,zup[i])
-            # dz_ea = z2_ea - z1
-            # n2_ea = n1 - dz_ea * usl[j,ig]
-
-            Max_rns_nm_Array = maximum(rns_values_specific[j - 1], nm[i])
-            z2_array_specific[j, mask_n1_bigger_nm] = minimum(
-                divide(n1_aux - Max_rns_nm_Array,
-                          usl_array_specific[j]) + z1_aux,
-                zup[i],
-            )[mask_n1_bigger_nm]
-            dz_array_specific[j, mask_n1_bigger_nm] = (z2_array_specific[j] - z1_aux)[
-                mask_n1_bigger_nm
-            ]
-            n2_array_specific[j, mask_n1_bigger_nm] = (
-                n1_aux -
-                multiply(dz_array_specific[j], usl_array_specific[j])
-            )[mask_n1_bigger_nm]
-
-            # Calculate N for all n1 > nm[i]
-
-            N[mask_n1_bigger_nm] += (
-                dz_array_specific[j] * (n1_aux + n2_array_specific[j]) / 2
-            )[mask_n1_bigger_nm]
-
-            # get value of z
-            z_array = ones(data_length) * zup[i - 1] + 0.1
-
-            for j in arange(zup_ea[i - 1], zup_ea[i]):
-
-                # Save values from previous calculation (only after second loop)
-                if j != zup_ea[i - 1]:
-                    z2_array_specific[j, mask_n1_bigger_nm] = z2_array_specific[
-                        j - 1, mask_n1_bigger_nm
-                    ]
-                    n2_array_specific[j, mask_n1_bigger_nm] = n2_array_specific[
-                        j - 1, mask_n1_bigger_nm
-                    ]
-                    dz_array_specific[j, mask_n1_bigger_nm] = dz_array_specific[
-                        j - 1, mask_n1_bigger_nm
-                    ]
-                    usl_array_specific[j, mask_n1_bigger_nm] = usl_array_specific[
-                        j - 1, mask_n1_bigger_nm
-                    ]
-                    rns_values_specific[j, mask_n1_bigger_nm] = rns_values_specific[
-                        j - 1, mask_n1_bigger_nm
-                    ]
-
-                # Sometimes a second loop is necesary if z > z2
-                mask_z_bigger_z2 = logical_and(
-                    mask_n1_bigger_nm,
-                    round(z2_array_specific[j], dec_compare)
-                    <= round(z_array, dec_compare),
-                )
-                if mask_z_bigger_z2.sum() > 0:
-                    indexes = _get_rns_index(
-                        n2_array_specific[j,
-                                          mask_z_bigger_z2], rns, equal_too=True
-                    )
-                    rns_values_specific[j, mask_z_bigger_z2] = rns[indexes]
-                    usl_array_specific[j, mask_z_bigger_z2] = usl_reshaped[
-                        indexes, i - 1
-                    ]
-                    # Save Copy de Z2 y N2
-                    n1_aux[mask_z_bigger_z2] = n2_array_specific[j,
-                                                                 mask_z_bigger_z2]
-                    z1_aux[mask_z_bigger_z2] = z2_array_specific[j,
-                                                                 mask_z_bigger_z2]
-
-                    # Vuelvo al inicio del loop y reviso de nuevo que n2 sea menor que nm
-                    # Vuelvo a calcular mask_n1_bigger_nm
-                    # Para los valores de n1_aux<=nm[i]
-                    mask_z_bigger_z2_1 = logical_and(
-                        mask_z_bigger_z2,
-                        round(n1_aux, dec_compare) <= round(
-                            nm[i], dec_compare),
-                    )
-                    n2_array_specific[j, mask_z_bigger_z2_1] = nm[i,
-                                                                  mask_z_bigger_z2_1]
-                    z2_array_specific[j, mask_z_bigger_z2_1] = zup[i]
-                    dz_array_specific[j, mask_z_bigger_z2_1] = (
-                        z2_array_specific[j] - z1_aux
-                    )[mask_z_bigger_z2_1]
-                    # Recalculate N
-                    N[mask_z_bigger_z2_1] += (
-                        n2_array_specific[j] * (z2_array_specific[j] - z1_aux)
-                    )[mask_z_bigger_z2_1]
-
-                    # For Values n1_aux>nm[i] after second loop
-                    mask_z_bigger_z2_2 = logical_and(
-                        mask_z_bigger_z2,
-                        round(n1_aux, dec_compare) > round(
-                            nm[i], dec_compare),
-                    )
-                    Max_rns_nm_Array = maximum(
-                        rns_values_specific[j], nm[i])
-                    z2_array_specific[j, mask_z_bigger_z2_2] = minimum(
-                        divide(n1_aux - Max_rns_nm_Array,
-                                  usl_array_specific[j])
-                        + z1_aux,
-                        zup[i],
-                    )[mask_z_bigger_z2_2]
-                    dz_array_specific[j, mask_z_bigger_z2_2] = (
-                        z2_array_specific[j] - z1_aux
-                    )[mask_z_bigger_z2_2]
-                    n2_array_specific[j, mask_z_bigger_z2_2] = (
-                        n1_aux
-                        - multiply(dz_array_specific[j], usl_array_specific[j])
-                    )[mask_z_bigger_z2_2]
-                    # Recalculate N
-                    N[mask_z_bigger_z2_2] += (
-                        dz_array_specific[j] *
-                        (n1_aux + n2_array_specific[j]) / 2
-                    )[mask_z_bigger_z2_2]
-                    N_specific[j, mask_z_bigger_z2_2] = (
-                        n1_aux - multiply((z_array - z1_aux),
-                                             usl_array_specific[j])
-                    )[mask_z_bigger_z2_2]
-
-                    # For the rest of the values  Where z < z2 calculate N_Specific
-                    mask_z_rest = logical_xor(
-                        mask_z_bigger_z2, mask_n1_bigger_nm)
-                    N_specific[j, mask_z_rest] = (
-                        n1_aux - multiply((z_array - z1_aux),
-                                             usl_array_specific[j])
-                    )[mask_z_rest]
-                    z_array += 0.1
-
-                    # Generate a new mask for n1 > nm[i]
-                    mask_n1_bigger_nm = logical_xor(
-                        mask_n1_bigger_nm, mask_z_bigger_z2_1
-                    )
-
-                else:
-                    N_specific[j, mask_n1_bigger_nm] = (
-                        n1_aux - multiply((z_array - z1_aux),
-                                             usl_array_specific[j])
-                    )[mask_n1_bigger_nm]
-                    z_array += 0.1
-
-                z1_aux = copy(z2_array_specific[j])
-                n1_aux = copy(n2_array_specific[j])
-
-                if mask_n1_bigger_nm.sum() == 0:
-                    break
-            z1_aux = copy(z2_array_specific[zup_ea[i] - 1])
-            n1_aux = copy(n2_array_specific[zup_ea[i] - 1])
-
-            indexes = _get_rns_index(
-                n2_array_specific[j, mask_z_bigger_z2], rns, equal_too=True
+    # Loudness and rns value of the last 0.1 Bark step of the previous band,
+    # the first band starting from the initial values of the last band
+    n2_last = nm[20]
+    rns_last = _RNS[_get_rns_index(nm[20], _RNS)]
+
+    for i in range(21):
+        nm_round = round(nm[i], dec_compare)
+        indexes = _get_rns_index(n2_last, _RNS)
+        usl_start = _USL_RESHAPED[indexes, i - 1]
+        mask_n1_bigger_nm = round(n2_last, dec_compare) > nm_round
+
+        # For all n1 <= nm[i] calculate (N = N + n2 * (z2 - z1)), n2 = nm[i]
+        rise = flatnonzero(~mask_n1_bigger_nm)
+        N[rise] += nm[i, rise] * (_ZUP[i] - z1_aux[rise])
+
+        # Frames on a slope (n1 > nm[i]) and their state at the current step
+        act = flatnonzero(mask_n1_bigger_nm)
+        n1_act = n1_aux[act]
+        z1_act = z1_aux[act]
+        nm_act = nm[i, act]
+        usl_act = usl_start[act]
+
+        # Last 0.1 Bark step of the band, equal to the main loudness for the
+        # frames that are not on a slope anymore
+        n2_last = nm[i].copy()
+        z2_last = full(data_length, _ZUP[i])
+        rns_max = maximum(rns_last[act], nm_act)
+        rns_last = _RNS[_get_rns_index(nm[i], _RNS)]
+        rns_act = _RNS[indexes[act]]
+
+        if len(act) == 0:
+            n1_aux = n2_last
+            z1_aux = z2_last
+            continue
+
+        # This routine
+        # n2 = rns[j]
+        # if n2 < nm[i]:
+        #     n2 = nm[i]
+        # dz = (n1 - n2) / usl[j, ig]
+        # z2 = z1 + dz
+        # if z2 > zup[i]:
+        #     z2 = zup[i]
+        #     dz = z2 - z1
+        #     n2 = n1 - dz * usl[j, ig]
+        # Can be subtituted by
+        # max_rns_nm = max(rns[j],nm[i])
+        # z2_ea = min((n1-max_rns_nm)/usl[j,ig]+z1,zup[i])
+        # dz_ea = z2_ea - z1
+        # n2_ea = n1 - dz_ea * usl[j,ig]
+        z2_act = minimum((n1_act - rns_max) / usl_act + z1_act, _ZUP[i])
+        dz_act = z2_act - z1_act
+        n2_act = n1_act - dz_act * usl_act
+        N[act] += dz_act * (n1_act + n2_act) / 2
+
+        if not specific:
+            _slopes_total(
+                i, act, z2_act, n2_act, nm_act, rns_act, N, n2_last, z2_last, rns_last
+            )
+            n1_aux = n2_last
+            z1_aux = z2_last
+            continue
+
+        z_value = _ZUP[i - 1] + 0.1
+        for j in range(_ZUP_EA[i - 1], _ZUP_EA[i]):
+            # Sometimes a second loop is necesary if z > z2
+            mask_z_bigger_z2 = round(z2_act, dec_compare) <= round(
+                z_value, dec_compare
             )
-            rns_values_specific[j, mask_z_bigger_z2] = rns[indexes]
-            usl_array_specific[j,
-                               mask_z_bigger_z2] = usl_reshaped[indexes, i - 1]
+            keep = None
+            if mask_z_bigger_z2.any():
+                sel = flatnonzero(mask_z_bigger_z2)
+                indexes = _get_rns_index(n2_act[sel], _RNS, equal_too=True)
+                rns_act[sel] = _RNS[indexes]
+                usl_act[sel] = _USL_RESHAPED[indexes, i - 1]
+                n1_act[sel] = n2_act[sel]
+                z1_act[sel] = z2_act[sel]
+
+                # For n1 <= nm[i], the slope reaches the main loudness
+                below = round(n1_act, dec_compare) <= round(nm_act, dec_compare)
+                mask_z_bigger_z2_1 = mask_z_bigger_z2 & below
+                sel = flatnonzero(mask_z_bigger_z2_1)
+                n2_act[sel] = nm_act[sel]
+                z2_act[sel] = _ZUP[i]
+                N[act[sel]] += n2_act[sel] * (z2_act[sel] - z1_act[sel])
+
+                # For n1 > nm[i], next part of the slope
+                sel = flatnonzero(mask_z_bigger_z2 & ~below)
+                rns_max = maximum(rns_act[sel], nm_act[sel])
+                z2_act[sel] = minimum(
+                    (n1_act[sel] - rns_max) / usl_act[sel] + z1_act[sel], _ZUP[i]
+                )
+                dz = z2_act[sel] - z1_act[sel]
+                n2_act[sel] = n1_act[sel] - dz * usl_act[sel]
+                N[act[sel]] += dz * (n1_act[sel] + n2_act[sel]) / 2
+                keep = ~mask_z_bigger_z2_1
+
+            if keep is None:
+                N_specific[j, act] = n1_act - (z_value - z1_act) * usl_act
+            else:
+                N_specific[j, act[keep]] = (
+                    n1_act - (z_value - z1_act) * usl_act
+                )[keep]
+            z_value += 0.1
+
+            z1_act = z2_act.copy()
+            n1_act = n2_act.copy()
+
+            if j == _ZUP_EA[i] - 1:
+                # The last step of the band is kept for the next band
+                n2_last[act] = n2_act
+                z2_last[act] = z2_act
+                rns_last[act] = rns_act
+                sel = flatnonzero(mask_z_bigger_z2)
+                indexes = _get_rns_index(n2_act[sel], _RNS, equal_too=True)
+                rns_last[act[sel]] = _RNS[indexes]
+
+            # Frames that reached the main loudness leave the slope
+            if keep is not None:
+                act = act[keep]
+                n1_act = n1_act[keep]
+                z1_act = z1_act[keep]
+                n2_act = n2_act[keep]
+                z2_act = z2_act[keep]
+                nm_act = nm_act[keep]
+                usl_act = usl_act[keep]
+                rns_act = rns_act[keep]
+            if len(act) == 0:
+                break
+
+        n1_aux = n2_last
+        z1_aux = z2_last
 
     N[N < 0] = 0
     N[N <= 16] = floor(N[N <= 16] * 1000 + 0.5) / 1000
     N[N > 16] = floor(N[N > 16] * 100 + 0.5) / 100
     if len_1_nm:
         N = N[0]
-        N_specific = N_specific[:, 0]
+        if specific:
+            N_specific = N_specific[:, 0]
 
     return N, N_specific
+
+
+def _slopes_total(i, act, z2, n2, nm, rns, N, n2_last, z2_last, rns_last):
+    """Total loudness of the upper slopes in the band i, without the
+    specific loudness
+
+    The slopes change of steepness (or reach the main loudness) at the
+    first 0.1 Bark step beyond the end of their current part, at most once
+    per step as in _calc_slopes: each iteration jumps to this step for all
+    the frames.
+
+    Parameters
+    ----------
+    i : int
+        Critical band
+    act : numpy.ndarray
+        Frames on a slope at the start of the band
+    z2, n2 : numpy.ndarray
+        Critical band rate and loudness at the end of the first part of the
+        slopes of the frames act
+    nm : numpy.ndarray
+        Main loudness of the band for the frames act
+    rns : numpy.ndarray
+        Range of specific loudness of the first part of the slopes
+    N : numpy.ndarray
+        Total loudness of all the frames, updated in place
+    n2_last, z2_last, rns_last : numpy.ndarray
+        Loudness, critical band rate and rns value of the last 0.1 Bark step
+        of the band for all the frames, updated in place
+
+    Outputs
+    -------
+    None
+    """
+    dec_compare = 8
+    # Critical band rates of the 0.1 Bark steps of the band
+    n_step = _ZUP_EA[i] - _ZUP_EA[i - 1]
+    z_steps = empty(n_step)
+    z_value = _ZUP[i - 1] + 0.1
+    for j in range(n_step):
+        z_steps[j] = z_value
+        z_value += 0.1
+    z_steps = round(z_steps, dec_compare)
+
+    # First step at which the slope of each frame may change
+    step = zeros(len(act), dtype=int)
+    while len(act) > 0:
+        step = maximum(step, searchsorted(z_steps, round(z2, dec_compare)))
+
+        # The frames whose current part of slope goes beyond the band keep it
+        # at the last step
+        end = step >= n_step
+        n2_last[act[end]] = n2[end]
+        z2_last[act[end]] = z2[end]
+        rns_last[act[end]] = rns[end]
+        keep = ~end
+        act, z2, n2, nm, step = act[keep], z2[keep], n2[keep], nm[keep], step[keep]
+        if len(act) == 0:
+            break
+
+        # Next part of the slopes
+        indexes = _get_rns_index(n2, _RNS, equal_too=True)
+        rns = _RNS[indexes]
+        usl = _USL_RESHAPED[indexes, i - 1]
+        n1 = n2.copy()
+        z1 = z2.copy()
+
+        # For n1 <= nm[i], the slope reaches the main loudness
+        below = round(n1, dec_compare) <= round(nm, dec_compare)
+        sel = flatnonzero(below)
+        n2[sel] = nm[sel]
+        z2[sel] = _ZUP[i]
+        N[act[sel]] += n2[sel] * (z2[sel] - z1[sel])
+
+        # For n1 > nm[i], next part of the slope
+        sel = flatnonzero(~below)
+        rns_max = maximum(rns[sel], nm[sel])
+        z2[sel] = minimum((n1[sel] - rns_max) / usl[sel] + z1[sel], _ZUP[i])
+        dz = z2[sel] - z1[sel]
+        n2[sel] = n1[sel] - dz * usl[sel]
+        N[act[sel]] += dz * (n1[sel] + n2[sel]) / 2
+
+        # State of the frames changing at the last step of the band
+        last = step == n_step - 1
+        n2_last[act[last]] = n2[last]
+        z2_last[act[last]] = z2[last]
+        rns_last[act[last]] = _RNS[_get_rns_index(n2[last], _RNS, equal_too=True)]
+
+        # The frames that reached the main loudness leave the slope
+        keep = ~below & ~last
+        act, z2, n2, nm, rns = act[keep], z2[keep], n2[keep], nm[keep], rns[keep]
+        step = step[keep] + 1
@@ -1,5 +1,6 @@
 # Standard library import
-from numpy import round, tile, ones
+from numpy import round, searchsorted
+
 
 def _get_rns_index(array_nm, vector_rns, equal_too=False):
     """Function that returns the index in the array vector_rns for each value of srray _nm
@@ -8,7 +9,7 @@ def _get_rns_index(array_nm, vector_rns, equal_too=False):
     ----------
     array_nm : numpy.ndarray, values of the matrix toget the indexes
 
-    vector_rns:reference vector to get indexes
+    vector_rns:reference vector to get indexes, sorted in decreasing order
     equal_too : boolean
 
     Outputs
@@ -16,25 +17,16 @@ def _get_rns_index(array_nm, vector_rns, equal_too=False):
     indexes :  numpy.ndarray
         Array of indexes
     """
-
-    if len(array_nm.shape) == 1:
-        (wide,) = array_nm.shape
-        (deep,) = vector_rns.shape
-        array_aux = round(tile(array_nm, [deep, 1]), 8)
-        rns_array = round(ones([wide, deep]) * vector_rns, 8).T
-    else:
-        wide, length = array_nm.shape
-        (deep,) = vector_rns.shape
-        array_aux = round(tile(array_nm, [deep, 1, 1]), 8)
-        rns_array = round((ones([wide, length, deep]) * vector_rns), 8).transpose(
-            2, 0, 1
-        )
-        # indexes = (array_aux < rns_array).sum(axis=0)
-        # indexes[indexes==18] = 17
+    # Number of rns values greater than (or equal to) each nm value, both
+    # rounded to 8 decimals
+    rns_ascending = round(vector_rns, 8)[::-1]
     if equal_too:
-        indexes = (array_aux <= rns_array).sum(axis=0)
+        side = "left"
     else:
-        indexes = (array_aux < rns_array).sum(axis=0)
+        side = "right"
+    indexes = len(vector_rns) - searchsorted(
+        rns_ascending, round(array_nm, 8), side=side
+    )
     indexes[indexes == 18] = 17
 
     return indexes
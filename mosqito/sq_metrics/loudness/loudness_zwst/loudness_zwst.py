@@ -10,7 +10,7 @@ from mosqito.sq_metrics.loudness.loudness_zwst._calc_slopes import _calc_slopes
 from mosqito.utils import amp2db
 
 
-def loudness_zwst(signal, fs, field_type="free"):
+def loudness_zwst(signal, fs, field_type="free", workers=1):
     """
     Compute the loudness value from a time signal
 
@@ -20,19 +20,26 @@ def loudness_zwst(signal, fs, field_type="free"):
     Parameters
     ----------
     signal : numpy.array
-        Signal time values [Pa], dim (nperseg, nseg).
+        Signal time values [Pa], dim (nperseg,) or (nperseg, nseg). The
+        columns of a 2D array (time segments or channels) are processed
+        together in a single pass of the filter bank.
     fs : float
         Sampling frequency [Hz]
     field_type : str
         Type of soundfield corresponding to spec_third ("free" by
         default or "diffuse").
+    workers : int, optional
+        Number of threads used to filter the frequency bands in parallel.
+        Default is 1
+        Experimental: the speed-up has only been measured on a
+        single-core machine so far, where there is none.
 
     Returns
     -------
     N : float or array_like
-        Overall loudness array in [sones], size (Ntime,).
+        Overall loudness array in [sones], size (nseg,).
     N_specific : array_like
-        Specific loudness array [sones/bark], size (Nbark, Ntime).
+        Specific loudness array [sones/bark], size (Nbark,) or (Nbark, nseg).
     bark_axis: array_like
         Bark axis array, size (Nbark,).
 
@@ -97,12 +104,14 @@ def loudness_zwst(signal, fs, field_type="free"):
         print(
             "[Warning] Signal resampled to 48 kHz to allow calculation. To fulfill the standard requirements fs should be >=48 kHz."
         )
-        from scipy.signal import resample
+        from mosqito.utils.resample import resample
 
-        signal = resample(signal, int(48000 * len(signal) / fs))
+        signal = resample(signal, fs, 48000)
         fs = 48000
     # Compute third octave band spectrum
-    spec_third, _ = noct_spectrum(signal, fs, fmin=24, fmax=12600)
+    spec_third, _ = noct_spectrum(
+        signal, fs, fmin=24, fmax=12600, workers=workers
+    )
 
     # Compute dB values
     spec_third = amp2db(spec_third, ref=2e-5)
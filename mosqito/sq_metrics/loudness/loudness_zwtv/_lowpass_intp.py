@@ -2,24 +2,44 @@
 
 # Standard library imports
 import math
-from numpy import copy, roll, zeros, shape, arange
+from numpy import zeros, shape, arange, append, concatenate, broadcast_to, asarray
 
 # Needed for the loudness_zwicker_lowpass_intp_ea function
 from scipy import signal
 
 
-def _lowpass_intp(loudness, tau, sample_rate):
+def _lowpass_intp(
+    loudness, tau, sample_rate, state=None, next_loudness=0, interpolate=False
+):
     """1st order low-pass with linear interpolation of signal for
     increased precision
 
+    The filter is applied to the loudness linearly interpolated by a
+    factor 24 and only the output samples at the original sampling rate
+    are kept. By default, the equivalent 1st order recursion at the
+    original sampling rate (input and output sampled every 24 inner
+    iterations) is used, so that the interpolated signal is never built,
+    and it is applied along the last axis of loudness.
+
     Parameters
     ----------
     loudness : numpy.ndarray
-        Loudness vs. time
+        Loudness vs. time, size (Ntime,), or (..., Ntime) if interpolate is
+        False
     tau : float
         Filter parameter
     sample_rate : int
         Louness signal sampling frequency
+    state : dict, optional
+        Filter state "zi" at the end of the previous chunk (zero if None).
+        The dict is updated in place.
+    next_loudness : float or numpy.ndarray, optional
+        Loudness of the sample following the last sample of loudness, used
+        for the linear interpolation, size loudness.shape[:-1]. Default is 0
+        (end of the signal).
+    interpolate : bool, optional
+        If True, the filter is explicitly applied to the interpolated
+        signal (reference implementation). Default is False.
 
     Outputs
     -------
@@ -33,11 +53,33 @@ def _lowpass_intp(loudness, tau, sample_rate):
     num_samples = shape(loudness)[0]
     a1 = math.exp(-1 / (sample_rate * lp_iter * tau))
     b0 = 1 - a1
-    y1 = 0
+    if state is None:
+        zi = zeros(1)
+    else:
+        zi = state["zi"]
+
+    if not interpolate:
+        # Over one sample period, the inner iterations of the filter sum up
+        # to y[n+1] = a1**24 * y[n] + c0 * x[n] + c1 * x[n+1]
+        power = a1 ** arange(lp_iter)
+        sum_0 = power.sum()
+        sum_1 = (arange(lp_iter, 0, -1) * power).sum()
+        c1 = b0 * sum_1 / lp_iter
+        c0 = b0 * sum_0 - c1
+        # The sample following the signal gives the final state
+        next_loudness = broadcast_to(
+            asarray(next_loudness, dtype=float), loudness.shape[:-1]
+        )
+        ui = concatenate((loudness, next_loudness[..., None]), axis=-1)
+        zi = zi + (b0 - c1) * ui[..., :1]
+        filt_loudness = signal.lfilter(
+            [c1, c0], [1, -(a1**lp_iter)], ui, axis=-1, zi=zi
+        )[0]
+        if state is not None:
+            state["zi"] = filt_loudness[..., -1:] - b0 * next_loudness[..., None]
+        return filt_loudness[..., :-1]
 
-    delta = copy(loudness)
-    delta = roll(delta,-1)
-    delta [-1] = 0
+    delta = append(loudness[1:], next_loudness)
     delta = (delta - loudness) /  lp_iter
     ui_delta = zeros(loudness.shape[0]*lp_iter).reshape(loudness.shape[0],lp_iter)
     ui_delta [:,0] = loudness  
@@ -50,7 +92,9 @@ def _lowpass_intp(loudness, tau, sample_rate):
     ui_delta = ui_delta.reshape(lp_iter * num_samples)
 
     # Apply the filter.
-    ui_delta = signal.lfilter([b0], [1, -a1], ui_delta, axis=-1, zi=None)
+    ui_delta, zf = signal.lfilter([b0], [1, -a1], ui_delta, axis=-1, zi=zi)
+    if state is not None:
+        state["zi"] = zf
 
     # Reshape again to recover the first col.
     ui_delta = ui_delta.reshape(loudness.shape[0], lp_iter)
@@ -3,16 +3,24 @@
 
 # Standard library imports
 from math import sqrt, exp
-from numpy import copy, roll, zeros, arange, logical_and, logical_not
+from numpy import copy, zeros, hstack
 
 
-def _nl_loudness(core_loudness):
+def _nl_loudness(core_loudness, state=None, next_loudness=None):
     """Simulate the nonlinear temporal decay of the hearing system
 
     Parameters
     ----------
     core_loudness : numpy.ndarray
         Core loudness
+    state : dict, optional
+        States "uo_last" and "u2_last" of the capacitors C1 and C2 at the
+        end of the previous chunk (zero if None). The dict is updated in
+        place.
+    next_loudness : numpy.ndarray, optional
+        Core loudness of the frame following the last frame of
+        core_loudness, used for the linear interpolation (zero if None,
+        i.e. end of the signal).
 
     Outputs
     -------
@@ -46,27 +54,17 @@ def _nl_loudness(core_loudness):
         exp(-delta_t / t_var),
     ]
     nl_lp = {"B": B}
-    # nl_lp["uo_last"] = 0
-    # nl_lp["u2_last"] = 0
+    if state is None:
+        nl_lp["uo_last"] = zeros(core_loudness.shape[0])
+        nl_lp["u2_last"] = zeros(core_loudness.shape[0])
+    else:
+        nl_lp["uo_last"] = copy(state["uo_last"])
+        nl_lp["u2_last"] = copy(state["u2_last"])
+    if next_loudness is None:
+        next_loudness = zeros(core_loudness.shape[0])
 
-    delta = copy(core_loudness,)
-    delta = roll(delta, -1, axis=1)
-    delta[:, -1] = 0
+    delta = hstack((core_loudness[:, 1:], next_loudness[:, None]))
     delta = (delta - nl_loudness)/nl_iter
-    ui_delta = zeros(core_loudness.size*nl_iter).reshape(
-        core_loudness.shape[0], core_loudness.shape[1], nl_iter)
-    ui_delta[:, :, 0] = core_loudness
-
-    for i_in in arange(1, nl_iter):
-        ui_delta[:, :, i_in] = ui_delta[:, :, i_in - 1] + delta
-
-    ui_delta = ui_delta.reshape(core_loudness.shape[0], core_loudness.shape[1] * nl_iter)
-    uo_mat = copy(ui_delta,)
-    # create u2_mat (equivalent to u2 last) and fill the first col.
-    u2_mat = zeros(uo_mat.shape[0]*uo_mat.shape[1]
-                      ).reshape(uo_mat.shape[0], uo_mat.shape[1])
-    mask = core_loudness[:, 0] >= 1e-5
-    u2_mat[mask, 0] = core_loudness[mask, 0] * (1 - nl_lp["B"][5])
 
     """
     Truth Table for u2 & uo
@@ -86,47 +84,95 @@ def _nl_loudness(core_loudness):
         False                                                                False                  False        ui                                       u2=f(u2(j-1),B(5),ui(j)
  
     """
-    for col in arange(core_loudness.shape[1]*nl_iter):
-        uo2 = uo_mat[:, col-1] * nl_lp["B"][2] - \
-            u2_mat[:, col-1] * nl_lp["B"][3]
-        mask = logical_and(
-            uo_mat[:, col - 1] > u2_mat[:, col - 1], uo2 >= ui_delta[:, col]
-        )
-        uo_mat[mask, col] = uo2[mask]  # in case uo higher than ui
-
-        uo2 = uo_mat[:, col-1] * nl_lp["B"][4]
-        mask = logical_and(uo_mat[:, col-1] <=
-                              u2_mat[:, col-1], uo2 >= ui_delta[:, col])
-        uo_mat[mask, col] = uo2[mask]  # in case uo_2 higher than ui
-
-        u2_mat[:, col] = uo_mat[:, col]  # higher than uo
-        u22 = uo_mat[:, col - 1] * nl_lp["B"][0] - u2_mat[:, col - 1] * nl_lp["B"][1]
-        mask = logical_and(
-            logical_and(
-                ui_delta[:, col] < uo_mat[:, col - 1],
-                uo_mat[:, col - 1] > u2_mat[:, col - 1],
-            ),
-            u22 <= uo_mat[:, col],
-        )
-        u2_mat[mask, col] = u22[mask]  # in case u22 lower than uo_last
-
-        u2_2 = (u2_mat[:, col - 1] - ui_delta[:, col]) * nl_lp["B"][5] + ui_delta[
-            :, col
-        ]
-        mask = logical_and(
-            ui_delta[:, col] >= uo_mat[:, col - 1],
-            logical_not(
-                logical_and(
-                    abs(ui_delta[:, col] - uo_mat[:, col - 1]) < 1e-5,
-                    uo_mat[:, col] <= u2_mat[:, col - 1],
-                )
-            ),
+
+    # The recursion is run band by band on Python floats: each step only
+    # depends on the running states uo and u2 of the band, so that the
+    # 24x-oversampled signal never needs to be stored.
+    for i_band in range(core_loudness.shape[0]):
+        (
+            nl_loudness[i_band],
+            nl_lp["uo_last"][i_band],
+            nl_lp["u2_last"][i_band],
+        ) = _nl_lp_band(
+            core_loudness[i_band].tolist(),
+            delta[i_band].tolist(),
+            nl_lp["uo_last"][i_band],
+            nl_lp["u2_last"][i_band],
+            nl_lp["B"],
+            nl_iter,
         )
-        u2_mat[mask, col] = u2_2[mask]  # lower than ui
 
-    nl_loudness = uo_mat.reshape(
-        core_loudness.shape[0], core_loudness.shape[1], nl_iter
-    )[:, :, 0]
-    uo_mat = uo_mat.reshape(core_loudness.shape[0], core_loudness.shape[1] * nl_iter)
+    if state is not None:
+        state["uo_last"] = nl_lp["uo_last"]
+        state["u2_last"] = nl_lp["u2_last"]
 
     return nl_loudness
+
+
+def _nl_lp_band(ui_frames, delta_frames, uo_last, u2_last, B, nl_iter):
+    """Nonlinear low-pass recursion for one critical band
+
+    Parameters
+    ----------
+    ui_frames : list of float
+        Core loudness of the band vs. time (2 kHz)
+    delta_frames : list of float
+        Increment of the linear interpolation between consecutive frames
+    uo_last : float
+        State of capacitor C1 at the start of the signal
+    u2_last : float
+        State of capacitor C2 at the start of the signal
+    B : list of float
+        Filter constants
+    nl_iter : int
+        Factor for virtual upsampling/inner iterations
+
+    Outputs
+    -------
+    uo_frames : list of float
+        Loudness with non linear temporal decay (2 kHz)
+    uo_last : float
+        State of capacitor C1 at the end of the signal
+    u2_last : float
+        State of capacitor C2 at the end of the signal
+    """
+    B0, B1, B2, B3, B4, B5 = B
+    uo_last = float(uo_last)
+    u2_last = float(u2_last)
+    uo_frames = [0.0] * len(ui_frames)
+    for i_time, ui in enumerate(ui_frames):
+        delta = delta_frames[i_time]
+        # Constant input with uo = u2 = ui is a fixed point of the recursion
+        # (e.g. silence)
+        if delta == 0 and uo_last == ui and u2_last == ui:
+            uo_frames[i_time] = ui
+            continue
+        for i_in in range(nl_iter):
+            if i_in > 0:
+                ui = ui + delta
+            if uo_last > u2_last:
+                uo = uo_last * B2 - u2_last * B3
+                if not uo >= ui:
+                    uo = ui
+                if ui < uo_last:
+                    u2 = uo_last * B0 - u2_last * B1
+                    if not u2 <= uo:
+                        u2 = uo
+                elif abs(ui - uo_last) < 1e-5 and uo <= u2_last:
+                    u2 = uo
+                else:
+                    u2 = (u2_last - ui) * B5 + ui
+            else:
+                uo = uo_last * B4
+                if not uo >= ui:
+                    uo = ui
+                if ui >= uo_last and not (abs(ui - uo_last) < 1e-5 and uo <= u2_last):
+                    u2 = (u2_last - ui) * B5 + ui
+                else:
+                    u2 = uo
+            if i_in == 0:
+                uo_frames[i_time] = uo
+            uo_last = uo
+            u2_last = u2
+
+    return uo_frames, uo_last, u2_last
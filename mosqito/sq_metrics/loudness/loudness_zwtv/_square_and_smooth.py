@@ -5,34 +5,63 @@ import numpy as np
 from scipy.signal import lfilter
 
 
-def _square_and_smooth(sig, center_freq, fs):
+def _square_and_smooth(sig, center_freq, fs, zi=None):
     """3rd order low-pass filtering (See ISO 532-1 section 6.3)
 
     Parameters
     ----------
     sig : numpy.ndarray
-        time signal sampled at 48 kHz [pa]
-    coeff : numpy.ndarray
-        filter coeeficients
-    gain : float
-        filter gain
+        time signal sampled at 48 kHz [pa], size (n_samples,) or
+        (n_samples, n_channels)
+    center_freq : float
+        center frequency of the third octave band [Hz]
+    fs : int
+        time signal sampling frequency
+    zi : numpy.ndarray, optional
+        Initial states of the three low-pass filters, size (3, 1) or
+        (3, 1, n_channels). If provided, the final states are returned as
+        well.
 
     Outputs
     -------
     signal_filt : numpy.ndarray
         filtered time signal
+    zf : numpy.ndarray
+        Final states of the three low-pass filters (only if zi is given)
     """
-    # Frequency dependent time constant
-    if center_freq <= 1000:
-        tau = 2 / (3 * center_freq)
-    else:
-        tau = 2 / (3 * 1000)
     # Squaring
     sig = sig**2
     # Three smoothing low-pass filters
-    a1 = np.exp(-1 / (fs * tau))
+    a1 = _smoothing_pole(center_freq, fs)
     b0 = 1 - a1
-    # zi = signal.lfilter_zi([b0], [1 -a1])
+    if zi is None:
+        for i in range(3):
+            sig = lfilter([b0], [1, -a1], sig, axis=0)
+        return sig
+    zf = np.empty_like(zi)
     for i in range(3):
-        sig = lfilter([b0], [1, -a1], sig)
-    return sig
+        sig, zf[i] = lfilter([b0], [1, -a1], sig, axis=0, zi=zi[i])
+    return sig, zf
+
+
+def _smoothing_pole(center_freq, fs):
+    """Pole of the first order smoothing low-pass filters
+
+    Parameters
+    ----------
+    center_freq : float
+        center frequency of the third octave band [Hz]
+    fs : int
+        time signal sampling frequency
+
+    Outputs
+    -------
+    a1 : float
+        pole of the low-pass filters
+    """
+    # Frequency dependent time constant
+    if center_freq <= 1000:
+        tau = 2 / (3 * center_freq)
+    else:
+        tau = 2 / (3 * 1000)
+    return np.exp(-1 / (fs * tau))
@@ -6,7 +6,7 @@ from mosqito.sq_metrics.loudness.loudness_zwtv._lowpass_intp import (
 )
 
 
-def _temporal_weighting(loudness):
+def _temporal_weighting(loudness, state=None, next_loudness=0, interpolate=False):
     """Temporal weighting of total loudness
 
     Two first-order low-pass filters (time constants 3,5 ms
@@ -17,18 +17,36 @@ def _temporal_weighting(loudness):
     Parameters
     ----------
     loudness : numpy.ndarray
-        Loudness vs. time
+        Loudness vs. time, size (Ntime,), or (Nchannels, Ntime) if
+        interpolate is False
+    state : dict, optional
+        States "lp_1" and "lp_2" of the two low-pass filters at the end of
+        the previous chunk (zero if None). The dict is updated in place.
+    next_loudness : float or numpy.ndarray, optional
+        Loudness of the sample following the last sample of loudness, size
+        (Nchannels,) for several channels.
+        Default is 0 (end of the signal).
+    interpolate : bool, optional
+        If True, the low-pass filters are explicitly applied to the
+        interpolated loudness (reference implementation, see
+        _lowpass_intp). Default is False.
 
     Outputs
     -------
     loudness : numpy.ndarray
         Filtered loudness
     """
+    if state is None:
+        state = {"lp_1": None, "lp_2": None}
     sample_rate = 2000
     tau = 3.5 * 10**-3
-    filt_loudness_1 = _lowpass_intp(loudness, tau, sample_rate)
+    filt_loudness_1 = _lowpass_intp(
+        loudness, tau, sample_rate, state["lp_1"], next_loudness, interpolate
+    )
     tau = 70 * 10**-3
-    filt_loudness_2 = _lowpass_intp(loudness, tau, sample_rate)
+    filt_loudness_2 = _lowpass_intp(
+        loudness, tau, sample_rate, state["lp_2"], next_loudness, interpolate
+    )
 
     loudness = 0.47 * filt_loudness_1 + 0.53 * filt_loudness_2
 
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 # Standard library imports
-from numpy import linspace
+from numpy import linspace, empty, arange
 
 # Local applications imports
 from mosqito.sq_metrics.loudness.loudness_zwst._main_loudness import _main_loudness
@@ -15,7 +15,14 @@ from mosqito.sq_metrics.loudness.loudness_zwtv._third_octave_levels import (
 )
 
 
-def loudness_zwtv(signal, fs, field_type="free"):
+def loudness_zwtv(
+    signal,
+    fs,
+    field_type="free",
+    multirate=False,
+    time_resolution=0.002,
+    workers=1,
+):
     """
     Returns the loudness value from a time signal
 
@@ -25,20 +32,40 @@ def loudness_zwtv(signal, fs, field_type="free"):
     Parameters
     ----------
     signal : numpy.array
-        A time signal values [Pa].
+        A time signal values [Pa], size (Nsamples,) or (Nsamples, Nchannels).
+        The channels of a multichannel signal are processed together.
     fs : integer
         Sampling frequency, can be omitted if the input is a DataTime object.
         Default to None
     field_type : {'free', 'diffuse'}
         Type of soundfield.
         Default is 'free'
+    multirate : bool, optional
+        If True, the third octave band levels are computed with a multirate
+        filter bank: the low frequency bands are filtered and smoothed after
+        an octave-wise decimation of the signal. The computation is faster
+        and the results stay within the ISO 532-1 tolerances, but they are
+        not strictly identical to the ones of the standard filter bank.
+        Default is False
+    time_resolution : float, optional
+        Time resolution [s] of the outputs, shall be a multiple of 0.5 ms.
+        The loudness is computed and temporally weighted every 0.5 ms and
+        then decimated to this resolution, the specific loudness is only
+        computed for the returned time frames.
+        Default is 0.002 (ISO 532-1)
+    workers : int, optional
+        Number of threads used to filter the frequency bands in parallel.
+        Default is 1
+        Experimental: the speed-up has only been measured on a
+        single-core machine so far, where there is none.
     Outputs
     Returns
     -------
     N : float
-        Overall loudness [sones], size (Ntime,).
+        Overall loudness [sones], size (Ntime,) or (Nchannels, Ntime).
     N_specific : numpy.ndarray
-        Specific loudness [sones/bark], size (Nbark, Ntime).
+        Specific loudness [sones/bark], size (Nbark, Ntime) or
+        (Nchannels, Nbark, Ntime).
     bark_axis : numpy.ndarray
         Bark axis, size (Nbark,).
     time_axis : numpy.ndarray
@@ -54,6 +81,7 @@ def loudness_zwtv(signal, fs, field_type="free"):
     .loudness_zwst : Loudness computation for a stationary time signal
     .loudness_zwst_perseg : Loudness computation by time-segment
     .loudness_zwst_freq : Loudness computation from a sound spectrum
+    .LoudnessZwtvStream : Loudness computation for a signal provided chunk by chunk
 
     Notes
     -----
@@ -103,32 +131,70 @@ def loudness_zwtv(signal, fs, field_type="free"):
         print(
             "[Warning] Signal resampled to 48 kHz to allow calculation. To fulfill the standard requirements fs should be >=48 kHz."
         )
-        from scipy.signal import resample
+        from mosqito.utils.resample import resample
 
-        signal = resample(signal, int(48000 * len(signal) / fs))
+        signal = resample(signal, fs, 48000)
         fs = 48000
 
+    # Decimation factor from temporal resolution 0.5 ms to the output one
+    dec_factor = round(time_resolution * 2000)
+    if dec_factor < 1 or abs(dec_factor - time_resolution * 2000) > 1e-6:
+        raise ValueError("ERROR: time_resolution shall be a multiple of 0.5 ms")
+
+    # The channels are stacked along the last axis
+    signal_ndim = signal.ndim
+    n_channels = 1 if signal.ndim == 1 else signal.shape[1]
+    signal = signal.reshape(signal.shape[0], n_channels)
+
     # Compute third octave band spectrum vs. time
-    spec_third, time_axis, _ = _third_octave_levels(signal, fs)
+    spec_third, time_axis, _ = _third_octave_levels(
+        signal, fs, multirate=multirate, workers=workers
+    )
+    n_time = spec_third.shape[1]
 
     # Calculate core loudness (vectorized version)
-    core_loudness = _main_loudness(spec_third, field_type)
+    core_loudness = _main_loudness(spec_third.reshape(28, -1), field_type)
+    core_loudness = core_loudness.reshape(21, n_time, n_channels).transpose(0, 2, 1)
 
     #
     # Nonlinearity
-    core_loudness = _nl_loudness(core_loudness)
+    core_loudness = _nl_loudness(core_loudness.reshape(21 * n_channels, n_time))
+    core_loudness = core_loudness.reshape(21, n_channels, n_time)
     #
-    # Calculation of specific loudness
-    loudness, spec_loudness = _calc_slopes(core_loudness)
-
-    # temporal weigthing
+    # Calculation of specific loudness, by blocks of 2000 returned time
+    # frames. The total loudness is needed every 0.5 ms for the temporal
+    # weighting, the specific loudness is only computed for the returned
+    # time frames
+    block = 2000 * dec_factor
+    loudness = empty((n_channels, n_time))
+    N_spec = empty((n_channels, 240, len(range(0, n_time, dec_factor))))
+    for i_start in range(0, n_time, block):
+        i_stop = min(i_start + block, n_time)
+        core_block = core_loudness[:, :, i_start:i_stop]
+        N_block, spec_loudness = _calc_slopes(
+            core_block[:, :, ::dec_factor].reshape(21, -1)
+        )
+        loudness[:, i_start:i_stop:dec_factor] = N_block.reshape(n_channels, -1)
+        N_spec[:, :, i_start // dec_factor : -(-i_stop // dec_factor)] = (
+            spec_loudness.reshape(240, n_channels, -1).transpose(1, 0, 2)
+        )
+        if dec_factor > 1:
+            # Total loudness only for the other time frames
+            skipped = arange(i_start, i_stop) % dec_factor != 0
+            N_block, _ = _calc_slopes(
+                core_block[:, :, skipped].reshape(21, -1), specific=False
+            )
+            loudness[:, i_start:i_stop][:, skipped] = N_block.reshape(n_channels, -1)
+
+    # temporal weigthing, of all the channels at once
     filt_loudness = _temporal_weighting(loudness)
     #
-    # Decimation from temporal resolution 0.5 ms to 2ms and return
-    dec_factor = 4
-    N = filt_loudness[::dec_factor]
-    N_spec = spec_loudness[:, ::dec_factor]
+    # Decimation from temporal resolution 0.5 ms to the output one and return
+    N = filt_loudness[:, ::dec_factor]
     time_axis = time_axis[::dec_factor]
+    if signal_ndim == 1:
+        N = N[0]
+        N_spec = N_spec[0]
     #
     # Build bark axis
     bark_axis = linspace(0.1, 24, int(24 / 0.1))
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+
+# Standard library imports
+from numpy import linspace, zeros, empty, hstack, arange
+
+# Local applications imports
+from mosqito.utils.resample import ResampleStream
+from mosqito.sq_metrics.loudness.loudness_zwst._main_loudness import _main_loudness
+from mosqito.sq_metrics.loudness.loudness_zwst._calc_slopes import _calc_slopes
+from mosqito.sq_metrics.loudness.loudness_zwtv._nonlinear_decay import _nl_loudness
+from mosqito.sq_metrics.loudness.loudness_zwtv._temporal_weighting import (
+    _temporal_weighting,
+)
+from mosqito.sq_metrics.loudness.loudness_zwtv._third_octave_levels import (
+    _third_octave_levels,
+    _third_octave_levels_state,
+)
+
+
+class LoudnessZwtvStream:
+    """
+    Streaming computation of the loudness of a time signal
+
+    This class computes the acoustic loudness according to Zwicker method for
+    time-varying signals (ISO.532-1:2017) from a signal provided chunk by
+    chunk. The filter states of the calculation are carried from one chunk to
+    the next one, so that the memory used does not depend on the signal
+    duration and the concatenated loudness and specific loudness are
+    identical to the ones of loudness_zwtv applied to the complete signal.
+    The time axis gives the start time of each frame (multiples of the time
+    resolution), while the one of loudness_zwtv is spread over the signal
+    duration, which is unknown while streaming: they differ by less than
+    0.5 ms.
+
+    Parameters
+    ----------
+    fs : integer
+        Sampling frequency [Hz]. A signal sampled below 48 kHz is resampled
+        chunk by chunk (see mosqito.utils.ResampleStream).
+        Default is 48000
+    field_type : {'free', 'diffuse'}
+        Type of soundfield.
+        Default is 'free'
+    multirate : bool, optional
+        If True, the third octave band levels are computed with the
+        multirate filter bank (see loudness_zwtv).
+        Default is False
+    time_resolution : float, optional
+        Time resolution [s] of the outputs, shall be a multiple of 0.5 ms.
+        Default is 0.002 (ISO 532-1)
+    workers : int, optional
+        Number of threads used to filter the frequency bands in parallel.
+        Default is 1
+        Experimental: the speed-up has only been measured on a
+        single-core machine so far, where there is none.
+
+    Attributes
+    ----------
+    bark_axis : numpy.ndarray
+        Bark axis, size (Nbark,).
+
+    Warning
+    -------
+    The time-varying loudness involves a linear interpolation between
+    consecutive 0.5 ms frames, the last frames of a chunk are thus only
+    returned once the next chunk is pushed (or when the stream is flushed).
+    The time axis starts at the first sample pushed.
+
+    See Also
+    --------
+    .loudness_zwtv : Loudness computation for a non-stationary time signal
+
+    Examples
+    --------
+    .. plot::
+       :include-source:
+
+       >>> from mosqito.sq_metrics import LoudnessZwtvStream
+       >>> import matplotlib.pyplot as plt
+       >>> import numpy as np
+       >>> fs=48000
+       >>> d=1
+       >>> dB=60
+       >>> time = np.arange(0, d, 1/fs)
+       >>> f = np.linspace(1000,5000, len(time))
+       >>> stimulus = 0.5 * (1 + np.sin(2 * np.pi * f * time))
+       >>> rms = np.sqrt(np.mean(np.power(stimulus, 2)))
+       >>> ampl = 0.00002 * np.power(10, dB / 20) / rms
+       >>> stimulus = stimulus * ampl
+       >>> stream = LoudnessZwtvStream(fs)
+       >>> N = []
+       >>> for chunk in np.array_split(stimulus, 10):
+       >>>     N_chunk, _, _ = stream.push(chunk)
+       >>>     N.append(N_chunk)
+       >>> N_chunk, _, time_axis = stream.flush()
+       >>> N.append(N_chunk)
+       >>> plt.plot(np.concatenate(N))
+       >>> plt.xlabel("Frame index (2 ms)")
+       >>> plt.ylabel("Loudness [Sone]")
+    """
+
+    def __init__(
+        self,
+        fs=48000,
+        field_type="free",
+        multirate=False,
+        time_resolution=0.002,
+        workers=1,
+    ):
+        self._resampler = None
+        if fs < 48000:
+            print(
+                "[Warning] Signal resampled to 48 kHz to allow calculation. To fulfill the standard requirements fs should be >=48 kHz."
+            )
+            self._resampler = ResampleStream(fs, 48000)
+        # Sampling frequency shall be equal to 48 kHz (as per ISO 532)
+        elif fs != 48000:
+            raise ValueError("""ERROR: Sampling frequency shall be equal to 48 kHz""")
+        # Decimation factor from temporal resolution 0.5 ms to the output one
+        dec_factor = round(time_resolution * 2000)
+        if dec_factor < 1 or abs(dec_factor - time_resolution * 2000) > 1e-6:
+            raise ValueError("ERROR: time_resolution shall be a multiple of 0.5 ms")
+        self._dec_factor = dec_factor
+        self.fs = fs
+        self.field_type = field_type
+        self.multirate = multirate
+        self.workers = workers
+        self.bark_axis = linspace(0.1, 24, int(24 / 0.1))
+        self._reset()
+
+    def _reset(self):
+        """Set the stream back to its initial (silent) state"""
+        # Filter bank, nonlinear decay and temporal weighting states
+        self._toct_state = _third_octave_levels_state(self.multirate)
+        self._nl_state = {"uo_last": zeros(21), "u2_last": zeros(21)}
+        self._tw_state = {"lp_1": {"zi": zeros(1)}, "lp_2": {"zi": zeros(1)}}
+        # Frames waiting for the next one (linear interpolation)
+        self._core_pending = empty((21, 0))
+        self._loudness_pending = empty(0)
+        self._spec_pending = empty((240, 0))
+        # Index of the next 0.5 ms frame to be returned
+        self._i_frame = 0
+
+    def push(self, chunk):
+        """Process a new chunk of the time signal
+
+        Parameters
+        ----------
+        chunk : numpy.array
+            Time signal values [Pa].
+
+        Returns
+        -------
+        N : numpy.ndarray
+            Overall loudness [sones] of the new frames, size (Ntime,).
+        N_specific : numpy.ndarray
+            Specific loudness [sones/bark] of the new frames, size (Nbark, Ntime).
+        time_axis : numpy.ndarray
+            Time axis of the new frames [s], multiples of the time
+            resolution, size (Ntime,).
+        """
+        if self._resampler is not None:
+            chunk = self._resampler.push(chunk)
+
+        # Compute third octave band spectrum vs. time
+        spec_third, _, _ = _third_octave_levels(
+            chunk, 48000, self._toct_state, self.multirate, self.workers
+        )
+
+        # Calculate core loudness
+        if spec_third.shape[1] > 0:
+            core_loudness = _main_loudness(spec_third, self.field_type)
+            core_loudness = core_loudness.reshape(21, spec_third.shape[1])
+            core_loudness = hstack((self._core_pending, core_loudness))
+        else:
+            core_loudness = self._core_pending
+
+        # Nonlinearity, the last frame is kept until the next one is known
+        if core_loudness.shape[1] < 2:
+            self._core_pending = core_loudness
+            return self._output(empty(0), empty((240, 0)))
+        self._core_pending = core_loudness[:, -1:]
+        core_loudness = _nl_loudness(
+            core_loudness[:, :-1], self._nl_state, core_loudness[:, -1]
+        )
+        return self._weighting(core_loudness, is_last=False)
+
+    def flush(self):
+        """Process the frames remaining at the end of the signal
+
+        The stream is then reset and can be used for a new signal.
+
+        Returns
+        -------
+        N : numpy.ndarray
+            Overall loudness [sones] of the last frames, size (Ntime,).
+        N_specific : numpy.ndarray
+            Specific loudness [sones/bark] of the last frames, size (Nbark, Ntime).
+        time_axis : numpy.ndarray
+            Time axis of the last frames [s], multiples of the time
+            resolution, size (Ntime,).
+        """
+        # End of the resampled signal
+        if self._resampler is not None:
+            N_end, N_specific_end, time_axis_end = self.push(self._resampler.flush())
+        if self._core_pending.shape[1] > 0:
+            core_loudness = _nl_loudness(self._core_pending, self._nl_state)
+        else:
+            core_loudness = empty((21, 0))
+        outputs = self._weighting(core_loudness, is_last=True)
+        self._reset()
+        if self._resampler is not None:
+            outputs = (
+                hstack((N_end, outputs[0])),
+                hstack((N_specific_end, outputs[1])),
+                hstack((time_axis_end, outputs[2])),
+            )
+        return outputs
+
+    def _weighting(self, core_loudness, is_last):
+        """Specific loudness calculation and temporal weighting of the frames
+        whose nonlinear decay has been computed"""
+        # Calculation of specific loudness, only for the returned frames
+        if core_loudness.shape[1] > 0:
+            n_frames = core_loudness.shape[1]
+            i_frame = self._i_frame + len(self._loudness_pending) + arange(n_frames)
+            is_kept = i_frame % self._dec_factor == 0
+            loudness = empty(n_frames)
+            spec_loudness = empty((240, n_frames))
+            if is_kept.any():
+                loudness[is_kept], spec_loudness[:, is_kept] = _calc_slopes(
+                    core_loudness[:, is_kept]
+                )
+            if not is_kept.all():
+                loudness[~is_kept], _ = _calc_slopes(
+                    core_loudness[:, ~is_kept], specific=False
+                )
+            loudness = hstack((self._loudness_pending, loudness))
+            spec_loudness = hstack((self._spec_pending, spec_loudness))
+        else:
+            loudness = self._loudness_pending
+            spec_loudness = self._spec_pending
+
+        # Temporal weighting, the last frame is kept until the next one is known
+        if is_last:
+            self._loudness_pending = empty(0)
+            self._spec_pending = empty((240, 0))
+            if len(loudness) == 0:
+                return self._output(empty(0), empty((240, 0)))
+            filt_loudness = _temporal_weighting(loudness, self._tw_state)
+        else:
+            if len(loudness) < 2:
+                self._loudness_pending = loudness
+                self._spec_pending = spec_loudness
+                return self._output(empty(0), empty((240, 0)))
+            self._loudness_pending = loudness[-1:]
+            self._spec_pending = spec_loudness[:, -1:]
+            filt_loudness = _temporal_weighting(
+                loudness[:-1], self._tw_state, loudness[-1]
+            )
+            spec_loudness = spec_loudness[:, :-1]
+        return self._output(filt_loudness, spec_loudness)
+
+    def _output(self, filt_loudness, spec_loudness):
+        """Decimation from temporal resolution 0.5 ms to the output one"""
+        dec_factor = self._dec_factor
+        i_frame = self._i_frame + arange(len(filt_loudness))
+        self._i_frame += len(filt_loudness)
+        is_kept = i_frame % dec_factor == 0
+        time_axis = i_frame[is_kept] / 2000
+        return filt_loudness[is_kept], spec_loudness[:, is_kept], time_axis
@@ -16,6 +16,7 @@ Roughness ECMA 418-2
    :maxdepth: 1
 
    /source/reference/mosqito.sq_metrics.roughness.roughness_ecma.roughness_ecma
+   /source/reference/mosqito.sq_metrics.roughness.roughness_ecma.roughness_ecma_stream
 
 """
 
@@ -24,3 +25,6 @@ __all__ = ['roughness']
 from mosqito.sq_metrics.roughness.roughness_dw.roughness_dw import roughness_dw
 from mosqito.sq_metrics.roughness.roughness_dw.roughness_dw_freq import roughness_dw_freq
 from mosqito.sq_metrics.roughness.roughness_ecma.roughness_ecma import roughness_ecma
+from mosqito.sq_metrics.roughness.roughness_ecma.roughness_ecma_stream import (
+    RoughnessEcmaStream,
+)
@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
 
 # Standard library import
+from functools import lru_cache
 from numpy import zeros, array, arange, interp
 from math import floor
 
+# Channels (0 to 46) weighted by each of the distinct weighting functions H2,
+# H5, H16, H21 and H42
+H_CHANNELS = (slice(0, 4), slice(4, 15), slice(15, 20), slice(20, 41), slice(41, 47))
 
+
+@lru_cache(maxsize=8)
 def _H_weighting(n, fs):
     """Weighting functions Hi definition for each 1-bark-wide interval i
 
@@ -25,6 +31,12 @@ def _H_weighting(n, fs):
         for i = 43,44, ... ,47 (Zi = 21.5,22, ... ,23.5 Bark):
             Hi = H42.
 
+    The weighting functions are only non-zero below 645 Hz, they are thus
+    stored for the half spectrum (frequencies 0 to fs/2) used by the real
+    FFTs. Only the 5 distinct functions are stored, the channels they apply
+    to being given by H_CHANNELS, and they are computed once per (n, fs)
+    pair.
+
     Parameters
     ------------
     N : integer
@@ -34,12 +46,13 @@ def _H_weighting(n, fs):
     Outputs
     -------
     H : numpy.array
-        47 weighting functions Hi
+        Weighting functions H2, H5, H16, H21 and H42, size (5, N//2 + 1),
+        read-only
 
     """
     cut = 2
     # freq_axis = np.concatenate((np.arange(0,int(n/2),1)*fs/n,np.zeros((int(n/2)))))
-    H = zeros((47, n))
+    H = zeros((5, n // 2 + 1))
 
     # H2, H16 and H42 are given
 
@@ -50,14 +63,14 @@ def _H_weighting(n, fs):
     last = floor((358 / fs) * n)
     j = arange(cut, last)
     freq = j * fs / n
-    H[1, j] = interp(freq[j - cut], H2_x, H2_y)
+    H[0, j] = interp(freq[j - cut], H2_x, H2_y)
 
     H5_x = array([0, 32, 43, 56, 69, 92, 120, 142, 165, 231, 277, 331, 397, 502])
     H5_y = array([0, 0.8, 0.95, 1, 0.975, 0.9, 0.8, 0.7, 0.6, 0.4, 0.3, 0.2, 0.1, 0])
     last = floor((502 / fs) * n)
     j = arange(cut, last)
     freq = j * fs / n
-    H[4, j] = interp(freq[j - cut], H5_x, H5_y)
+    H[1, j] = interp(freq[j - cut], H5_x, H5_y)
 
     H16_x = array(
         [
@@ -111,7 +124,7 @@ def _H_weighting(n, fs):
     j = arange(cut, last)
     freq = j * fs / n
 
-    H[15, j] = interp(freq[j - cut], H16_x, H16_y)
+    H[2, j] = interp(freq[j - cut], H16_x, H16_y)
 
     H21_x = array(
         [
@@ -157,7 +170,7 @@ def _H_weighting(n, fs):
             0,
         ]
     )
-    H[20, j] = interp(freq[j - cut], H21_x, H21_y)
+    H[3, j] = interp(freq[j - cut], H21_x, H21_y)
 
     H42_x = array(
         [
@@ -205,18 +218,8 @@ def _H_weighting(n, fs):
             0,
         ]
     )
-    H[41, j] = interp(freq[j - cut], H42_x, H42_y)
-
-    # According to the article we have :
-
-    H[0, :] = H[2, :] = H[3, :] = H[1, :]
-    for i in range(5, 15):
-        H[i, :] = H[4, :]
-    for i in range(16, 20):
-        H[i, :] = H[15, :]
-    for i in range(21, 41):
-        H[i, :] = H[20, :]
-    for i in range(42, 47):
-        H[i, :] = H[41, :]
+    H[4, j] = interp(freq[j - cut], H42_x, H42_y)
 
+    # The cached array is made read-only
+    H.flags.writeable = False
     return H
@@ -1,9 +1,34 @@
 # -*- coding: utf-8 -*-
 
 # Standard imports
-from numpy import concatenate, zeros, arange, where, interp, mean, real, corrcoef, power, sqrt, abs, empty
-from numpy.fft import fft, ifft
-import math
+from functools import lru_cache
+from numpy import (
+    zeros,
+    arange,
+    where,
+    nonzero,
+    mean,
+    power,
+    sqrt,
+    abs,
+    empty,
+    minimum,
+    floor,
+    ceil,
+    clip,
+    sum,
+    broadcast_to,
+    array_equal,
+    bincount,
+    flatnonzero,
+    searchsorted,
+    matmul,
+    log2,
+    pi,
+    cos,
+    sin,
+)
+from numpy.fft import rfft, irfft
 
 # Local imports
 from mosqito.utils.LTQ import LTQ
@@ -11,6 +36,7 @@ from mosqito.sq_metrics.roughness.roughness_dw._ear_filter_coeff import (
     _ear_filter_coeff,
 )
 from mosqito.utils import freq2bark, db2amp, amp2db, bark2freq
+from mosqito.sq_metrics.roughness.roughness_dw._H_weighting import H_CHANNELS
 
 
 def _roughness_dw_main_calc(spec, freq_axis, fs, gzi, hWeight):
@@ -20,20 +46,26 @@ def _roughness_dw_main_calc(spec, freq_axis, fs, gzi, hWeight):
     Parameters
     ----------
     spec : array
-        An amplitude or complex spectrum.
+        An amplitude or complex spectrum, size (nperseg,), or
+        (nperseg, nseg) for several segments.
     freq_axis : array
-        Frequency axis in [Hz].
+        Frequency axis in [Hz], size (nperseg,), or (nperseg, nseg).
     fs : integer
         Sampling frequency.
     gzi : array
         gzi weighting function.
     hWeight : array
-        H weighting function.
+        H weighting functions, see _H_weighting.
 
     Returns
     -------
-    R : float
-        Roughness computed for the given spectrum.
+    R : float or numpy.array
+        Roughness computed for the given spectrum, size (nseg,) for several
+        segments.
+    R_spec : numpy.array
+        Specific roughness, size (47,), or (47, nseg).
+    zi : numpy.array
+        Bark axis of the 47 channels.
 
     """
     if len(spec) != len(freq_axis):
@@ -41,27 +73,41 @@ def _roughness_dw_main_calc(spec, freq_axis, fs, gzi, hWeight):
             "spectrum and frequency axis should have the same number of points !"
         )
 
-    # convert spectrum to 2-sided
-    spec = concatenate((spec, spec[len(spec)::-1]))
+    # The segments are processed together, size (nseg, nperseg)
+    is_segment = spec.ndim == 1
+    spec = spec.reshape(len(spec), -1).T
+    nseg = spec.shape[0]
 
-    n = len(spec)
-    # Frequency axis in Bark
-    bark_axis = freq2bark(freq_axis)
-    # Highest frequency
-    nZ = arange(1, n//2 + 1, 1)
+    # The spectrum is converted to 2-sided, its second half being cancelled
+    # by the a0 factor: only the first half is kept
+    n = 2 * spec.shape[1]
+
+    # Frequency axis in Bark, a0 factor, threshold and minimum excitation
+    # levels, computed once for the frequency axis of roughness_dw
+    default_axis = arange(1, n // 2 + 1) * (fs / n)
+    if freq_axis.ndim == 1 and array_equal(freq_axis, default_axis):
+        freq_axis = freq_axis[None, :]
+        bark_axis, a0, threshold, minExcitDB = _frequency_tables(n, fs)
+    else:
+        freq_axis = freq_axis.reshape(len(freq_axis), -1).T
+        bark_axis, a0, threshold, minExcitDB = _frequency_tables_calc(
+            freq_axis, n, fs
+        )
+    freq_axis, bark_axis, threshold = (
+        broadcast_to(table, spec.shape) for table in (freq_axis, bark_axis, threshold)
+    )
+    minExcitDB = broadcast_to(minExcitDB, (nseg, minExcitDB.shape[1]))
 
     # Calculate Zwicker a0 factor (transfer characteristic of the outer and inner ear)
-    a0 = zeros((n))
-    a0[nZ - 1] = db2amp(_ear_filter_coeff(bark_axis), ref=1)
     spec = a0 * spec
 
     # Conversion of the spec into dB
-    module = abs(spec[0:n//2])
+    module = abs(spec)
     spec_dB = amp2db(module, ref=2e-5)
 
-    # Find the audible components within the spec
-    threshold = LTQ(bark_axis, reference="roughness")
-    audible_index = where(spec_dB > threshold)[0]
+    # Find the audible components within the spec (segment and frequency
+    # indices)
+    audible_seg, audible_index = nonzero(spec_dB > threshold)
     # Number of audible frequencies
     n_aud = len(audible_index)
 
@@ -71,123 +117,315 @@ def _roughness_dw_main_calc(spec, freq_axis, fs, gzi, hWeight):
     # Terhardt's slopes definition
     # lower slope [dB/Bark]
     s1 = -27
-    s2 = zeros((n_aud))
     # upper slope [dB/Bark]
-    for k in arange(0, n_aud, 1):
-        s2[k] = min(
-            -24
-            - (230 / freq_axis[audible_index[k]])
-            + (0.2 * spec_dB[audible_index[k]]),
-            0,
-        )
+    level_aud = spec_dB[audible_seg, audible_index]
+    bark_aud = bark_axis[audible_seg, audible_index]
+    s2 = minimum(
+        -24 - (230 / freq_axis[audible_seg, audible_index]) + (0.2 * level_aud), 0
+    )
 
     # The excitation pattern are calculated for 47 overlapping 1-bark-wide channels
     n_channel = 47
     # Channels number
     zi = arange(1, n_channel + 1) / 2
-    # Center frequencies for each channel
-    zb = bark2freq(zi) * n / fs
-    # Minimum excitation level
-    minExcitDB = interp(zb, nZ, threshold)
-
-    ch_low = zeros((n_aud))
-    ch_high = zeros((n_aud))
-    for i in arange(0, n_aud):
-        # Lower limit of the channel corresponding to each component
-        ch_low[i] = math.floor(2 * bark_axis[audible_index[i]]) - 1
-        # Higher limit
-        ch_high[i] = math.ceil(2 * bark_axis[audible_index[i]]) - 1
-
-    # Creation of the excitation pattern
-    slopes = zeros((n_aud, n_channel))
-    for k in arange(0, n_aud):
-        levDB = spec_dB[audible_index[k]]
-        b = bark_axis[audible_index[k]]
-        for j in arange(0, int(ch_low[k] + 1)):
-            sl = (s1 * (b - ((j + 1) * 0.5))) + levDB
-            if sl > minExcitDB[j]:
-                slopes[k, j] = db2amp(sl, ref=0.00002)
-        for j in arange(int(ch_high[k]), n_channel):
-            sl = (s2[k] * (((j + 1) * 0.5) - b)) + levDB
-            if sl > minExcitDB[j]:
-                slopes[k, j] = db2amp(sl, ref=0.00002)
-
-    # Initialization
-    hBP = zeros((n_channel, n))
-    mod_depth = zeros((n_channel))
-
-    # Definition of the excitation amplitude
-    for i in arange(0, n_channel, 1):
-        exc = zeros((n), dtype=complex)
-        for j in arange(0, n_aud, 1):
-            ind = audible_index[j]
-            # the component belongs to the bark window
-            if ch_low[j] == i:
-                ampl = 1
-            elif ch_high[j] == i:
-                ampl = 1
-            # the component is higher than the bark window
-            elif ch_high[j] > i:
-                ampl = slopes[j, i + 1] / module[ind]
-            # the component is lower than the considered window
-            else:
-                ampl = slopes[j, i - 1] / module[ind]
-
-            # reconstruction of the spec
-            exc[ind] = ampl * spec[ind]
-
-        # The temporal specific excitation functions are obtained by IFFT
-        temporal_excitation = abs(n * real(ifft(exc)))
-        # ------------------------------- stage 2 --------------------------------------
-        # ---------------------modulation depth calculation-----------------------------
-
-        # The fluctuations of the envelope are contained in the low frequency part
-        # of the spec of specific excitations in absolute value
-        h0 = mean(temporal_excitation)
-        envelope_spec = fft(temporal_excitation - h0)
-
-        # This spec is weighted to model the low-frequency  bandpass
-        # characteristic of the roughness on modulation frequency
-        envelope_spec = envelope_spec * hWeight[i, :]
-        # The time functions of the bandpass filtered envelopes hBPi(t)
-        # are calculated via inverse Fourier transform :
-        hBP[i, :] = 2 * real(ifft(envelope_spec))
-
-        # Modulation depth estimation is given by envelope RMS values
-        # and excitation functions time average :
-        hBPrms = sqrt(mean(power(hBP[i, :], 2)))
-        if h0 > 0:
-            mod_depth[i] = hBPrms / h0
-            if mod_depth[i] > 1:
-                mod_depth[i] = 1
-        else:
-            mod_depth[i] = 0
+
+    # Lower limit of the channel corresponding to each component
+    ch_low = floor(2 * bark_aud) - 1
+    # Higher limit
+    ch_high = ceil(2 * bark_aud) - 1
+
+    # Creation of the excitation pattern, size (n_aud, n_channel): the upper
+    # slope overwrites the lower one when both are above the minimum
+    # excitation level of the channel
+    channel = arange(n_channel)
+    bark_ch = (channel + 1) * 0.5
+    sl_low = (s1 * (bark_aud[:, None] - bark_ch)) + level_aud[:, None]
+    sl_high = (s2[:, None] * (bark_ch - bark_aud[:, None])) + level_aud[:, None]
+    low = (channel <= ch_low[:, None]) & (sl_low > minExcitDB[audible_seg])
+    high = (channel >= ch_high[:, None]) & (sl_high > minExcitDB[audible_seg])
+    slopes = zeros((n_aud, n_channel + 1))
+    slopes[:, :n_channel] = where(
+        high,
+        db2amp(sl_high, ref=0.00002),
+        where(low, db2amp(sl_low, ref=0.00002), 0),
+    )
+
+    # Definition of the excitation amplitude, size (n_aud, n_channel)
+    # the component belongs to the bark window
+    in_window = (ch_low[:, None] == channel) | (ch_high[:, None] == channel)
+    # the component is higher (slope of the next channel) or lower (slope of
+    # the previous channel) than the bark window, the last column of slopes
+    # being zero
+    neighbour = where(ch_high[:, None] > channel, channel + 1, channel - 1)
+    ampl = where(
+        in_window,
+        1,
+        slopes[arange(n_aud)[:, None], neighbour]
+        / module[audible_seg, audible_index][:, None],
+    )
+
+    # The temporal specific excitation functions, size (nseg, n_channel, n)
+    temporal_excitation = _temporal_excitation(
+        ampl, spec[audible_seg, audible_index], audible_seg, audible_index, nseg, n
+    )
+
+    # ------------------------------- stage 2 --------------------------------------
+    # ---------------------modulation depth calculation-----------------------------
+    h0, hBP = _envelopes(temporal_excitation, hWeight)
+    del temporal_excitation
+
+    # Modulation depth estimation is given by envelope RMS values
+    # and excitation functions time average :
+    hBPrms = sqrt(mean(power(hBP, 2), axis=-1))
+
+    # The envelopes of the channels excited by steady components only are
+    # constant, their band-pass filtered envelopes being rounding errors of
+    # the FFTs (relative RMS below 1e-15): they are set to zero, and thus
+    # excluded from the correlations like the zero envelopes
+    steady = hBPrms <= 1e-10 * h0
+    hBP[steady] = 0
+    hBPrms[steady] = 0
+    mod_depth = zeros((nseg, n_channel))
+    positive = h0 > 0
+    mod_depth[positive] = minimum(hBPrms[positive] / h0[positive], 1)
+
     # ------------------------------- stage 3 --------------------------------------
     # ----------------roughness calculation with cross correlation------------------
 
     # Crosscorrelation coefficients between the envelopes of the channels
-    # i and i+2 with dz= 1 bark
-    ki = zeros((47))
-
-    for i in range(0, 45):
-        if hBP[i].all() != 0 and hBP[i + 2].all() != 0:
-            ki[i] = corrcoef(hBP[i, :], hBP[i + 2, :])[0, 1]
+    # i and i+2 with dz= 1 bark, for envelopes without zero values
+    ki = zeros((nseg, 47))
+    valid = (hBP != 0).all(axis=-1)
+    valid = valid[:, :45] & valid[:, 2:]
+    hBP -= mean(hBP, axis=-1)[:, :, None]
+    hBP_norm = sqrt(sum(power(hBP, 2), axis=-1))
+    ki[:, :45][valid] = clip(
+        sum(hBP[:, :45][valid] * hBP[:, 2:][valid], axis=-1)
+        / (hBP_norm[:, :45][valid] * hBP_norm[:, 2:][valid]),
+        -1,
+        1,
+    )
 
     # Specific roughness calculation with gzi the modulation depth weighting
     # function given by Aures
-    R_spec = empty((47))
+    R_spec = empty((nseg, 47))
 
-    R_spec[0] = gzi[0] * pow(mod_depth[0] * ki[0], 2)
-    R_spec[1] = gzi[1] * pow(mod_depth[1] * ki[1], 2)
-    for i in arange(2, 45):
-        R_spec[i] = gzi[i] * pow(mod_depth[i] * ki[i] * ki[i - 2], 2)
-    R_spec[45] = gzi[45] * pow(mod_depth[45] * ki[43], 2)
-    R_spec[46] = gzi[46] * pow(mod_depth[46] * ki[44], 2)
+    R_spec[:, 0] = gzi[0] * power(mod_depth[:, 0] * ki[:, 0], 2)
+    R_spec[:, 1] = gzi[1] * power(mod_depth[:, 1] * ki[:, 1], 2)
+    R_spec[:, 2:45] = gzi[2:45] * power(
+        mod_depth[:, 2:45] * ki[:, 2:45] * ki[:, :43], 2
+    )
+    R_spec[:, 45] = gzi[45] * power(mod_depth[:, 45] * ki[:, 43], 2)
+    R_spec[:, 46] = gzi[46] * power(mod_depth[:, 46] * ki[:, 44], 2)
 
     # Total roughness calculation with calibration factor of 0.25 given in the article
     # to produce a roughness of 1 asper for a 1-kHz, 60dB tone with carrier frequency
     # of 70 Hz and a modulation depth of 1
 
-    R = 0.25 * sum(R_spec)
+    R = 0.25 * sum(R_spec, axis=1)
+
+    if is_segment:
+        return R[0], R_spec[0], zi
+    return R, R_spec.T, zi
+
+
+def _temporal_excitation(
+    ampl, components, audible_seg, audible_index, nseg, n, max_direct=None
+):
+    """
+    Temporal specific excitation functions of the 47 channels
+
+    The specific excitation spectra are the audible components weighted by
+    the excitation amplitudes of each channel, and are only non-zero from 0
+    to fs/2: the real part of their inverse FFT is the inverse real FFT of
+    their half spectrum, the components between 0 and fs/2 being halved (or
+    the one at 0 doubled, up to a factor 2). For the segments with few
+    audible components (tonal signals), the excitation functions are
+    computed instead as a direct sum of the cosines of the components,
+    which are shared by the 47 channels. The direct sum costs about
+    (47 + 4) operations per component and sample, and the inverse real FFTs
+    about 2 x 47 x log2(n) operations per sample.
+
+    Parameters
+    ----------
+    ampl : numpy.array
+        Excitation amplitudes of the audible components, size
+        (n_aud, n_channel).
+    components : numpy.array
+        Audible components of the spectra, size (n_aud,).
+    audible_seg : numpy.array
+        Segment of each audible component, in increasing order.
+    audible_index : numpy.array
+        Frequency index of each audible component in the half spectrum.
+    nseg : integer
+        Number of segments.
+    n : integer
+        Size of the full symmetrical spectrum, even.
+    max_direct : float, optional
+        Largest number of audible components of a segment whose excitation
+        functions are computed by direct sum. By default, it is derived
+        from the cost model.
+
+    Outputs
+    -------
+    temporal_excitation : numpy.array
+        Temporal specific excitation functions, size (nseg, n_channel, n).
+    """
+    n_channel = ampl.shape[1]
+    if max_direct is None:
+        max_direct = 2 * n_channel * log2(n) / (n_channel + 4)
+    counts = bincount(audible_seg, minlength=nseg)
+    is_direct = counts <= max_direct
+
+    temporal_excitation = empty((nseg, n_channel, n))
+    for direct in [False, True]:
+        segments = flatnonzero(is_direct == direct)
+        if len(segments) == 0:
+            continue
+        select = is_direct[audible_seg] == direct
+        # Segment of each component in the group, and rank in its segment
+        seg = searchsorted(segments, audible_seg[select])
+        rank = arange(len(seg)) - searchsorted(seg, seg)
+
+        if direct:
+            # Cosines of the components, shared by the channels
+            cos_table, sin_table = _phase_table(n)
+            phase = (audible_index[select][:, None] * arange(n)) % n
+            cosines = zeros((len(segments), counts[segments].max(), n))
+            cosines[seg, rank] = (
+                components[select].real[:, None] * cos_table[phase]
+                - components[select].imag[:, None] * sin_table[phase]
+            )
+            del phase
+            excitation_ampl = zeros((len(segments), n_channel, cosines.shape[1]))
+            excitation_ampl[seg, :, rank] = ampl[select]
+            excitation = matmul(excitation_ampl, cosines)
+        else:
+            # reconstruction of the spec, half spectrum of size
+            # (nseg, n_channel, n//2 + 1)
+            exc = zeros((len(segments), n_channel, n // 2 + 1), dtype=complex)
+            exc[seg, :, audible_index[select]] = (
+                ampl[select] * ((n / 2) * components[select])[:, None]
+            )
+            exc[..., 0] *= 2
+            excitation = irfft(exc, n, axis=-1)
+            del exc
+        abs(excitation, out=excitation)
+        if len(segments) == nseg:
+            return excitation
+        temporal_excitation[segments] = excitation
+
+    return temporal_excitation
+
+
+@lru_cache(maxsize=8)
+def _phase_table(n):
+    """Cosine and sine of 2 pi r / n for r = 0 to n-1, read-only"""
+    phase = 2 * pi * arange(n) / n
+    cos_table = cos(phase)
+    sin_table = sin(phase)
+    cos_table.flags.writeable = False
+    sin_table.flags.writeable = False
+    return cos_table, sin_table
+
+
+def _envelopes(temporal_excitation, hWeight):
+    """
+    Band-pass filtered envelopes of the specific excitations
+
+    The envelopes and the weighting functions are real, the band-pass
+    filtered envelopes (twice the real part of the inverse FFT of the
+    weighted one-sided spectra) are thus the inverse real FFTs of the
+    weighted half spectra.
+
+    Parameters
+    ----------
+    temporal_excitation : numpy.array
+        Temporal specific excitation functions, size (..., n_channel, n),
+        modified in place.
+    hWeight : numpy.array
+        H weighting functions, size (5, n//2 + 1), see _H_weighting.
+
+    Outputs
+    -------
+    h0 : numpy.array
+        Time average of the specific excitations, size (..., n_channel).
+    hBP : numpy.array
+        Band-pass filtered envelopes, size (..., n_channel, n).
+    """
+    n = temporal_excitation.shape[-1]
+
+    # The fluctuations of the envelope are contained in the low frequency part
+    # of the spec of specific excitations in absolute value
+    h0 = mean(temporal_excitation, axis=-1)
+    temporal_excitation -= h0[..., None]
+    envelope_spec = rfft(temporal_excitation, axis=-1)
+
+    # This spec is weighted to model the low-frequency  bandpass
+    # characteristic of the roughness on modulation frequency
+    for H, channels in zip(hWeight, H_CHANNELS):
+        envelope_spec[..., channels, :] *= H
+    # The time functions of the bandpass filtered envelopes hBPi(t)
+    # are calculated via inverse Fourier transform :
+    hBP = irfft(envelope_spec, n, axis=-1)
+
+    return h0, hBP
+
+
+@lru_cache(maxsize=8)
+def _frequency_tables(n, fs):
+    """Tables of _frequency_tables_calc for the frequency axis of
+    roughness_dw, computed once per (n, fs) pair and read-only"""
+    freq_axis = arange(1, n // 2 + 1)[None, :] * (fs / n)
+    tables = _frequency_tables_calc(freq_axis, n, fs)
+    for table in tables:
+        table.flags.writeable = False
+    return tables
+
+
+def _frequency_tables_calc(freq_axis, n, fs):
+    """
+    Tables of the Daniel and Weber roughness depending on the frequency axis
+
+    Parameters
+    ----------
+    freq_axis : numpy.array
+        Frequency axis in [Hz], size (nfreq_axis, nperseg).
+    n : integer
+        Size of the full symmetrical spectrum.
+    fs : integer
+        Sampling frequency.
+
+    Outputs
+    -------
+    bark_axis : numpy.array
+        Frequency axis in [Bark], size (nfreq_axis, nperseg).
+    a0 : numpy.array
+        Zwicker a0 factor, transfer characteristic of the outer and inner
+        ear, size (nfreq_axis, nperseg).
+    threshold : numpy.array
+        Threshold in quiet [dB], size (nfreq_axis, nperseg).
+    minExcitDB : numpy.array
+        Minimum excitation level [dB] of the 47 channels, size
+        (nfreq_axis, 47).
+    """
+    # Frequency axis in Bark
+    bark_axis = freq2bark(freq_axis)
+    # Zwicker a0 factor
+    a0 = db2amp(_ear_filter_coeff(bark_axis), ref=1)
+    # Threshold of the audible components
+    threshold = LTQ(bark_axis, reference="roughness")
+
+    # Highest frequency
+    nZ = arange(1, n//2 + 1, 1)
+    # Center frequencies for each channel
+    zb = bark2freq(arange(1, 48) / 2) * n / fs
+    # Minimum excitation level, linear interpolation of the threshold of each
+    # frequency axis
+    pos = clip(zb, nZ[0], nZ[-1])
+    knot = clip(floor(pos).astype(int), nZ[0], nZ[-2])
+    minExcitDB = (threshold[:, knot] - threshold[:, knot - 1]) * (
+        pos - knot
+    ) + threshold[:, knot - 1]
 
-    return R, R_spec, zi
+    return bark_axis, a0, threshold, minExcitDB
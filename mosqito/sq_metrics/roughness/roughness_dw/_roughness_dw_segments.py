@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# Standard imports
+from numpy import concatenate
+
+# Local imports
+from mosqito.utils._parallel_map import _parallel_map
+from mosqito.sq_metrics.roughness.roughness_dw._roughness_dw_main_calc import (
+    _roughness_dw_main_calc,
+)
+
+# Peak memory [bytes] used by the main calculation per segment, channel and
+# sample of the excitation patterns, measured on white noises whose
+# components are all audible (about 19 MB per 200 ms segment at 48 kHz)
+SEGMENT_MEMORY = 42
+# Default memory [bytes] used by a group of segments
+MAX_MEMORY = 256e6
+
+
+def _roughness_dw_segments(
+    spec, freq_axis, fs, gzi, hWeight, max_memory=None, workers=1, spectrum=None
+):
+    """
+    Daniel and Weber roughness of several segments, computed by groups of
+    segments
+
+    The excitation patterns of the 47 channels of all the segments of a
+    group are transformed together (size (nseg, 47, n)), and the groups are
+    processed in parallel by the worker threads.
+
+    Parameters
+    ----------
+    spec : array
+        Amplitude or complex spectra of the segments, size (nperseg, nseg),
+        or their time signals if spectrum is given.
+    freq_axis : array
+        Frequency axis in [Hz], size (nperseg,), or (nperseg, nseg).
+    fs : integer
+        Sampling frequency.
+    gzi : array
+        gzi weighting function.
+    hWeight : array
+        H weighting function.
+    max_memory : int, optional
+        Approximate memory [bytes] used by a group of segments, with a
+        minimum of one segment. By default, 256 MB.
+    workers : int, optional
+        Number of threads processing the groups of segments. Default is 1
+    spectrum : callable, optional
+        Function computing the spectra of a group of segments from the
+        columns of spec, so that the spectra of all the segments are not
+        held together. By default, spec contains the spectra.
+
+    Outputs
+    -------
+    R : numpy.array
+        Roughness of each segment, size (nseg,).
+    R_spec : numpy.array
+        Specific roughness, size (47, nseg).
+    bark_axis : numpy.array
+        Bark axis of the 47 channels.
+    """
+    if max_memory is None:
+        max_memory = MAX_MEMORY
+    nseg = spec.shape[1]
+    # Segments per group
+    segment_memory = SEGMENT_MEMORY * 47 * 2 * len(freq_axis)
+    group = max(1, int(max_memory // segment_memory))
+    groups = [(i0, min(i0 + group, nseg)) for i0 in range(0, nseg, group)]
+
+    def _group_roughness(bounds):
+        i0, i1 = bounds
+        spec_group = spec[:, i0:i1]
+        if spectrum is not None:
+            spec_group = spectrum(spec_group)
+        freq_group = freq_axis if freq_axis.ndim == 1 else freq_axis[:, i0:i1]
+        return _roughness_dw_main_calc(spec_group, freq_group, fs, gzi, hWeight)
+
+    results = _parallel_map(_group_roughness, groups, workers)
+    R = concatenate([res[0] for res in results])
+    R_spec = concatenate([res[1] for res in results], axis=1)
+
+    return R, R_spec, results[0][2]
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 # Standard imports
-from numpy import arange, empty
+from numpy import arange
 
 # Local imports
 from mosqito.utils.time_segmentation import time_segmentation
@@ -9,11 +9,14 @@ from mosqito.sound_level_meter.comp_spectrum import comp_spectrum
 from mosqito.sq_metrics.roughness.roughness_dw._roughness_dw_main_calc import (
     _roughness_dw_main_calc,
 )
+from mosqito.sq_metrics.roughness.roughness_dw._roughness_dw_segments import (
+    _roughness_dw_segments,
+)
 from mosqito.sq_metrics.roughness.roughness_dw._gzi_weighting import _gzi_weighting
 from mosqito.sq_metrics.roughness.roughness_dw._H_weighting import _H_weighting
 
 
-def roughness_dw(signal, fs, overlap=0.5):
+def roughness_dw(signal, fs, overlap=0.5, max_memory=None, workers=1):
     """
     Computes the roughness according to Daniel and Weber method
     from a time signal
@@ -29,6 +32,15 @@ def roughness_dw(signal, fs, overlap=0.5):
         Sampling frequency [Hz]
     overlap : float
         Overlapping coefficient for the time windows of 200ms
+    max_memory : int, optional
+        Approximate memory [bytes] used by a group of time windows, whose
+        excitation patterns are computed together (about 19 MB per window
+        at 48 kHz, with a minimum of one window). By default, 256 MB.
+    workers : int, optional
+        Number of threads processing the groups of time windows in
+        parallel. Default is 1
+        Experimental: the speed-up has only been measured on a
+        single-core machine so far, where there is none.
 
     Returns
     -------
@@ -94,12 +106,10 @@ def roughness_dw(signal, fs, overlap=0.5):
     sig, time = time_segmentation(
         signal, fs, nperseg=nperseg, noverlap=noverlap, is_ecma=False
     )
-    if len(sig.shape) == 1:
-        nseg = 1
-    else:
-        nseg = sig.shape[1]
 
-    spec, _ = comp_spectrum(sig, fs, nfft="default", window="blackman", db=False)
+    # Amplitude spectrum of the segments
+    def _spectrum(sig):
+        return comp_spectrum(sig, fs, nfft="default", window="blackman", db=False)[0]
 
     # Frequency axis in Hertz
     freq_axis = arange(1, nperseg // 2 + 1, 1) * (fs / nperseg)
@@ -109,16 +119,14 @@ def roughness_dw(signal, fs, overlap=0.5):
     # Aures modulation depth weighting function
     gzi = _gzi_weighting(arange(1, 48, 1) / 2)
 
-    if len(spec.shape) > 1:
-        R = empty((nseg))
-        R_spec = empty((47, nseg))
-        for i in range(nseg):
-            R[i], R_spec[:, i], bark_axis = _roughness_dw_main_calc(
-                spec[:, i], freq_axis, fs, gzi, hWeight
-            )
+    if len(sig.shape) > 1:
+        # Spectra computed by groups of segments
+        R, R_spec, bark_axis = _roughness_dw_segments(
+            sig, freq_axis, fs, gzi, hWeight, max_memory, workers, _spectrum
+        )
     else:
         R, R_spec, bark_axis = _roughness_dw_main_calc(
-            spec, freq_axis, fs, gzi, hWeight
+            _spectrum(sig), freq_axis, fs, gzi, hWeight
         )
 
     return R, R_spec, bark_axis, time
@@ -1,17 +1,20 @@
 # -*- coding: utf-8 -*-
 
 # Standard imports
-from numpy import empty, arange, mean, tile
+from numpy import arange, mean
 
 # Local imports
 from mosqito.sq_metrics.roughness.roughness_dw._roughness_dw_main_calc import (
     _roughness_dw_main_calc,
 )
+from mosqito.sq_metrics.roughness.roughness_dw._roughness_dw_segments import (
+    _roughness_dw_segments,
+)
 from mosqito.sq_metrics.roughness.roughness_dw._gzi_weighting import _gzi_weighting
 from mosqito.sq_metrics.roughness.roughness_dw._H_weighting import _H_weighting
 
 
-def roughness_dw_freq(spectrum, freqs):
+def roughness_dw_freq(spectrum, freqs, max_memory=None, workers=1):
     """
     Computes the roughness according to Daniel and Weber method from
     a fine band spectrum
@@ -26,6 +29,15 @@ def roughness_dw_freq(spectrum, freqs):
     freqs : array
         Input frequency axis , dim (nperseg) if identical for all the blocks,
         else (nperseg x nseg).
+    max_memory : int, optional
+        Approximate memory [bytes] used by a group of blocks, whose
+        excitation patterns are computed together (about 19 MB per block
+        at 48 kHz, with a minimum of one block). By default, 256 MB.
+    workers : int, optional
+        Number of threads processing the groups of blocks in parallel.
+        Default is 1
+        Experimental: the speed-up has only been measured on a
+        single-core machine so far, where there is none.
 
     Returns
     -------
@@ -112,11 +124,10 @@ def roughness_dw_freq(spectrum, freqs):
         nseg = spectrum.shape[1]
         # one frequency axis per block
         if len(freqs.shape) > 1:
-            fs = int(2 * nperseg * mean(freqs[0, 1:] - freqs[0, :-1]))
+            fs = int(2 * nperseg * mean(freqs[1:, 0] - freqs[:-1, 0]))
         # one frequency axis for all the blocks
         elif len(freqs.shape) == 1:
             fs = int(2 * nperseg * mean(freqs[1:] - freqs[:-1]))
-            freqs = tile(freqs, (nseg, 1)).T
 
     # Initialization of the weighting functions H and g
     hWeight = _H_weighting(2 * nperseg, fs)
@@ -124,12 +135,9 @@ def roughness_dw_freq(spectrum, freqs):
     gzi = _gzi_weighting(arange(1, 48, 1) / 2)
 
     if len(spectrum.shape) > 1:
-        R = empty((nseg))
-        R_spec = empty((47, nseg))
-        for i in range(nseg):
-            R[i], R_spec[:, i], bark_axis = _roughness_dw_main_calc(
-                spectrum[:, i], freqs[:, i], fs, gzi, hWeight
-            )
+        R, R_spec, bark_axis = _roughness_dw_segments(
+            spectrum, freqs, fs, gzi, hWeight, max_memory, workers
+        )
     else:
         R, R_spec, bark_axis = _roughness_dw_main_calc(
             spectrum, freqs, fs, gzi, hWeight
@@ -4,6 +4,7 @@
    :maxdepth: 1
 
    /source/mosqito.sq_metrics.roughness.roughness_ecma.roughness_ecma
+   /source/mosqito.sq_metrics.roughness.roughness_ecma.roughness_ecma_stream
 
 
 """
\ No newline at end of file
@@ -0,0 +1,201 @@
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import hilbert, cheby1, sosfilt, sosfilt_zi
+
+
+def _band_envelopes(
+    bandpass_signals,
+    sb,
+    sh,
+    n_blocks,
+    downsampling_factor=32,
+    start=0,
+    segment_blocks=16,
+    margin=16384,
+    factors=None,
+):
+    """
+    Calculates the downsampled envelopes of the band-pass signals, as
+    described in ECMA-418-2 (2nd Ed, 2022) section 7.1.2, and segments them
+    into blocks.
+
+    The envelope of each band is computed and downsampled once on a
+    continuous part of the band-pass signal covering segment_blocks
+    consecutive blocks plus a margin on each side, and only then segmented.
+    The overlapping parts of the blocks are thus not transformed several
+    times, and the envelopes of a group of blocks do not depend on the
+    samples outside of its margins.
+
+    Parameters
+    ----------
+    bandpass_signals : list of numpy.array
+        Band-pass signals of the 53 critical bands, size (n_samples,), in
+        single or double precision
+    sb : int
+        Block size at 48 kHz, multiple of downsampling_factor
+    sh : int
+        Hop size at 48 kHz, multiple of downsampling_factor
+    n_blocks : int
+        Number of blocks
+    downsampling_factor : int, optional
+        Downsampling factor of the envelopes, applied in two decimation
+        steps (by downsampling_factor // 4, then by 4). Default is 32.
+    start : int, optional
+        Index of the first sample of the first block in the band-pass
+        signals, multiple of downsampling_factor. Default is 0.
+    segment_blocks : int, optional
+        Number of blocks per continuous part. Default is 16.
+    margin : int, optional
+        Number of samples added on each side of the continuous parts,
+        within the band-pass signals, multiple of downsampling_factor.
+        Default is 16384.
+    factors : array of int, optional
+        Sampling rate reduction factor of each band, the band-pass signal
+        of band z being sampled at 48000 / factors[z] Hz (see
+        _multirate_factors), at most downsampling_factor // 4. Its
+        envelope is computed at this rate, the first decimation step
+        being reduced accordingly with the cut-off frequency of the step
+        at 48 kHz (filtering only if factors[z] is downsampling_factor //
+        4). The sizes and indices
+        above remain given at 48 kHz. By default, all the signals are
+        sampled at 48 kHz.
+
+    Returns
+    -------
+    envelopes : numpy.array
+        Downsampled envelopes, size (n_blocks, 53, sb // downsampling_factor)
+    """
+    sbb = sb // downsampling_factor
+    shb = sh // downsampling_factor
+    if factors is None:
+        factors = np.ones(len(bandpass_signals), dtype=int)
+
+    # The envelopes are kept in the precision of the band-pass signals
+    envelopes = np.empty(
+        (n_blocks, len(bandpass_signals), sbb), dtype=bandpass_signals[0].dtype
+    )
+    for l0 in range(0, n_blocks, segment_blocks):
+        l1 = min(l0 + segment_blocks, n_blocks)
+        i0 = start + l0 * sh
+        for z, (signal, factor) in enumerate(zip(bandpass_signals, factors)):
+            a = max(0, i0 - margin)
+            b = min(signal.shape[0] * factor, i0 + (l1 - l0 - 1) * sh + sb + margin)
+            envelope = abs(hilbert(signal[a // factor : -(-b // factor)]))
+            q = downsampling_factor // 4
+            envelope = _decimate(envelope, q // factor, 0.8 * factor / q)
+            envelope = _decimate(envelope, 4)
+            blocks = sliding_window_view(envelope, sbb)
+            blocks = blocks[(i0 - a) // downsampling_factor :: shb]
+            envelopes[l0:l1, z, :] = blocks[: l1 - l0]
+
+    return envelopes
+
+
+def _block_envelopes(
+    bandpass_signals, sb, sh, n_blocks, downsampling_factor=32, segment_blocks=16
+):
+    """
+    Calculates the downsampled envelopes of the blocks of the band-pass
+    signals, block by block as described in ECMA-418-2 (2nd Ed, 2022)
+    section 7.1.2.
+
+    The envelopes of the blocks of all the bands are computed at once, by
+    groups of segment_blocks blocks. They are the ones of _band_envelopes
+    with segment_blocks = 1 and margin = 0.
+
+    Parameters
+    ----------
+    bandpass_signals : numpy.array
+        Band-pass signals of the 53 critical bands, size (53, n_samples),
+        in single or double precision, the first block starting at the
+        first sample
+    sb : int
+        Block size at 48 kHz, multiple of downsampling_factor
+    sh : int
+        Hop size at 48 kHz
+    n_blocks : int
+        Number of blocks
+    downsampling_factor : int, optional
+        Downsampling factor of the envelopes, applied in two decimation
+        steps (by downsampling_factor // 4, then by 4). Default is 32.
+    segment_blocks : int, optional
+        Number of blocks transformed together. Default is 16.
+
+    Returns
+    -------
+    envelopes : numpy.array
+        Downsampled envelopes, size (n_blocks, 53, sb // downsampling_factor)
+    """
+    blocks = sliding_window_view(bandpass_signals, sb, axis=1)[:, ::sh]
+    envelopes = np.empty(
+        (n_blocks, bandpass_signals.shape[0], sb // downsampling_factor),
+        dtype=bandpass_signals.dtype,
+    )
+    for l0 in range(0, n_blocks, segment_blocks):
+        l1 = min(l0 + segment_blocks, n_blocks)
+        envelope = abs(hilbert(blocks[:, l0:l1], axis=-1))
+        envelope = _decimate(envelope, downsampling_factor // 4)
+        envelope = _decimate(envelope, 4)
+        envelopes[l0:l1] = np.swapaxes(envelope, 0, 1)
+
+    return envelopes
+
+
+def _decimate(x, q, cutoff=None):
+    """Downsampling of a signal by an integer factor q, as
+    scipy.signal.decimate(x, q) (order 8 Chebyshev type I filter applied
+    forward and backward), with a filter designed once per factor and
+    applied in the precision of the signal
+
+    Parameters
+    ----------
+    x : numpy.array
+        Signal, size (..., n_samples), in single or double precision, the
+        downsampling being applied along the last axis
+    q : int
+        Downsampling factor
+    cutoff : float, optional
+        Cut-off frequency of the filter, relative to the Nyquist frequency
+        of x. Default is 0.8 / q, as scipy.signal.decimate
+
+    Outputs
+    -------
+    y : numpy.array
+        Downsampled signal, size (..., ceil(n_samples / q))
+    """
+    if cutoff is None:
+        cutoff = 0.8 / q
+    sos, zi, padlen = _decimation_filter(cutoff, x.dtype.char)
+    # Initial conditions of the sections for each signal
+    zi = zi.reshape((zi.shape[0],) + (1,) * (x.ndim - 1) + (2,))
+
+    # Odd extension of the signal at both ends
+    ext = np.concatenate(
+        (
+            2 * x[..., :1] - x[..., padlen:0:-1],
+            x,
+            2 * x[..., -1:] - x[..., -2 : -padlen - 2 : -1],
+        ),
+        axis=-1,
+    )
+    y, _ = sosfilt(sos.copy(), ext, zi=zi * ext[..., :1])
+    y, _ = sosfilt(sos.copy(), y[..., ::-1], zi=zi * y[..., -1:])
+
+    return y[..., ::-1][..., padlen:-padlen:q]
+
+
+@lru_cache(maxsize=None)
+def _decimation_filter(cutoff, dtype):
+    """Sections, initial conditions and padding length of the decimation
+    filter of scipy.signal.decimate and scipy.signal.sosfiltfilt"""
+    sos = cheby1(8, 0.05, cutoff, output="sos")
+    zi = sosfilt_zi(sos)
+    ntaps = 2 * sos.shape[0] + 1
+    ntaps -= min((sos[:, 2] == 0).sum(), (sos[:, 5] == 0).sum())
+    sos = sos.astype(dtype)
+    zi = zi.astype(dtype)
+    sos.flags.writeable = False
+    zi.flags.writeable = False
+    return sos, zi, 3 * ntaps
@@ -1,5 +1,7 @@
 import numpy as np
 
+from mosqito.sq_metrics.roughness.roughness_ecma._padded_operations import _padded_sum, _scalar_power
+
 def _estimate_fund_mod_rate(f_p, Ai_tilde):
     """ Function to estimate the fundamental modulation rate from a set of peaks 
     frequency and amplitude, according to section 7.1.5.3 of ECMA 418-2 (2nd edition, 2022).
@@ -61,4 +63,84 @@ def _estimate_fund_mod_rate(f_p, Ai_tilde):
     w_peak = 1 + 0.1 * np.abs(np.sum(f_p[I_max]*Ai_tilde[I_max])/np.sum(Ai_tilde[I_max])-f_p[i_peak])**0.749
     A_hat = Ai_tilde[I_max] * w_peak    
     
-    return mod_rate, A_hat
\ No newline at end of file
+    return mod_rate, A_hat
+
+
+def _estimate_fund_mod_rate_batch(f_p, Ai_tilde, N_peak):
+    """ Vectorised version of _estimate_fund_mod_rate, for sets of peaks
+    padded with zeros.
+
+    The harmonic complexes of all the peaks are evaluated at once, their
+    peaks being sorted as in _estimate_fund_mod_rate (candidates with a
+    single integer ratio first, then the best candidates of the repeated
+    ratios, by increasing ratio), so that the sums are the same.
+
+    Parameters:
+    -----------
+    f_p : numpy.array
+        Estimated modulation rates of maxima, dim(N, N_max)
+    Ai_tilde : numpy.array
+        Weighted amplitudes of maxima, dim(N, N_max)
+    N_peak : numpy.array
+        Number of maxima of each set, at least one, dim(N)
+
+    Returns:
+    --------
+    mod_rate : numpy.array
+        Fundamental rates estimated, dim(N)
+    
+    A_hat : numpy.array
+        Weighted amplitudes of the peaks of the harmonic complexes of the
+        fundamental modulation rates, padded with zeros, dim(N, max(N_peak))
+
+    N_hat : numpy.array
+        Number of peaks of the harmonic complexes, dim(N)
+    """
+    # Padding beyond the largest set is not needed
+    P = N_peak.max(initial=1)
+    f_p, Ai_tilde = f_p[:, :P], Ai_tilde[:, :P]
+    N = len(N_peak)
+    rows = np.arange(N)
+    index = np.arange(P)
+    valid = index < N_peak[:, np.newaxis]
+    f_p = np.where(valid, f_p, 1)
+
+    # Axes: set, current peak i0, peak, other peak
+    f_i0 = f_p[:, :, np.newaxis]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # integer ratios of all peaks' modulation rates to the current peak modulation rate (eq 88)
+        R_i0 = np.round(f_p[:, np.newaxis, :]/f_i0)
+        # choose the best candidate among the peaks with the same ratio (eq 89)
+        crit = np.abs( (f_p[:, np.newaxis, :] / (R_i0 * f_i0)) - 1)
+        # harmonic complex (eq 90)
+        h_complex = np.abs(f_p[:, np.newaxis, :]/(R_i0*f_i0+10e-10)-1)
+    same = (R_i0[..., :, np.newaxis] == R_i0[..., np.newaxis, :]) & valid[:, np.newaxis, np.newaxis, :]
+    duplicate = same.sum(axis=-1) > 1
+    crit_j, crit_k = crit[..., :, np.newaxis], crit[..., np.newaxis, :]
+    beaten = same & ((crit_k < crit_j) | ((crit_k == crit_j) & (index < index[:, np.newaxis])))
+    candidate = valid[:, np.newaxis, :] & ~beaten.any(axis=-1)
+    I_i0 = candidate & (h_complex < 0.04)
+
+    # Peaks of the harmonic complexes, in the order of _estimate_fund_mod_rate
+    order = np.lexsort((R_i0, duplicate, ~I_i0), axis=-1)
+    N_i0 = I_i0.sum(axis=-1)
+    in_complex = index < N_i0[..., np.newaxis]
+    A_i0 = np.where(in_complex, np.take_along_axis(np.broadcast_to(Ai_tilde[:, np.newaxis, :], order.shape), order, axis=-1), 0)
+
+    # energy of the harmonic complex (eq 91)
+    E_i0 = np.where(valid, _padded_sum(A_i0, N_i0), -np.inf)
+
+    # The harmonic complex corresponding to the best fundamental modulation rate is the one with the highest sum
+    i_max = np.argmax(E_i0, axis=1)
+    mod_rate = f_p[rows, i_max]
+    N_hat = N_i0[rows, i_max]
+    A_max = A_i0[rows, i_max]
+    f_max = np.where(in_complex[rows, i_max], np.take_along_axis(f_p, order[rows, i_max], axis=1), 0)
+
+    i_peak = np.argmax(np.where(in_complex[rows, i_max], A_max, -np.inf), axis=1)
+    # Weighting depending on the distance between the mod rate and the center of gravity of the peaks list (eq 93)
+    center = _padded_sum(f_max*A_max, N_hat)/_padded_sum(A_max, N_hat)
+    w_peak = 1 + 0.1 * _scalar_power(np.abs(center-f_p[rows, i_peak]), 0.749)
+    A_hat = A_max * w_peak[:, np.newaxis]
+
+    return mod_rate, A_hat, N_hat
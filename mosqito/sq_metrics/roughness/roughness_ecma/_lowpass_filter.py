@@ -49,4 +49,48 @@ def _lowpass_filter(R_hat):
     R_time_spec[0,:] = R_hat[0,:]
     R_time_spec[1:,:] = (R_hat[1,:]*(1-np.exp(-1/(50*tau[1,:])))  + R_hat[0:-1,:]*np.exp(-1/(50*tau[1,:])))
 
-    return R_time_spec
\ No newline at end of file
+    return R_time_spec
+
+def _lowpass_filter_frames(R_hat, state):
+    """
+    Lowpass filtering of _lowpass_filter applied to successive groups of
+    frames, the outputs being the ones of _lowpass_filter applied to all
+    the frames at once. As in _lowpass_filter, each frame is filtered with
+    the previous one, the values and time constants of the second frame.
+
+    Parameters
+    ----------
+    R_hat : array
+        Array of specific roughness calibrated values of the new frames,
+        dim (Ntime50, Nbark)
+    state : dict
+        Previous frame ("R_hat_last"), second frame ("R_hat_1") and its
+        filter coefficients ("exp_1"), None until they are known. The
+        dictionary is updated in place.
+
+    Returns
+    -------
+    R_time_spec : numpy.array
+        Time-dependent specific roughness of the new frames, dim (Ntime50, Nbark)
+    """
+    R_time_spec = np.zeros(R_hat.shape)
+    for l, R_hat_l in enumerate(R_hat):
+        if state["R_hat_last"] is None:
+            #  First time block l_50 = 0
+            R_time_spec[l] = R_hat_l
+        else:
+            if state["R_hat_1"] is None:
+                # Filtering time constants (Eq. 110) of the second frame
+                R_rising = np.zeros(R_hat_l.shape, dtype=bool)
+                R_rising[1:] = np.diff(R_hat_l) >= 0
+                tau = np.where(R_rising, 0.0625, 0.5000)
+                state["R_hat_1"] = R_hat_l
+                state["exp_1"] = np.exp(-1 / (50 * tau))
+            # Apply filter (Eq. 109)
+            R_time_spec[l] = (
+                state["R_hat_1"] * (1 - state["exp_1"])
+                + state["R_hat_last"] * state["exp_1"]
+            )
+        state["R_hat_last"] = R_hat_l
+
+    return R_time_spec
@@ -0,0 +1,87 @@
+import numpy as np
+from scipy.fft import rfft
+
+# Project Imports
+from mosqito.sq_metrics.loudness.loudness_ecma._auditory_filters_centre_freq import _auditory_filters_centre_freq
+from mosqito.sq_metrics.roughness.roughness_ecma._weighting import _f_max, _r_max, _Q2_high, _Q2_low, _high_mod_rate_weighting_batch, _low_mod_rate_weighting_batch
+from mosqito.sq_metrics.roughness.roughness_ecma._estimate_fund_mod_rate import _estimate_fund_mod_rate_batch
+from mosqito.sq_metrics.roughness.roughness_ecma._peak_picking import _peak_picking_batch
+from mosqito.sq_metrics.roughness.roughness_ecma._von_hann_window import _von_hann_window
+from mosqito.sq_metrics.roughness.roughness_ecma._noise_reduction import _noise_reduction
+
+
+def _modulation_amplitudes(envelopes_downsampled, N_specific):
+    """Modulation amplitudes of the blocks
+
+    Calculates the scaled power spectra of the envelopes (section 7.1.3),
+    applies the noise reduction (7.1.4) and the spectral weighting (7.1.5)
+    of ECMA 418-2 (2nd edition 2022). Each block is processed
+    independently, the spectral weighting being applied to all the blocks
+    and critical bands at once.
+
+    Parameters
+    ----------
+    envelopes_downsampled : numpy.array
+        Downsampled envelopes of the blocks, size (Ntime, Nbark, sbb), in
+        single or double precision
+    N_specific : numpy.array
+        Specific loudness of the blocks, size (Ntime, Nbark)
+
+    Returns
+    -------
+    amplitude : numpy.array
+        Modulation amplitudes, size (Ntime, Nbark)
+    """
+    L, CBF, sbb = envelopes_downsampled.shape
+    center_freq = _auditory_filters_centre_freq()
+
+    # CALCULATION OF SCALED POWER SPECTRUM (7.1.3)
+    
+    # Maximum loudness in each time block
+    N_specific_max = np.asarray(N_specific).max(axis=1)
+    
+    # Hann window is precisely defined in the standard (different from numpy version)
+    # The spectra are computed in the precision of the envelopes
+    dtype = envelopes_downsampled.dtype
+    hann_window = _von_hann_window(sbb).astype(dtype)
+    phi_E0 = np.sum(np.power(envelopes_downsampled * hann_window,2), axis=2)
+    den = N_specific_max[:,np.newaxis] * phi_E0
+    
+    # Only the first half of the spectrum is used, the real FFT keeps the
+    # precision of the envelopes
+    dft = (abs(rfft((envelopes_downsampled * hann_window), axis=2)[:,:,:sbb//2])/2*np.sqrt(dtype.type(2)))**2
+    scaling = np.zeros((L, CBF), dtype=dtype)
+    scaling[den!=0] = np.power(N_specific[den!=0],2) / den[den!=0]
+    phi_E = scaling[:, :, np.newaxis] * dft
+    
+    # NOISE REDUCTION OF THE ENVELOPES (7.1.4)
+    Phi_E = _noise_reduction(phi_E)
+    
+    # Critical bands characteristics for the weightings to come
+    fmax = _f_max(center_freq) # center_freq = central frequency of the band z (eq 86 section 7.1.5.2)
+    rmax = _r_max(center_freq)
+    q2_high = _Q2_high(center_freq)
+    q2_low = _Q2_low(center_freq)
+
+    # SPECTRAL WEIGHTING (7.1.5)
+    f_p, Ai, N_peak = _peak_picking_batch(Phi_E)
+    band = np.broadcast_to(np.arange(CBF), (L, CBF))
+    has_peak = N_peak > 0
+    f_p, Ai, N_peak, band = f_p[has_peak], Ai[has_peak], N_peak[has_peak], band[has_peak]
+
+    # Weighting of high modulation rates
+    Ai_tilde = np.zeros(Ai.shape)
+    peak = np.arange(Ai.shape[1]) < N_peak[:, np.newaxis]
+    peak_band = np.broadcast_to(band[:, np.newaxis], Ai.shape)[peak]
+    Ai_tilde[peak] = _high_mod_rate_weighting_batch(
+        f_p[peak], Ai[peak], fmax[peak_band], rmax[peak_band], q2_high[peak_band]
+    )
+
+    # Estimation of fundamental modulation rate
+    mod_rate, A_hat, N_hat = _estimate_fund_mod_rate_batch(f_p, Ai_tilde, N_peak)
+
+    # Weighting of low modulation rates
+    amplitude = np.zeros((L,CBF))
+    amplitude[has_peak] = _low_mod_rate_weighting_batch(mod_rate, A_hat, N_hat, fmax[band], q2_low[band])
+
+    return amplitude
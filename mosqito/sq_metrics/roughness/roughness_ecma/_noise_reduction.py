@@ -22,7 +22,7 @@ def _noise_reduction(spectrum):
     L, _, K = spectrum.shape
     
     # Averaging with neighbouring bands
-    spectrum_average = np.empty((spectrum.shape))
+    spectrum_average = np.empty(spectrum.shape, dtype=spectrum.dtype)
     spectrum_average[:,0] = (spectrum[:,0] + spectrum[:,1])/2
     spectrum_average[:,-1] = (spectrum[:,-1] + spectrum[:,-2])/2
     spectrum_average[:,1:-1] = (spectrum[:,:-2] + spectrum[:,1:-1] + spectrum[:,2:])/3
@@ -32,7 +32,7 @@ def _noise_reduction(spectrum):
     s_tilde = np.median(s[:,2:], axis=1)
     
     # Weighting function definition
-    noise_suppression_weighting = np.zeros((L,K))
+    noise_suppression_weighting = np.zeros((L,K), dtype=spectrum.dtype)
     
     w_tilde = 0.0856 * (s/(s_tilde[:,np.newaxis]+10e-10)) * np.clip(0.1891*np.exp(0.0120*np.arange(K)),0,1)
     w_tilde_max = np.max( w_tilde[:, 2:], axis=-1)
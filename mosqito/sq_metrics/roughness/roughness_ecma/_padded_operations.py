@@ -0,0 +1,60 @@
+import math
+import numpy as np
+
+
+def _padded_sum(values, n):
+    """
+    Sums the first n values along the last axis of a zero-padded array, with
+    the rounding of numpy.sum applied to the n values alone.
+
+    numpy.sum adds up to 7 values sequentially and 8 to 15 values with 8
+    partial sums combined pairwise, the remaining values being then added
+    sequentially. The zeros of the padding do not change the result of
+    these additions.
+
+    Parameters
+    ----------
+    values : numpy.array
+        Zero-padded values, size (..., P) with P < 16
+    n : numpy.array
+        Number of values to be summed, size (...)
+
+    Returns
+    -------
+    total : numpy.array
+        Sums of the values, size (...)
+    """
+    P = values.shape[-1]
+    total = np.full(values.shape[:-1], -0.0)
+    for j in range(P):
+        total = total + values[..., j]
+    if P >= 8:
+        r = [values[..., j] for j in range(8)]
+        pairwise = ((r[0] + r[1]) + (r[2] + r[3])) + ((r[4] + r[5]) + (r[6] + r[7]))
+        for j in range(8, P):
+            pairwise = pairwise + values[..., j]
+        total = np.where(n >= 8, pairwise, total)
+    return total
+
+
+def _scalar_power(x, y):
+    """
+    Elementwise power computed with the C library pow function, as for numpy
+    scalars (the vectorised numpy.power and numpy.square may differ by one
+    ulp)
+
+    Parameters
+    ----------
+    x : numpy.array
+        Bases
+    y : numpy.array or float
+        Exponents, broadcastable with x
+
+    Returns
+    -------
+    z : numpy.array
+        Powers, size of x
+    """
+    x, y = np.broadcast_arrays(x, y)
+    z = np.fromiter(map(math.pow, x.ravel(), y.ravel()), float, x.size)
+    return z.reshape(x.shape)
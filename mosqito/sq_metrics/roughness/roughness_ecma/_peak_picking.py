@@ -1,7 +1,7 @@
 import numpy as np
 from scipy.signal import find_peaks
 
-from mosqito.sq_metrics.roughness.roughness_ecma._refinement import _refinement
+from mosqito.sq_metrics.roughness.roughness_ecma._refinement import _refinement, _refinement_batch
 
 def _peak_picking(Phi_E_l_z):
     """
@@ -67,4 +67,104 @@ def _peak_picking(Phi_E_l_z):
             # Refinement step
             f_p[i], A[i] = _refinement(kpi, Phi_E_l_z)
              
-    return f_p, A
\ No newline at end of file
+    return f_p, A
+
+
+def _peak_picking_batch(Phi_E, N_max=10):
+    """
+    Vectorised version of _peak_picking, for the spectra of all the time
+    steps and critical bands.
+
+    The maxima are searched as in scipy.signal.find_peaks (flat maxima
+    included) and their prominences are computed as in
+    scipy.signal.peak_prominences, for all the spectra at once. The selected
+    maxima are stored in arrays padded with zeros, in the order in which
+    _peak_picking returns them.
+
+    Parameters
+    ----------
+    Phi_E : numpy.array
+        Noise-reduced power spectra, dim(Ntime, Nbark, sbb)
+    N_max : int, optional
+        Maximum number of maxima per spectrum. Default is 10.
+
+    Returns
+    -------
+    f_p : numpy.array
+        Estimated modulation frequencies of the maxima, dim(Ntime, Nbark, N_max)
+    A : numpy.array
+        Estimated amplitudes of the maxima, dim(Ntime, Nbark, N_max)
+    N_peak : numpy.array
+        Number of maxima of each spectrum, dim(Ntime, Nbark)
+    """
+    Phi = Phi_E.reshape(-1, Phi_E.shape[-1])
+    # k_range starts at k=2
+    x = Phi[:, 2:]
+    M, n = x.shape
+    x_flat = x.ravel()
+
+    # Runs of equal values in each spectrum, a maximum being a run higher
+    # than its two neighbours
+    run = np.ones(x.shape, dtype=bool)
+    run[:, 1:] = x[:, 1:] != x[:, :-1]
+    run_start = np.flatnonzero(run)
+    run_stop = np.append(run_start[1:], x.size) - 1
+    start, stop = run_start % n, run_stop % n
+    is_peak = (start > 0) & (stop < n - 1)
+    run_start, run_stop = run_start[is_peak], run_stop[is_peak]
+    value = x_flat[run_start]
+    is_peak = (x_flat[run_start - 1] < value) & (x_flat[run_stop + 1] < value)
+    run_start, run_stop = run_start[is_peak], run_stop[is_peak]
+    peak = (run_start + run_stop) // 2
+    row = peak // n
+    value = x_flat[peak]
+
+    # Prominences: lowest values between each maximum and the closest
+    # higher values on each side
+    prominence = value - np.maximum(
+        _lowest_contour(x_flat, peak, row * n, -1),
+        _lowest_contour(x_flat, peak, row * n + n - 1, 1),
+    )
+
+    # Apply condition on the amplitude (Eq. 72)
+    value_max = np.full(M, -np.inf)
+    np.maximum.at(value_max, row, value)
+    condition_met = value > 0.05 * value_max[row]
+    peak, row, prominence = peak[condition_met], row[condition_met], prominence[condition_met]
+
+    # Only the N_max maxima with the highest prominence are considered,
+    # by increasing prominence
+    count = np.bincount(row, minlength=M)
+    key = np.where(count[row] > N_max, prominence, peak)
+    order = np.lexsort((key, row))
+    peak, row = peak[order], row[order]
+    row_stop = np.cumsum(count)[row]
+    rank = row_stop - np.arange(len(peak))
+    selected = rank <= N_max
+    peak, row, rank = peak[selected], row[selected], rank[selected]
+    N_peak = np.minimum(count, N_max)
+    column = N_peak[row] - rank
+
+    # Modulation rate and maxima's amplitudes
+    f_p = np.zeros((M, N_max))
+    A = np.zeros((M, N_max))
+    # Refinement step, compensating for k_range starting at k=2
+    f_p[row, column], A[row, column] = _refinement_batch(peak % n + 2, Phi, row)
+
+    shape = Phi_E.shape[:-1]
+    return f_p.reshape(shape + (N_max,)), A.reshape(shape + (N_max,)), N_peak.reshape(shape)
+
+
+def _lowest_contour(x, peak, bound, step):
+    """Lowest values of x from each peak towards the bound, until a value
+    higher than the peak is found"""
+    lowest = x[peak]
+    index = np.arange(len(peak))
+    i = peak + step
+    while index.size:
+        inside = (i - bound[index]) * step <= 0
+        lower = inside & (x[np.where(inside, i, peak[index])] <= x[peak[index]])
+        index, i = index[lower], i[lower]
+        lowest[index] = np.minimum(lowest[index], x[i])
+        i = i + step
+    return lowest
@@ -1,5 +1,9 @@
 import numpy as np
 
+# Data from the standard
+E = np.array([0,0.0457,0.0907,0.1346,0.1765,0.2157,0.2515,0.2828,0.3084,0.3269,0.3364,0.3348,0.3188,0.2844,0.2259,0.1351,0.0000,-0.1351,
+              -0.2259,-0.2844,-0.3188,-0.3348,-0.3364,-0.3269,-0.3084,-0.2828,-0.2515,-0.2157,-0.1765,-0.1346,-0.0907, -0.0457,0.000,0.000])
+
 def _rho(f, delta_f):
     """
     Function to compute the bias correction term defined in equation 78 of ECMA 418-2 (2022).
@@ -14,10 +18,6 @@ def _rho(f, delta_f):
     _rho:float
         corrected bias term       
     """
-    # Data from the standard
-    E = np.array([0,0.0457,0.0907,0.1346,0.1765,0.2157,0.2515,0.2828,0.3084,0.3269,0.3364,0.3348,0.3188,0.2844,0.2259,0.1351,0.0000,-0.1351,
-                  -0.2259,-0.2844,-0.3188,-0.3348,-0.3364,-0.3269,-0.3084,-0.2828,-0.2515,-0.2157,-0.1765,-0.1346,-0.0907, -0.0457,0.000,0.000])
-    
     theta = np.arange(0,34)
     # Eq. 79
     B = (np.floor(f/delta_f)+theta/32)*delta_f-(f+E[theta])
@@ -79,4 +79,70 @@ def _refinement(kpi, Phi_E_l_z):
     return mod_rate, amp
 
 
+def _rho_batch(f, delta_f):
+    """
+    Vectorised version of _rho, for an array of modulation rates.
 
+    Parameters:
+    ----------
+    f: numpy.array
+        Modulation rates in [Hz], dim(N)
+    delta_f: float
+        Frequency resolution in [Hz]
+    Returns:
+    -------
+    _rho: numpy.array
+        corrected bias terms, dim(N)
+    """
+    theta = np.arange(0,34)
+    # Eq. 79
+    B = (np.floor(f/delta_f)[:, np.newaxis]+theta/32)*delta_f-(f[:, np.newaxis]+E[theta])
+    # Eq. 80
+    theta_min = np.argmin(abs(B), axis=1)
+    # Eq. 81
+    B_min = np.take_along_axis(B, theta_min[:, np.newaxis], axis=1)[:, 0]
+    B_prev = np.take_along_axis(B, np.maximum(theta_min-1, 0)[:, np.newaxis], axis=1)[:, 0]
+    theta_corr = np.where((theta_min>0) & (B_min*B_prev<0), theta_min, theta_min + 1)
+
+    # Eq. 78 corrected
+    B_corr = np.take_along_axis(B, theta_corr[:, np.newaxis], axis=1)[:, 0]
+    B_corr_prev = np.take_along_axis(B, theta_corr[:, np.newaxis]-1, axis=1)[:, 0]
+    _rho = (E[theta_corr]
+            - ( (E[theta_corr] - E[theta_corr-1])*
+            B_corr / (B_corr - B_corr_prev)))
+
+    return _rho
+
+
+def _refinement_batch(kpi, Phi_E, row):
+    """ Vectorised version of _refinement, for a set of maxima.
+
+    Parameters:
+    -----------
+    kpi: numpy.array
+        modulation rate indices of the maxima, between 1 and 254, dim(N)
+    Phi_E : numpy.array
+        Noise-reduced power spectra, dim(M, sbb)
+    row : numpy.array
+        Index of the spectrum in which each maximum is found, dim(N)
+    Returns:
+    --------
+    mod_rate: numpy.array
+        Corrected modulation rates, dim(N)
+    amp: numpy.array
+        Corrected amplitudes of the modulation rate peaks, dim(N)
+    """
+    Phi_prev = Phi_E[row, kpi-1]
+    Phi_k = Phi_E[row, kpi]
+    Phi_next = Phi_E[row, kpi+1]
+
+    # Refinement step
+    amp = Phi_prev + Phi_k + Phi_next
+
+    # Analytical resolution of Eq.73 to get new expression for Eq.76
+    delta_f = 1500/512
+    F = (kpi - (Phi_next-Phi_prev)/(2*Phi_prev+2*Phi_next-4*Phi_k)) * delta_f
+
+    mod_rate = F + _rho_batch(F, delta_f)
+
+    return mod_rate, amp
@@ -0,0 +1,117 @@
+import numpy as np
+
+
+def _running_percentile_state(percentile, n_exact=50):
+    """Initial state of the running percentile estimate of
+    _running_percentile
+
+    Parameters
+    ----------
+    percentile : float
+        Percentile to be estimated, between 0 and 100
+    n_exact : int, optional
+        Number of first observations whose percentile is computed exactly
+        from the stored values, at least 5. Default is 50
+
+    Returns
+    -------
+    state : dict
+        Values of the first observations ("first"), then heights ("q"),
+        positions ("n") and desired positions ("n_desired") of the five
+        markers of the P-square algorithm
+    """
+    if n_exact < 5:
+        raise ValueError("ERROR: n_exact shall be at least 5")
+    p = percentile / 100
+    return {
+        "p": p,
+        "n_exact": n_exact,
+        "first": [],
+        "q": None,
+        "n": None,
+        "n_desired": None,
+        "dn_desired": np.array([0, p / 2, p, (1 + p) / 2, 1]),
+    }
+
+
+def _running_percentile(values, state):
+    """Running estimate of a percentile of all the values observed so far
+
+    The percentile of the first n_exact values is computed exactly from the
+    stored values. It is then estimated with the P-square algorithm of Jain
+    and Chlamtac ("The P2 algorithm for dynamic calculation of quantiles
+    and histograms without storing observations", Communications of the
+    ACM, 1985), which only keeps five markers whose heights are adjusted by
+    piecewise parabolic interpolation. The markers start from the minimum,
+    the p/2, p and (1+p)/2 quantiles and the maximum of the stored values.
+
+    Parameters
+    ----------
+    values : numpy.array
+        New observed values, size (Nvalues,)
+    state : dict
+        State of the estimate (see _running_percentile_state), updated in
+        place
+
+    Returns
+    -------
+    estimate : float
+        Estimated percentile, None if no value has been observed
+    """
+    for x in values:
+        if state["q"] is None:
+            if len(state["first"]) < state["n_exact"]:
+                state["first"].append(x)
+                continue
+            _init_markers(state)
+        q = state["q"]
+        n = state["n"]
+        # Cell of the new observation, the extreme markers being updated
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = np.searchsorted(q, x, side="right") - 1
+        n[k + 1 :] += 1
+        state["n_desired"] += state["dn_desired"]
+        # Adjustment of the heights of the middle markers
+        for i in range(1, 4):
+            d = state["n_desired"][i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                # Piecewise parabolic prediction
+                q_new = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < q_new < q[i + 1]:
+                    # Linear prediction
+                    q_new = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = q_new
+                n[i] += d
+
+    if state["q"] is not None:
+        return state["q"][2]
+    if len(state["first"]) == 0:
+        return None
+    return np.percentile(state["first"], 100 * state["p"])
+
+
+def _init_markers(state):
+    """Heights and positions of the five markers of the P-square algorithm
+    from the stored first observations, the state being updated in place"""
+    first = np.sort(state["first"]).astype(float)
+    n_desired = 1 + (len(first) - 1) * state["dn_desired"]
+    # Nearest observations, the markers being at distinct positions
+    n = np.round(n_desired).astype(int)
+    for i in range(1, 5):
+        n[i] = max(n[i], n[i - 1] + 1)
+    for i in range(3, -1, -1):
+        n[i] = min(n[i], n[i + 1] - 1)
+    state["q"] = first[n - 1]
+    state["n"] = n
+    state["n_desired"] = n_desired
+    state["first"] = []
@@ -1,5 +1,7 @@
 import numpy as np
 
+from mosqito.sq_metrics.roughness.roughness_ecma._padded_operations import _padded_sum, _scalar_power
+
 def _f_max(center_freq):
     """
     Function to compute the modulation rate at which the weighting factor G reaches the maximum 
@@ -128,5 +130,66 @@ def _low_mod_rate_weighting(mod_rate, amp, fmax, q2_low):
         weighted_amp = np.sum(amp)
 
     return weighted_amp
-            
 
+
+def _high_mod_rate_weighting_batch(mod_rate, amp, fmax, rmax, q2_high):
+    """
+    Vectorised version of _high_mod_rate_weighting, for arrays of maxima
+    
+    Parameters
+    ----------
+    mod_rate : numpy.array
+        estimated modulation rates [Hz], dim(N)
+    amp : numpy.array
+        amplitudes of the envelope spectra at the estimated modulation rates, dim(N)
+    fmax : numpy.array
+        modulation rates at which the weighting factor G reaches the maximum of one, dim(N)
+    rmax : numpy.array
+        scaling factors, dim(N)
+    q2_high : numpy.array
+        parameters for the weighting function calculation, dim(N)
+        
+    Returns
+    -------
+    weighted_amp : numpy.array
+        the weighted amplitudes, dim(N)
+    
+    """
+    weighted_amp = amp * rmax
+    high = ~(mod_rate<fmax)
+    mod_rate, fmax = mod_rate[high], fmax[high]
+    G = 1/_scalar_power(1+_scalar_power((mod_rate/fmax-fmax/mod_rate)*1.2822, 2), q2_high[high])
+    weighted_amp[high] = G * amp[high] * rmax[high]
+        
+    return weighted_amp
+
+def _low_mod_rate_weighting_batch(mod_rate, amp, N_amp, fmax, q2_low):
+    """
+    Vectorised version of _low_mod_rate_weighting, for arrays of
+    fundamental modulation rates
+    
+    Parameters
+    ----------
+    mod_rate : numpy.array
+        estimated modulation rates [Hz], dim(N)
+    amp : numpy.array
+        amplitudes of the peaks of the harmonic complexes, padded with zeros, dim(N, N_max)
+    N_amp : numpy.array
+        number of peaks of the harmonic complexes, dim(N)
+    fmax : numpy.array
+        modulation rates at which the weighting factor G reaches the maximum of one, dim(N)
+    q2_low : numpy.array
+        parameters for the weighting function calculation, dim(N)
+        
+    Returns
+    -------
+    weighted_amp : numpy.array
+        the weighted amplitudes, dim(N)
+    
+    """
+    G = np.ones(len(mod_rate))
+    low = mod_rate < fmax
+    mod_rate, fmax = mod_rate[low], fmax[low]
+    G[low] = 1/_scalar_power(1+_scalar_power((mod_rate/fmax-fmax/mod_rate)*0.7066, 2), q2_low[low])
+    
+    return _padded_sum(G[:, np.newaxis] * amp, N_amp)
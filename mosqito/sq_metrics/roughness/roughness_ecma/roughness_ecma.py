@@ -1,24 +1,40 @@
 import numpy as np
-from numpy.fft import fft
-from scipy.signal import hilbert, resample, decimate
 
 # Project Imports
+from mosqito.utils.resample import resample
 from mosqito.sq_metrics.loudness.loudness_ecma._preprocessing import _preprocessing
-from mosqito.sq_metrics.loudness.loudness_ecma._band_pass_signals import _band_pass_signals
-from mosqito.sq_metrics.loudness.loudness_ecma._ecma_time_segmentation import _ecma_time_segmentation
-from mosqito.sq_metrics.loudness.loudness_ecma._auditory_filters_centre_freq import _auditory_filters_centre_freq
-from mosqito.sq_metrics.loudness.loudness_ecma._loudness_from_bandpass import _loudness_from_bandpass
-
-from mosqito.sq_metrics.roughness.roughness_ecma._weighting import _f_max, _r_max, _Q2_high, _Q2_low, _high_mod_rate_weighting, _low_mod_rate_weighting
-from mosqito.sq_metrics.roughness.roughness_ecma._estimate_fund_mod_rate import _estimate_fund_mod_rate
-from mosqito.sq_metrics.roughness.roughness_ecma._peak_picking import _peak_picking
-from mosqito.sq_metrics.roughness.roughness_ecma._von_hann_window import _von_hann_window
-from mosqito.sq_metrics.roughness.roughness_ecma._noise_reduction import _noise_reduction
+from mosqito.sq_metrics.loudness.loudness_ecma._band_selection import _band_selection
+from mosqito.sq_metrics.loudness.loudness_ecma._band_pass_signals import _band_pass_chunks, _multirate_factors
+from mosqito.sq_metrics.loudness.loudness_ecma._ecma_time_segmentation import _ecma_block_rms, _block_parameters, _block_time
+from mosqito.sq_metrics.loudness.loudness_ecma._loudness_from_bandpass import _loudness_from_rms
+
+from mosqito.sq_metrics.roughness.roughness_ecma._band_envelopes import _band_envelopes
+from mosqito.sq_metrics.roughness.roughness_ecma._modulation_amplitudes import _modulation_amplitudes
 from mosqito.sq_metrics.roughness.roughness_ecma._interpolation_50 import _interpolation_50
 from mosqito.sq_metrics.roughness.roughness_ecma._non_linear_transform import _non_linear_transform
 from mosqito.sq_metrics.roughness.roughness_ecma._lowpass_filter import _lowpass_filter
 
-def roughness_ecma(signal, fs):
+# Number of critical bands
+CBF = 53
+# Block size and hop size for specific loudness calculation (7.1.1)
+SB = 16384
+SH = 4096
+# Envelopes downsampling (7.1.2), computed on groups of blocks with a
+# margin on each side
+DOWNSAMPLING_FACTOR = 32
+SEGMENT_BLOCKS = 16
+MARGIN = 16384
+
+def roughness_ecma(
+    signal,
+    fs,
+    chunk_blocks=None,
+    max_memory=None,
+    dtype="float64",
+    bands=None,
+    bark_range=None,
+    multirate=False,
+):
     """Calculation of the specific and total roughness according to ECMA-418-2
     (2nd Ed, 2022).
 
@@ -31,21 +47,68 @@ def roughness_ecma(signal, fs):
         Signal time values [Pa]. The sampling frequency of the signal must be 48000 Hz.
     fs: int
         Sampling frequency [Hz].
+    chunk_blocks: int, optional
+        Number of time blocks processed together, from the band-pass
+        filtering to the spectral weighting. It is rounded up to a multiple
+        of 16 blocks. By default, all the blocks are processed together.
+    max_memory: int, optional
+        Approximate memory [bytes] used by a group of blocks, from which
+        chunk_blocks is derived if it is not given. About 7 MB per block
+        plus 40 MB are needed (half of it in single precision), with a
+        minimum of 16 blocks.
+    dtype: {'float64', 'float32'}, optional
+        Precision of the band-pass signals, of the envelopes and of their
+        spectra, the auditory filters being computed in double precision.
+        The single precision halves the memory use and reduces the
+        computation time by about 15 %, the roughness values deviating by
+        less than 1e-6 relatively from the double precision ones (see
+        validations/sq_metrics/roughness_ecma/validation_float32_ecma.py).
+        Default is 'float64'
+    bands: list of int, optional
+        Indices of the critical bands (0 to 52) of the specific roughness
+        to be returned. By default, all the 53 bands.
+    bark_range: tuple of float, optional
+        Lowest and highest critical band rates [Bark] of the bands of the
+        specific roughness to be returned, instead of bands.
+    multirate: bool, optional
+        If True, the auditory filters and the envelopes of the low
+        frequency bands are computed at 6, 12 or 24 kHz after an
+        anti-aliasing decimation, see loudness_ecma. The computation time
+        is reduced by about 35 %, the roughness values deviating by less
+        than 1e-2 relatively (2e-4 asper) from the ones computed at 48 kHz
+        (see validations/sq_metrics/roughness_ecma/validation_multirate_ecma.py).
+        Default is False
 
     Returns
     -------
     R : float
-        Overall roughness representative value [asper_HMS].
+        Overall roughness representative value [asper_HMS]. Partial
+        roughness of the selected bands if bands or bark_range is given.
     R_time : numpy.ndarray
-        Roughness over time [asper_HMS], size (Ntime,).
+        Roughness over time [asper_HMS], size (Ntime,), summed over the
+        selected bands.
     R_specific : numpy.ndarray
         Specific roughness [asper_HMS/bark], size (Nbark, Ntime).
 	    Each of the 53 elements of the list corresponds to the time-dependant specific roughness for a given bark band. 
     bark_axis : numpy.ndarray
-        Corresponding bark axis, size (Nbark,).
+        Corresponding bark axis, size (Nbark,), Nbark being the number of
+        selected bands.
     time_axis : numpy.ndarray
         Time axis, size (Ntime,).
 
+    Notes
+    -----
+    The results do not depend on chunk_blocks: the filter states are carried
+    from one group of blocks to the next one, and the envelopes of each
+    group of 16 blocks are computed on the band-pass signals with a margin
+    of 16384 samples on each side.
+
+    The selection of bands does not reduce the computation: the noise
+    reduction (section 7.1.4) weights the spectra with their sum over all
+    the critical bands, and the non-linear transform (Eq. 105 to 108)
+    depends on the mean roughness of all the bands. All the bands are thus
+    evaluated, and the specific values of the selected ones are returned.
+
     Warning
     -------
     The sampling frequency of the signal must be 48 kHz.
@@ -54,6 +117,8 @@ def roughness_ecma(signal, fs):
     --------
     .roughness_dw : Daniel and Weber roughness computation
     .loudness_ecma : Loudness computation based on the hearing model of ECMA 418-2
+    .Ecma418Analysis : Loudness and roughness computed from a single hearing model front end
+    .RoughnessEcmaStream : Roughness computation for a signal provided chunk by chunk
 
     References
     ----------
@@ -96,88 +161,156 @@ def roughness_ecma(signal, fs):
         print(
             "[Warning] Signal resampled to 48 kHz fulfill the standard requirements and allow calculation."
         )
-        signal = resample(signal, int(48000 * len(signal) / fs))
+        signal = resample(signal, fs, 48000)
         fs = 48000
     
-    # INITIALIZE COMPUTATION PARAMETERS
-    # Number of critical bands and their center frequency
-    CBF = 53
-    center_freq = _auditory_filters_centre_freq()
-    # Hop size and block size for specific loudness calculation (7.1.1)
-    sb=16384
-    sh=4096
     duration =  len(signal) / fs
         
+    # Critical bands returned
+    bands = _band_selection(bands, bark_range)
+
     # Preprocessing 
-    signal, n_new = _preprocessing(signal, sb, sh)
-    # Gammatone bandpass filtering
-    bandpass_signals = _band_pass_signals(signal, sb, sh)
-    # Time segmentation
-    block_array, time_array = _ecma_time_segmentation(bandpass_signals, sb, sh, n_new)
-    time_axis = np.array(time_array)[0]
-    block_array = np.asarray(block_array)
-    
-    # LOUDNESS COMPUTATION
-    N_specific, bark_axis = _loudness_from_bandpass(block_array)
-    N_specific = np.array(N_specific).T
-    L = N_specific.shape[0]
-    
-    # ENVELOPPE CALCULATION AND DOWNSAMPLING (7.1.2)
-    envelopes = abs(hilbert(block_array))
-    # Transposition to fit with the standard writing
-    envelopes = np.transpose(np.asarray(envelopes),(1,0,2)) 
-    
-    # Downsampling to 1500 Hz
-    sbb = 512 
-    downsampling_factor = 32
-    envelopes_downsampled_ = decimate(envelopes, downsampling_factor//4, axis=2)
-    envelopes_downsampled = decimate(envelopes_downsampled_, 4, axis=2)
+    signal, n_new = _preprocessing(signal, SB, SH, dtype)
+    # Groups of blocks and band-pass signal spans
+    chunks, spans = _block_chunks(
+        n_new, len(signal), chunk_blocks, max_memory, signal.itemsize
+    )
+    # Gammatone bandpass filtering, continued over the groups of blocks, at
+    # reduced sampling rates for the low frequency bands in multirate mode
+    factors = _multirate_factors(SB, SH) if multirate else None
+    bandpass_chunks = _band_pass_chunks(signal, spans, factors=factors)
 
-    # CALCULATION OF SCALED POWER SPECTRUM (7.1.3)
-    
-    # Maximum loudness in each time block
-    N_specific_max = np.asarray(N_specific).max(axis=1)
-    
-    # Hann window is precisely defined in the standard (different from numpy version)
-    hann_window = _von_hann_window(sbb)
-    phi_E0 = np.sum(np.power(envelopes_downsampled * hann_window,2), axis=2)
-    den = N_specific_max[:,np.newaxis] * phi_E0
-    
-    dft = (abs(fft((envelopes_downsampled * hann_window), axis=2)[:,:,:sbb//2])/2*np.sqrt(2))**2
-    scaling = np.zeros((L, CBF))
-    scaling[den!=0] = np.power(N_specific[den!=0],2) / den[den!=0]
-    phi_E = scaling[:, :, np.newaxis] * dft
+    return _roughness_from_band_pass(
+        bandpass_chunks, chunks, spans, n_new, duration, bands, factors
+    )
+
+
+def _block_chunks(n_new, n_samples, chunk_blocks=None, max_memory=None, itemsize=8):
+    """Groups of blocks processed together and spans of the band-pass
+    signals they need
+
+    Parameters
+    ----------
+    n_new : int
+        Number of samples in signal after zero padding (Eq. 3)
+    n_samples : int
+        Number of samples of the preprocessed signal
+    chunk_blocks: int, optional
+        Number of blocks per group, see roughness_ecma
+    max_memory: int, optional
+        Approximate memory [bytes] used by a group of blocks, see
+        roughness_ecma
+    itemsize: int, optional
+        Size [bytes] of the values of the band-pass signals. Default is 8
+
+    Outputs
+    -------
+    chunks : list of tuple
+        First and last (excluded) blocks of each group
+    spans : list of tuple
+        First and last (excluded) samples of the band-pass signals needed
+        by each group
+    """
+    # Number of blocks (5.1.5)
+    L = _block_parameters(SB, SH, n_new)[3][0]
+
+    # Groups of blocks processed together, multiple of SEGMENT_BLOCKS
+    if chunk_blocks is None:
+        if max_memory is None:
+            chunk_blocks = L
+        else:
+            # Band-pass signals (held twice while they are extended) and
+            # envelope spectra of each block, band-pass signal margins
+            block_memory = CBF * (2 * SH + 16 * SB // DOWNSAMPLING_FACTOR) * itemsize
+            fixed_memory = 2 * CBF * (SB + 2 * MARGIN) * itemsize
+            chunk_blocks = int((max_memory - fixed_memory) // block_memory)
+    chunk_blocks = max(SEGMENT_BLOCKS, -(-chunk_blocks // SEGMENT_BLOCKS) * SEGMENT_BLOCKS)
+    chunks = [(l0, min(l0 + chunk_blocks, L)) for l0 in range(0, L, chunk_blocks)]
+    # Band-pass signal spans needed by each group of blocks
+    spans = [
+        (max(0, l0 * SH - MARGIN), min(n_samples, (l1 - 1) * SH + SB + MARGIN))
+        for l0, l1 in chunks
+    ]
+
+    return chunks, spans
+
+
+def _roughness_from_band_pass(
+    bandpass_chunks, chunks, spans, n_new, duration, bands=None, factors=None
+):
+    """Calculation of the specific and total roughness according to
+    ECMA-418-2 (2nd Ed, 2022) from the band-pass signals, group of blocks
+    by group of blocks
+
+    Parameters
+    ----------
+    bandpass_chunks : iterable
+        Band-pass signals of the 53 critical bands of the preprocessed
+        signal over each span
+    chunks : list of tuple
+        First and last (excluded) blocks of each group
+    spans : list of tuple
+        First and last (excluded) samples of the band-pass signals of each
+        group
+    n_new : int
+        Number of samples in signal after zero padding (Eq. 3)
+    duration : float
+        Duration of the signal [s]
+    bands : array of int, optional
+        Indices of the critical bands of the specific roughness returned.
+        By default, the 53 bands.
+    factors : array of int, optional
+        Sampling rate reduction factors of the bands of the multirate filter
+        bank. By default, all the band-pass signals are sampled at 48 kHz.
+
+    Outputs
+    -------
+    Same outputs as roughness_ecma
+    """
+    # Number of blocks and time axis (5.1.5)
+    L = chunks[-1][1]
+    time_axis = _block_time(SB, SH, 0, L)
+
+    if factors is None:
+        factors = np.ones(CBF, dtype=int)
+
+    N_specific = np.zeros((L, CBF))
+    amplitude = np.zeros((L, CBF))
+    for (l0, l1), (a, _), bandpass_signals in zip(chunks, spans, bandpass_chunks):
+        start = l0 * SH - a
+        # Root mean square values of the blocks
+        rms_array, _ = _ecma_block_rms(
+            [band[start // f :] for band, f in zip(bandpass_signals, factors)],
+            SB,
+            SH,
+            (l1 - l0) * SH,
+            factors=factors,
+        )
     
-    # NOISE REDUCTION OF THE ENVELOPES (7.1.4)
-    Phi_E = _noise_reduction(phi_E)
+        # LOUDNESS COMPUTATION
+        N_specific_chunk, bark_axis = _loudness_from_rms(rms_array)
+        N_specific[l0:l1] = np.array(N_specific_chunk).T
     
-    # Critical bands characteristics for the weightings to come
-    fmax = _f_max(center_freq) # center_freq = central frequency of the band z (eq 86 section 7.1.5.2)
-    rmax = _r_max(center_freq)
-    q2_high = _Q2_high(center_freq)
-    q2_low = _Q2_low(center_freq)
-
-    amplitude = np.zeros((L,CBF))
-    for l in range(L):       
-        for z in range(CBF):
-        
-            # SPECTRAL WEIGHTING (7.1.5)
-            f_p, Ai = _peak_picking(Phi_E[l, z, :])                            
-            N_peak = len(f_p)
-            
-            if N_peak == 0:
-                amplitude[l,z] = 0
-            else:
-                Ai_tilde = np.empty(N_peak)
-                for i0 in range(N_peak):
-                    # Weighting of high modulation rates
-                    Ai_tilde[i0] = _high_mod_rate_weighting(f_p[i0], Ai[i0], fmax[z], rmax[z], q2_high[z])         
-                
-                # Estimation of fundamental modulation rate
-                mod_rate, A_hat = _estimate_fund_mod_rate(f_p, Ai_tilde)
-                
-                # Weighting of low modulation rates
-                amplitude[l,z] = _low_mod_rate_weighting(mod_rate, A_hat, fmax[z], q2_low[z])
+        # ENVELOPPE CALCULATION AND DOWNSAMPLING (7.1.2)
+        # Envelopes computed and downsampled to 1500 Hz on the continuous band
+        # signals, then segmented into blocks, size (L, CBF, sbb)
+        envelopes_downsampled = _band_envelopes(
+            bandpass_signals,
+            SB,
+            SH,
+            l1 - l0,
+            DOWNSAMPLING_FACTOR,
+            start,
+            SEGMENT_BLOCKS,
+            MARGIN,
+            factors,
+        )
+        del bandpass_signals
+
+        # SCALED POWER SPECTRUM, NOISE REDUCTION AND SPECTRAL WEIGHTING (7.1.3 to 7.1.5)
+        amplitude[l0:l1] = _modulation_amplitudes(
+            envelopes_downsampled, N_specific[l0:l1]
+        )
 
     amplitude[amplitude<0.074376]=0
     
@@ -191,6 +324,10 @@ def roughness_ecma(signal, fs):
     R_time_spec_temp = _non_linear_transform(R_est)
     # Lowpass filtering
     R_time_spec = _lowpass_filter(R_time_spec_temp)
+    # Selected bands
+    if bands is not None:
+        R_time_spec = R_time_spec[:, bands]
+        bark_axis = bark_axis[bands]
 
     # CALCULATION OF REPRESENTATIVE VALUES (7.1.8)
     # CBF dependent value
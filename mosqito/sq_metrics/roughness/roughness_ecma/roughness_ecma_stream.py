@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+
+# Third party imports
+import numpy as np
+from scipy import signal as sp_signal
+from scipy.interpolate import pchip_interpolate
+
+# Local applications imports
+from mosqito.utils.resample import ResampleStream
+from mosqito.sq_metrics.loudness.loudness_ecma._preprocessing import (
+    _compute_dtype,
+    _padding,
+)
+from mosqito.sq_metrics.loudness.loudness_ecma._ear_filter_design import (
+    _ear_filter_design,
+)
+from mosqito.sq_metrics.loudness.loudness_ecma._band_pass_signals import (
+    _gammatone_filter,
+)
+from mosqito.sq_metrics.loudness.loudness_ecma._ecma_time_segmentation import (
+    _ecma_block_rms,
+    _block_time,
+)
+from mosqito.sq_metrics.loudness.loudness_ecma._loudness_from_bandpass import (
+    _loudness_from_rms,
+)
+from mosqito.sq_metrics.roughness.roughness_ecma.roughness_ecma import (
+    CBF,
+    SB,
+    SH,
+    DOWNSAMPLING_FACTOR,
+    SEGMENT_BLOCKS,
+)
+from mosqito.sq_metrics.roughness.roughness_ecma._band_envelopes import (
+    _block_envelopes,
+)
+from mosqito.sq_metrics.roughness.roughness_ecma._modulation_amplitudes import (
+    _modulation_amplitudes,
+)
+from mosqito.sq_metrics.roughness.roughness_ecma._non_linear_transform import (
+    _non_linear_transform,
+)
+from mosqito.sq_metrics.roughness.roughness_ecma._lowpass_filter import (
+    _lowpass_filter_frames,
+)
+from mosqito.sq_metrics.roughness.roughness_ecma._running_percentile import (
+    _running_percentile,
+    _running_percentile_state,
+)
+
+
+class RoughnessEcmaStream:
+    """
+    Streaming computation of the roughness of a time signal
+
+    This class computes the roughness according to ECMA-418-2 (2nd Ed,
+    2022), section 7, from a signal provided chunk by chunk. The states of
+    the outer and middle ear filter and of the auditory filters are
+    carried from one chunk to the next one, and only the last block of
+    16384 samples of the band-pass signals is kept: the memory used does
+    not depend on the signal duration. The time-dependent roughness is
+    returned at 50 Hz as soon as its interpolation (section 7.1.7) is
+    known, and the overall roughness is updated with a running estimate of
+    the 90th percentile.
+
+    Parameters
+    ----------
+    fs : integer
+        Sampling frequency [Hz]. A signal which is not sampled at 48 kHz is
+        resampled chunk by chunk (see mosqito.utils.ResampleStream).
+        Default is 48000
+    dtype : {'float64', 'float32'}, optional
+        Precision of the band-pass signals and of the envelopes, see
+        roughness_ecma. Default is 'float64'
+
+    Attributes
+    ----------
+    R : float
+        Overall roughness [asper_HMS], 90th percentile of the
+        time-dependent roughness returned so far, exact for the first 50
+        frames and then estimated with the P-square algorithm, None before
+        the first frame. It is kept after flush,
+        until frames of a new signal are returned.
+    bark_axis : numpy.ndarray
+        Bark axis, size (Nbark,).
+
+    Warning
+    -------
+    The envelopes are computed block by block, as in the standard, while
+    roughness_ecma computes them on the continuous band-pass signals: the
+    time-dependent roughness values differ by the edge effects of the
+    Hilbert transform and of the decimation filters at the block
+    boundaries (see
+    validations/sq_metrics/roughness_ecma/validation_envelopes_ecma.py).
+    The interpolation to 50 Hz of a block needs the two next ones, the last
+    frames of a chunk are thus only returned once 8192 more samples are
+    pushed (or when the stream is flushed). The time axis is the one of
+    roughness_ecma.
+
+    See Also
+    --------
+    .roughness_ecma : Roughness computation based on the hearing model of ECMA 418-2
+
+    Examples
+    --------
+    .. plot::
+       :include-source:
+
+       >>> from mosqito.sq_metrics import RoughnessEcmaStream
+       >>> import matplotlib.pyplot as plt
+       >>> import numpy as np
+       >>> fs=48000
+       >>> d=2
+       >>> dB=60
+       >>> fmod = 70
+       >>> fc = 1000
+       >>> time = np.arange(0, d, 1/fs)
+       >>> signal = 0.5 * (1 + np.sin(2 * np.pi * fmod * time)) * np.sin(2 * np.pi * fc * time)
+       >>> rms = np.sqrt(np.mean(np.power(signal, 2)))
+       >>> ampl = 0.00002 * np.power(10, dB / 20) / rms
+       >>> stimulus = signal * ampl
+       >>> stream = RoughnessEcmaStream(fs)
+       >>> R_time = []
+       >>> for chunk in np.array_split(stimulus, 20):
+       >>>     R_time_chunk, _, _ = stream.push(chunk)
+       >>>     R_time.append(R_time_chunk)
+       >>> R_time_chunk, _, _ = stream.flush()
+       >>> R_time.append(R_time_chunk)
+       >>> plt.plot(np.concatenate(R_time))
+       >>> plt.xlabel("Frame index (20 ms)")
+       >>> plt.ylabel("Roughness [Asper]")
+       >>> plt.title("Roughness = " + f"{stream.R:.2f}" + " [Asper]")
+    """
+
+    def __init__(self, fs=48000, dtype="float64"):
+        self._resampler = None
+        if fs != 48000:
+            print(
+                "[Warning] Signal resampled to 48 kHz fulfill the standard requirements and allow calculation."
+            )
+            self._resampler = ResampleStream(fs, 48000)
+        self.fs = fs
+        self.dtype = _compute_dtype(dtype)
+        self.bark_axis = np.linspace(0.5, 26.5, num=53, endpoint=True)
+        self.R = None
+        self._reset()
+
+    def _reset(self):
+        """Set the stream back to its initial (silent) state"""
+        # Number of signal samples pushed (at 48 kHz)
+        self._n_samples = 0
+        # Filter states
+        self._zi_ear = np.zeros((_ear_filter_design().shape[0], 2))
+        self._zi_bands = np.zeros((CBF, 5, 2))
+        # Band-pass signals from the start of the next block, the zeros of
+        # the zero padding before the signal (5.1.2) being already filtered
+        self._buffer = np.zeros((CBF, SB), dtype=self.dtype)
+        # Index of the next block
+        self._l_next = 0
+        # Times and modulation amplitudes of the last blocks, for the
+        # interpolation to 50 Hz
+        self._t_knots = np.empty(0)
+        self._amplitude_knots = np.empty((0, CBF))
+        # Index of the next 50 Hz frame
+        self._i_frame = 0
+        # Lowpass filter and percentile estimate states
+        self._lp_state = {"R_hat_last": None, "R_hat_1": None, "exp_1": None}
+        self._percentile_state = _running_percentile_state(90)
+
+    def push(self, chunk):
+        """Process a new chunk of the time signal
+
+        Parameters
+        ----------
+        chunk : numpy.array
+            Time signal values [Pa], size (Nsamples,).
+
+        Returns
+        -------
+        R_time : numpy.ndarray
+            Roughness [asper_HMS] of the new frames, size (Ntime,).
+        R_specific : numpy.ndarray
+            Specific roughness [asper_HMS/bark] of the new frames, size
+            (Nbark, Ntime).
+        time_axis : numpy.ndarray
+            Time axis of the new frames, size (Ntime,).
+        """
+        if self._resampler is not None:
+            chunk = self._resampler.push(chunk)
+        return self._process(chunk)
+
+    def flush(self):
+        """Process the end of the signal
+
+        The signal is zero-padded as in roughness_ecma and the remaining
+        frames are returned. The stream is then reset and can be used for a
+        new signal.
+
+        Returns
+        -------
+        R_time : numpy.ndarray
+            Roughness [asper_HMS] of the last frames, size (Ntime,).
+        R_specific : numpy.ndarray
+            Specific roughness [asper_HMS/bark] of the last frames, size
+            (Nbark, Ntime).
+        time_axis : numpy.ndarray
+            Time axis of the last frames, size (Ntime,).
+        """
+        outputs = []
+        # End of the resampled signal
+        if self._resampler is not None:
+            outputs.append(self._process(self._resampler.flush()))
+
+        # Zero padding after the signal (5.1.2)
+        n_new = int(_padding(self._n_samples, SB, SH)[1])
+        n_filtered = self._l_next * SH + self._buffer.shape[1] - SB
+        self._filter(np.zeros(n_new - n_filtered, dtype=self.dtype))
+        outputs.append(self._frames(is_last=True))
+        self._reset()
+
+        return tuple(np.concatenate(out, axis=-1) for out in zip(*outputs))
+
+    def _process(self, chunk):
+        """Processing of a chunk of the signal sampled at 48 kHz"""
+        chunk = np.array(chunk, dtype=self.dtype)
+
+        # Fade-in of the first 5 ms of the signal (5.1.2)
+        n_fadein = 240
+        if self._n_samples < n_fadein:
+            i_fadein = np.arange(
+                self._n_samples, min(n_fadein, self._n_samples + len(chunk))
+            )
+            chunk[: len(i_fadein)] *= 0.5 - 0.5 * np.cos(np.pi * i_fadein / n_fadein)
+        self._n_samples += len(chunk)
+
+        self._filter(chunk)
+        return self._frames(is_last=False)
+
+    def _filter(self, chunk):
+        """Band-pass signals of a chunk of the zero-padded signal, and
+        modulation amplitudes of the blocks they complete"""
+        if len(chunk) == 0:
+            return
+        # Outer and middle ear filtering (5.1.3) and auditory filters (5.1.4)
+        signal_filtered, self._zi_ear = sp_signal.sosfilt(
+            _ear_filter_design(), chunk, zi=self._zi_ear
+        )
+        bandpass_signals = np.empty((CBF, len(chunk)), dtype=self.dtype)
+        for z in range(CBF):
+            bandpass_signals[z], self._zi_bands[z] = _gammatone_filter(
+                signal_filtered, z, self._zi_bands[z]
+            )
+        self._buffer = np.concatenate((self._buffer, bandpass_signals), axis=1)
+
+        # Complete blocks
+        n_blocks = (self._buffer.shape[1] - SB) // SH + 1
+        if n_blocks < 1:
+            return
+        bandpass_signals = list(self._buffer)
+
+        # Root mean square values and specific loudness of the blocks
+        rms_array, _ = _ecma_block_rms(bandpass_signals, SB, SH, n_blocks * SH)
+        N_specific, _ = _loudness_from_rms(rms_array)
+
+        # Envelopes of each block (7.1.2)
+        envelopes = _block_envelopes(
+            self._buffer, SB, SH, n_blocks, DOWNSAMPLING_FACTOR, SEGMENT_BLOCKS
+        )
+
+        # Scaled power spectrum, noise reduction and spectral weighting
+        # (7.1.3 to 7.1.5)
+        amplitude = _modulation_amplitudes(envelopes, np.array(N_specific).T)
+        amplitude[amplitude < 0.074376] = 0
+
+        self._t_knots = np.concatenate(
+            (self._t_knots, _block_time(SB, SH, self._l_next * SH, n_blocks))
+        )
+        self._amplitude_knots = np.concatenate((self._amplitude_knots, amplitude))
+        self._l_next += n_blocks
+        self._buffer = self._buffer[:, n_blocks * SH :]
+
+    def _frames(self, is_last):
+        """Time-dependent specific roughness of the 50 Hz frames whose
+        interpolation is known (7.1.7)"""
+        # Last sample to be evaluated (Eq. 103)
+        n_frames = int(self._n_samples / 48000 * 50)
+        i_frame = np.arange(self._i_frame, n_frames)
+        t_50 = i_frame / 50
+        if not is_last:
+            # The interpolation between two blocks needs the next one
+            if len(self._t_knots) < 3:
+                t_50 = t_50[:0]
+            else:
+                t_50 = t_50[t_50 < self._t_knots[-2]]
+        if len(t_50) == 0:
+            return np.empty(0), np.empty((CBF, 0)), t_50
+        self._i_frame += len(t_50)
+
+        # Piecewise Cubic Hermitian Interpolating Polynomial (PCHIP)
+        A_50 = pchip_interpolate(self._t_knots, self._amplitude_knots, t_50, axis=0)
+        R_est = np.clip(A_50, 0, None)
+        # Non linear transformation and lowpass filtering
+        R_time_spec = _lowpass_filter_frames(
+            _non_linear_transform(R_est), self._lp_state
+        )
+        R_time = 0.5 * np.sum(R_time_spec, axis=1)
+        self.R = _running_percentile(R_time, self._percentile_state)
+
+        # Blocks still needed by the next frames: the block before the next
+        # frame and the previous one, whose slopes give its derivative
+        l_next = np.searchsorted(self._t_knots, self._i_frame / 50, side="right")
+        l_keep = max(l_next - 2, 0)
+        self._t_knots = self._t_knots[l_keep:]
+        self._amplitude_knots = self._amplitude_knots[l_keep:]
+
+        return R_time, R_time_spec.T, t_50
@@ -107,9 +107,9 @@ def sharpness_din_perseg(
         print(
             "[Warning] Signal resampled to 48 kHz to allow calculation. To fulfill the standard requirements fs should be >=48 kHz."
         )
-        from scipy.signal import resample
+        from mosqito.utils.resample import resample
 
-        signal = resample(signal, int(48000 * len(signal) / fs))
+        signal = resample(signal, fs, 48000)
         fs = 48000
 
     # Compute loudness
@@ -48,12 +48,21 @@ Signal loading
    
    /source/reference/mosqito.utils.load
 
+Signal resampling
+===================
+
+.. toctree::
+   :maxdepth: 1
+   
+   /source/reference/mosqito.utils.resample
+
 """
 
 __all__ = ['utils']
 
 
 from mosqito.utils.load import load
+from mosqito.utils.resample import resample, ResampleStream
 from mosqito.utils.time_segmentation import time_segmentation
 from mosqito.utils.sine_wave_generator import sine_wave_generator
 from mosqito.utils.am_noise_generator import am_noise_generator
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+# Standard library imports
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _parallel_map(func, items, workers=1):
+    """Apply a function to each item, optionally in a thread pool
+
+    The filtering functions of scipy.signal release the GIL, the bands of a
+    filter bank can thus be processed in parallel by threads.
+    The resulting speed-up has not been measured on a multi-core machine
+    yet, the workers options relying on this function are experimental.
+
+    Parameters
+    ----------
+    func : callable
+        Function applied to each item
+    items : iterable
+        Items (e.g. band indices)
+    workers : int, optional
+        Number of threads. If 1, the items are processed serially.
+        Default is 1
+
+    Outputs
+    -------
+    results : list
+        Results of func, in the order of items
+    """
+    if workers is None or workers < 1:
+        raise ValueError("ERROR: workers shall be a positive integer")
+    if workers == 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items))
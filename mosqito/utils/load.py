@@ -3,9 +3,11 @@
 # Standard library imports
 from numpy import int16, int32
 from scipy.io import wavfile, loadmat
-from scipy.signal import resample
 import pyuff
 
+# Local application imports
+from mosqito.utils.resample import resample
+
 
 def load(file, wav_calib=None, mat_signal="", mat_fs=""):
     """
@@ -77,14 +79,14 @@ def load(file, wav_calib=None, mat_signal="", mat_fs=""):
         # extract the signal values and sampling frequency
         signal = matfile[mat_signal][:, 0]
         fs = matfile[mat_fs]
-        fs = fs[:, 0]
+        fs = fs[0, 0]
 
     else:
         raise ValueError("""ERROR: only .wav .mat or .uff files are supported""")
 
     # resample to 48kHz to allow calculation
     if fs != 48000:
-        signal = resample(signal, int(48000 * len(signal) / fs))
+        signal = resample(signal, fs, 48000)
         fs = 48000
         print("[Info] Signal resampled to 48 kHz to allow calculation.")
 
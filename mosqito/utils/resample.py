@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+# Standard library imports
+from fractions import Fraction
+from functools import lru_cache
+
+# Third party imports
+from numpy import concatenate, zeros
+from scipy.signal import firwin, resample_poly, upfirdn
+
+
+def resample(signal, fs, fs_out=48000):
+    """
+    Signal resampling
+
+    This function resamples a time signal by rational polyphase filtering.
+    The anti-aliasing filter is the one of scipy.signal.resample_poly, its
+    design being kept in cache for each pair of sampling frequencies.
+
+    Parameters
+    ----------
+    signal : numpy.array
+        Time signal values, size (Nsamples,) or (Nsamples, Nchannels).
+    fs : float
+        Sampling frequency of the signal [Hz].
+    fs_out : float, optional
+        Sampling frequency of the resampled signal [Hz].
+        Default is 48000
+
+    Returns
+    -------
+    signal : numpy.array
+        Resampled time signal values, size (ceil(Nsamples * fs_out / fs),)
+        or (ceil(Nsamples * fs_out / fs), Nchannels).
+
+    See Also
+    --------
+    ResampleStream : Chunk-wise signal resampling
+
+    Examples
+    --------
+    >>> from mosqito.utils import resample
+    >>> import numpy as np
+    >>> fs = 44100
+    >>> time = np.arange(0, 1, 1 / fs)
+    >>> signal = np.sin(2 * np.pi * 1000 * time)
+    >>> signal_48k = resample(signal, fs, 48000)
+    """
+    up, down, h = _resampler_design(fs, fs_out)
+    if up == down == 1:
+        return signal.copy()
+    return resample_poly(signal, up, down, axis=0, window=h)
+
+
+class ResampleStream:
+    """
+    Chunk-wise signal resampling
+
+    This class resamples a time signal provided chunk by chunk, with the
+    polyphase filter of the resample function. The input samples needed by
+    the next output samples are carried from one chunk to the next one, so
+    that the concatenated outputs are the ones of resample applied to the
+    complete signal.
+
+    Parameters
+    ----------
+    fs : float
+        Sampling frequency of the signal [Hz].
+    fs_out : float, optional
+        Sampling frequency of the resampled signal [Hz].
+        Default is 48000
+
+    Warning
+    -------
+    The output samples depend on input samples up to half the length of
+    the anti-aliasing filter ahead, the last ones of a chunk are thus only
+    returned once the next chunk is pushed (or when the stream is flushed).
+
+    See Also
+    --------
+    resample : Signal resampling
+
+    Examples
+    --------
+    >>> from mosqito.utils import ResampleStream
+    >>> import numpy as np
+    >>> fs = 44100
+    >>> time = np.arange(0, 1, 1 / fs)
+    >>> signal = np.sin(2 * np.pi * 1000 * time)
+    >>> stream = ResampleStream(fs, 48000)
+    >>> chunks = [stream.push(chunk) for chunk in np.array_split(signal, 10)]
+    >>> chunks.append(stream.flush())
+    >>> signal_48k = np.concatenate(chunks)
+    """
+
+    def __init__(self, fs, fs_out=48000):
+        self.fs = fs
+        self.fs_out = fs_out
+        self._up, self._down, h = _resampler_design(fs, fs_out)
+        self._n_pre_remove = 0
+        if h is not None:
+            # Filter shifted to put the output samples at its center (as in
+            # scipy.signal.resample_poly)
+            half_len = (len(h) - 1) // 2
+            n_pre_pad = self._down - half_len % self._down
+            self._n_pre_remove = (half_len + n_pre_pad) // self._down
+            self._h = concatenate((zeros(n_pre_pad), h * self._up))
+        # Trailing (channel) shape of the last chunk pushed
+        self._channel_shape = ()
+        self._reset()
+
+    def _reset(self):
+        """Set the stream back to its initial state"""
+        # Input samples still needed, starting at input sample index _n_start
+        self._buffer = None
+        self._n_start = 0
+        # Index of the next output sample of the unshifted filtering
+        self._i_next = self._n_pre_remove
+
+    def push(self, chunk):
+        """Resample a new chunk of the time signal
+
+        Parameters
+        ----------
+        chunk : numpy.array
+            Time signal values, size (Nsamples,) or (Nsamples, Nchannels).
+
+        Returns
+        -------
+        signal : numpy.array
+            Resampled time signal values of the output samples that only
+            depend on the samples pushed so far.
+        """
+        self._channel_shape = chunk.shape[1:]
+        if self._up == self._down == 1:
+            return chunk.copy()
+        if self._buffer is None:
+            self._buffer = chunk[:0]
+        self._buffer = concatenate((self._buffer, chunk))
+        n_samples = self._n_start + len(self._buffer)
+        # Last output sample whose input samples are all known
+        i_end = (n_samples * self._up - 1) // self._down + 1
+        return self._filter(i_end)
+
+    def flush(self):
+        """Resample the end of the time signal
+
+        The stream is then reset and can be used for a new signal.
+
+        Returns
+        -------
+        signal : numpy.array
+            Resampled time signal values of the remaining output samples,
+            with the channels of the last chunk pushed.
+        """
+        if self._buffer is None:
+            return zeros((0,) + self._channel_shape)
+        n_samples = self._n_start + len(self._buffer)
+        n_out = -(-n_samples * self._up // self._down)
+        # Zero padding after the end of the signal
+        n_pad = -(-len(self._h) // self._up) + 1
+        self._buffer = concatenate(
+            (self._buffer, zeros((n_pad,) + self._buffer.shape[1:]))
+        )
+        signal = self._filter(n_out + self._n_pre_remove)
+        self._reset()
+        return signal
+
+    def _filter(self, i_end):
+        """Output samples up to i_end of the unshifted filtering, and
+        removal of the input samples that are not needed anymore"""
+        if i_end <= self._i_next:
+            return self._buffer[:0]
+        # The buffer starts at a multiple of down, so that its output
+        # samples are aligned with the ones of the complete signal
+        i_offset = self._n_start * self._up // self._down
+        signal = upfirdn(self._h, self._buffer, self._up, self._down, axis=0)
+        signal = signal[self._i_next - i_offset : i_end - i_offset]
+        self._i_next = i_end
+        n_start = max(0, self._i_next * self._down - len(self._h) + 1) // self._up
+        n_start -= n_start % self._down
+        self._buffer = self._buffer[n_start - self._n_start :]
+        self._n_start = n_start
+        return signal
+
+
+@lru_cache(maxsize=None)
+def _resampler_design(fs, fs_out):
+    """Rational resampling factors and anti-aliasing filter design
+
+    Parameters
+    ----------
+    fs : float
+        Sampling frequency of the signal [Hz].
+    fs_out : float
+        Sampling frequency of the resampled signal [Hz].
+
+    Outputs
+    -------
+    up, down : int
+        Upsampling and downsampling factors, fs_out / fs = up / down
+    h : numpy.ndarray
+        Coefficients of the anti-aliasing FIR filter (as designed by
+        scipy.signal.resample_poly), before the upsampling gain. None if
+        fs_out = fs.
+    """
+    ratio = Fraction(fs_out) / Fraction(fs)
+    if ratio.denominator > 10000 or ratio.numerator > 10000:
+        ratio = ratio.limit_denominator(1000)
+    up, down = ratio.numerator, ratio.denominator
+    if up == down == 1:
+        return up, down, None
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    h = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+    # The cached array is made read-only, resample_poly works on a copy
+    h.flags.writeable = False
+    return up, down, h
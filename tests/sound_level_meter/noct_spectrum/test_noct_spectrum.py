@@ -42,6 +42,18 @@ def test_noct_spectrum():
     )
 
 
+@pytest.mark.noct_spectrum  # to skip or run only loudness noct_spectrum tests
+def test_noct_spectrum_workers():
+    fs = 48000
+    sig = np.random.default_rng(0).normal(0, 1, size=(fs, 2))
+
+    spec, freq = noct_spectrum(sig, fs, 24, 12600)
+    spec_workers, freq_workers = noct_spectrum(sig, fs, 24, 12600, workers=4)
+    np.testing.assert_array_equal(spec_workers, spec)
+    np.testing.assert_array_equal(freq_workers, freq)
+
+
 # test de la fonction
 if __name__ == "__main__":
     test_noct_spectrum()
+    test_noct_spectrum_workers()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+# Optional package import
+try:
+    import pytest
+except ImportError:
+    raise RuntimeError("In order to perform the tests you need the 'pytest' package.")
+
+import numpy as np
+
+# Local application imports
+from mosqito.sq_metrics import Ecma418Analysis, loudness_ecma, roughness_ecma
+from mosqito.utils.am_sine_generator import am_sine_generator
+
+
+@pytest.mark.loudness_ecma  # to skip or run only loudness ecma tests
+def test_ecma418_analysis():
+    """Test function for the ECMA-418-2 metrics computed from a single front
+    end, which must be identical to the ones of loudness_ecma and
+    roughness_ecma"""
+
+    time = np.linspace(0, 1, 48000)
+    xmod = np.sin(2 * np.pi * 70 * time)
+    stimulus, _ = am_sine_generator(xmod, fs=48000, fc=1000, spl_level=60)
+
+    analysis = Ecma418Analysis(stimulus, fs=48000)
+    N, N_time, N_spec, _, time_array = analysis.loudness()
+    bandpass_signals = analysis._bandpass_signals
+    R, R_time, R_spec, _, time_axis = analysis.roughness()
+
+    # The band-pass signals are computed once
+    assert analysis._bandpass_signals is bandpass_signals
+
+    N_ref, N_time_ref, N_spec_ref, _, time_array_ref = loudness_ecma(stimulus, 48000)
+    assert N == N_ref
+    np.testing.assert_array_equal(N_time, N_time_ref)
+    np.testing.assert_array_equal(N_spec, N_spec_ref)
+    np.testing.assert_array_equal(time_array, time_array_ref)
+
+    R_ref, R_time_ref, R_spec_ref, _, time_axis_ref = roughness_ecma(stimulus, 48000)
+    assert R == R_ref
+    np.testing.assert_array_equal(R_time, R_time_ref)
+    np.testing.assert_array_equal(R_spec, R_spec_ref)
+    np.testing.assert_array_equal(time_axis, time_axis_ref)
+
+    # Loudness with blocks larger than the roughness ones
+    N_large, _, _, _, _ = analysis.loudness(sb=32768, sh=8192)
+    N_large_ref, _, _, _, _ = loudness_ecma(stimulus, 48000, sb=32768, sh=8192)
+    assert N_large == N_large_ref
+
+
+# test de la fonction
+if __name__ == "__main__":
+    test_ecma418_analysis()
@@ -8,12 +8,24 @@ except ImportError:
         "In order to perform the tests you need the 'pytest' package."
         )
 import numpy as np
+from scipy.signal import lfilter
 
 # Local application imports
 from mosqito.utils.sine_wave_generator import (
     sine_wave_generator,
 )
 from mosqito.sq_metrics import loudness_ecma
+from mosqito.sq_metrics.loudness.loudness_ecma._auditory_filters_centre_freq import (
+    _auditory_filters_centre_freq,
+)
+from mosqito.sq_metrics.loudness.loudness_ecma._band_pass_signals import (
+    _gammatone_filter,
+)
+from mosqito.sq_metrics.loudness.loudness_ecma._gammatone import _gammatone
+from mosqito.sq_metrics.loudness.loudness_ecma._ecma_time_segmentation import (
+    _ecma_time_segmentation,
+    _ecma_block_rms,
+)
 
 @pytest.mark.loudness_ecma  # to skip or run only loudness ecma tests
 def test_loudness_ecma():
@@ -43,6 +55,131 @@ def test_loudness_ecma():
     assert np.isclose(n_1kHz, n_5kHz)
     
 
+@pytest.mark.loudness_ecma  # to skip or run only loudness ecma tests
+def test_loudness_ecma_multichannel():
+    """Test function for the multichannel use of loudness_ecma"""
+
+    signal_1kHz, _ = sine_wave_generator(fs=48000, d=0.25, freq=1000, spl_level=80)
+    signal_5kHz, _ = sine_wave_generator(fs=48000, d=0.25, freq=5000, spl_level=70)
+    signals = np.stack((signal_1kHz, signal_5kHz), axis=1)
+
+    N, N_time, N_spec, _, _ = loudness_ecma(signals, fs=48000)
+    for i in range(2):
+        N_channel, N_time_channel, N_spec_channel, _, _ = loudness_ecma(
+            signals[:, i], fs=48000
+        )
+        np.testing.assert_allclose(N[i], N_channel, rtol=1e-12)
+        np.testing.assert_allclose(N_time[i], N_time_channel, rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(
+            N_spec[i], np.array(N_spec_channel), rtol=1e-12, atol=1e-12
+        )
+
+
+@pytest.mark.loudness_ecma  # to skip or run only loudness ecma tests
+def test_loudness_ecma_workers():
+    """Test function for the parallel filtering of the bands of loudness_ecma"""
+
+    signal, _ = sine_wave_generator(fs=48000, d=0.25, freq=1000, spl_level=80)
+    N, N_time, N_spec, _, _ = loudness_ecma(signal, fs=48000)
+    N_w, N_time_w, N_spec_w, _, _ = loudness_ecma(signal, fs=48000, workers=4)
+    assert N_w == N
+    np.testing.assert_array_equal(N_time_w, N_time)
+    np.testing.assert_array_equal(N_spec_w, N_spec)
+
+
+@pytest.mark.loudness_ecma  # to skip or run only loudness ecma tests
+def test_loudness_ecma_bands():
+    """Test function for the evaluation of a subset of the critical bands,
+    which must give the specific loudness of these bands"""
+
+    signal, _ = sine_wave_generator(fs=48000, d=0.25, freq=1000, spl_level=80)
+    _, _, N_spec, bark_axis, _ = loudness_ecma(signal, fs=48000)
+    bands = np.arange(5, 24)
+    for kwargs in [{"bands": list(bands)}, {"bark_range": (3, 12)}]:
+        N, N_time, N_spec_b, bark_axis_b, time_b = loudness_ecma(
+            signal, fs=48000, **kwargs
+        )
+        np.testing.assert_array_equal(bark_axis_b, bark_axis[bands])
+        np.testing.assert_array_equal(N_spec_b, np.array(N_spec)[bands])
+        np.testing.assert_allclose(N_time, np.sum(N_spec_b, axis=0) * 0.5)
+        assert len(time_b) == len(bands)
+
+    with pytest.raises(ValueError):
+        loudness_ecma(signal, fs=48000, bands=[53])
+    with pytest.raises(ValueError):
+        loudness_ecma(signal, fs=48000, bands=[1], bark_range=(3, 12))
+
+
+@pytest.mark.loudness_ecma  # to skip or run only loudness ecma tests
+def test_loudness_ecma_multirate():
+    """Test function for the loudness computed with the multirate filter
+    bank, which must be close to the loudness computed at 48 kHz"""
+
+    signal_125Hz, _ = sine_wave_generator(fs=48000, d=0.5, freq=125, spl_level=70)
+    signal_1kHz, _ = sine_wave_generator(fs=48000, d=0.5, freq=1000, spl_level=60)
+    signal = signal_125Hz + signal_1kHz
+    for sb, sh in [(2048, 1024), (1920, 768)]:
+        N, N_time, N_spec, _, _ = loudness_ecma(signal, fs=48000, sb=sb, sh=sh)
+        N_m, N_time_m, N_spec_m, _, _ = loudness_ecma(
+            signal, fs=48000, sb=sb, sh=sh, multirate=True
+        )
+        np.testing.assert_allclose(N_m, N, rtol=1e-4)
+        np.testing.assert_allclose(N_time_m, N_time, rtol=0, atol=1e-3 * N_time.max())
+        np.testing.assert_allclose(
+            N_spec_m, N_spec, rtol=0, atol=1e-3 * np.max(N_spec)
+        )
+
+
+@pytest.mark.loudness_ecma  # to skip or run only loudness ecma tests
+def test_ecma_block_rms():
+    """Test function for the block root-mean-square values computed without
+    segmentation of the band signals"""
+
+    rng = np.random.default_rng(0)
+    n_new = 12288
+    signals = [rng.standard_normal((n_new + 8192, 2)) for _ in range(53)]
+    sb = [4096] * 26 + [8192] * 27
+    for sb, sh in [(2048, 1024), (1920, 768), (sb, 2048)]:
+        blocks, time = _ecma_time_segmentation(signals, sb, sh, n_new)
+        rms, time_rms = _ecma_block_rms(signals, sb, sh, n_new)
+        for z in range(53):
+            rms_blocks = np.sqrt(
+                2 * np.mean(np.clip(blocks[z], 0, None) ** 2, axis=1)
+            )
+            np.testing.assert_allclose(rms[z], rms_blocks, rtol=1e-12)
+            np.testing.assert_array_equal(time_rms[z], time[z])
+    # Blocks starting before the signal (Eq. 19) are padded with zeros
+    np.testing.assert_array_equal(blocks[52][0, :4096], 0)
+    np.testing.assert_array_equal(blocks[52][0, 4096:], signals[52][:4096])
+
+
+@pytest.mark.loudness_ecma  # to skip or run only loudness ecma tests
+def test_gammatone_filter():
+    """Test function for the second-order sections of the auditory filters,
+    compared to the complex filters of ECMA-418-2 equations 16 and 17
+    computed as a cascade of first-order complex resonators"""
+
+    signal = np.random.default_rng(0).standard_normal((4800, 2))
+    for band_number, freq in enumerate(_auditory_filters_centre_freq()):
+        bm_prim, am_prim = _gammatone(freq)
+        pole = -am_prim[1] / 5
+        reference = lfilter(bm_prim, [1], signal, axis=0)
+        for _ in range(5):
+            reference = lfilter([1], [1, -pole], reference, axis=0)
+        reference = 2 * reference.real
+        np.testing.assert_allclose(
+            _gammatone_filter(signal, band_number),
+            reference,
+            rtol=0,
+            atol=1e-5 * np.abs(reference).max(),
+        )
+
+
 # test de la fonction
 if __name__ == "__main__":
     test_loudness_ecma()
+    test_loudness_ecma_multichannel()
+    test_loudness_ecma_workers()
+    test_loudness_ecma_bands()
+    test_ecma_block_rms()
+    test_gammatone_filter()
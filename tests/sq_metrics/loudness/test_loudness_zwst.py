@@ -195,6 +195,44 @@ def test_loudness_zwst_gi0():
     )
 
 
+@pytest.mark.loudness_zwst
+def test_calc_slopes_frames():
+    """Test that the frames processed together by _calc_slopes give the
+    same results as the frames processed one by one, and that the total
+    loudness only path gives the same total loudness
+    """
+    Nm = _main_loudness(test_signal_1, field_type="free")
+    rng = np.random.default_rng(0)
+    nm = np.column_stack(
+        (
+            Nm,
+            0.5 * Nm,
+            Nm[::-1],
+            np.zeros(21),
+            rng.uniform(0, 30, (21, 20)) * (rng.uniform(size=(21, 20)) > 0.3),
+        )
+    )
+    N, N_specific = _calc_slopes(nm)
+    for i in range(nm.shape[1]):
+        N_frame, N_specific_frame = _calc_slopes(nm[:, i])
+        assert N[i] == N_frame
+        np.testing.assert_array_equal(N_specific[:, i], N_specific_frame)
+
+    N_total, N_specific_total = _calc_slopes(nm, specific=False)
+    np.testing.assert_array_equal(N_total, N)
+    assert N_specific_total is None
+
+
+@pytest.mark.loudness_zwst
+def test_main_loudness_float32():
+    """Test that _main_loudness keeps a float32 spectrum in single precision"""
+    spec_third = np.column_stack((test_signal_1, test_signal_1 - 20))
+    Nm = _main_loudness(spec_third, field_type="free")
+    Nm_32 = _main_loudness(spec_third.astype(np.float32), field_type="free")
+    assert Nm_32.dtype == np.float32
+    np.testing.assert_allclose(Nm_32, Nm, rtol=1e-5, atol=1e-6)
+
+
 # test
 if __name__ == "__main__":
     # Reproduce the code from the fixture
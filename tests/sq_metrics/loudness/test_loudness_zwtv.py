@@ -2,10 +2,14 @@
 
 # Third party imports
 import pytest
+import numpy as np
 
 # Local application imports
-from mosqito.sq_metrics import loudness_zwtv
-from mosqito.utils import load
+from mosqito.sq_metrics import loudness_zwtv, LoudnessZwtvStream
+from mosqito.utils import load, resample
+from mosqito.sq_metrics.loudness.loudness_zwtv._temporal_weighting import (
+    _temporal_weighting,
+)
 from validations.sq_metrics.loudness_zwtv.validation_loudness_zwtv import (
     _check_compliance,
 )
@@ -59,6 +63,191 @@ def test_loudness_zwtv():
     assert _check_compliance(loudness, signal, "./tests/output/")
 
 
+@pytest.mark.loudness_zwtv  # to skip or run only loudness zwicker time-varying tests
+def test_loudness_zwtv_stream():
+    """Test function for the class LoudnessZwtvStream
+
+    The signal is pushed by chunks of various sizes and the concatenated
+    outputs are compared to the ones of loudness_zwtv, the time axis
+    within 0.5 ms.
+    """
+    sig, fs = load(
+        "tests/input/Test signal 10 (tone pulse 1 kHz 10 ms 70 dB).wav",
+        wav_calib=2 * 2**0.5,
+    )
+    N, N_spec, bark_axis, time_axis_batch = loudness_zwtv(sig, fs)
+
+    # Chunks of 1 sample, less than a 0.5 ms frame and more than a 2 ms frame
+    chunks = np.split(sig, [1, 2, 20, 30, 1000, 1001, 5000, 12345, 30000])
+    stream = LoudnessZwtvStream(fs)
+    outputs = [stream.push(chunk) for chunk in chunks]
+    outputs.append(stream.flush())
+    N_stream = np.concatenate([out[0] for out in outputs])
+    N_spec_stream = np.hstack([out[1] for out in outputs])
+    time_axis = np.concatenate([out[2] for out in outputs])
+
+    assert len(N_stream) == len(time_axis)
+    np.testing.assert_allclose(time_axis, np.arange(len(time_axis)) * 0.002)
+    np.testing.assert_allclose(time_axis, time_axis_batch, rtol=0, atol=5e-4)
+    np.testing.assert_array_equal(stream.bark_axis, bark_axis)
+    np.testing.assert_allclose(N_stream, N, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(N_spec_stream, N_spec, rtol=1e-10, atol=1e-12)
+
+    # Signal resampled chunk by chunk
+    sig_44k = resample(sig, fs, 44100)
+    N, _, _, _ = loudness_zwtv(sig_44k, 44100)
+    stream = LoudnessZwtvStream(44100)
+    outputs = [stream.push(chunk) for chunk in np.array_split(sig_44k, 5)]
+    outputs.append(stream.flush())
+    N_stream = np.concatenate([out[0] for out in outputs])
+    np.testing.assert_allclose(N_stream, N, rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.loudness_zwtv  # to skip or run only loudness zwicker time-varying tests
+def test_loudness_zwtv_multirate():
+    """Test function for the multirate filter bank of loudness_zwtv
+
+    The loudness computed with the multirate filter bank is compared to the
+    one computed with the ISO 532-1 filter bank, with the loudness tolerance
+    of section 6.1 of the standard (5 % or 0.1 sone). The output of the
+    streaming class is compared to the one of loudness_zwtv.
+    """
+    sig, fs = load(
+        "tests/input/Test signal 10 (tone pulse 1 kHz 10 ms 70 dB).wav",
+        wav_calib=2 * 2**0.5,
+    )
+    N, _, _, _ = loudness_zwtv(sig, fs)
+    N_multirate, N_spec, _, _ = loudness_zwtv(sig, fs, multirate=True)
+
+    assert N_multirate.shape == N.shape
+    assert np.all(np.abs(N_multirate - N) <= np.maximum(0.05 * N, 0.1))
+
+    chunks = np.split(sig, [1, 2, 20, 30, 1000, 1001, 5000, 12345, 30000])
+    stream = LoudnessZwtvStream(fs, multirate=True)
+    outputs = [stream.push(chunk) for chunk in chunks]
+    outputs.append(stream.flush())
+    N_stream = np.concatenate([out[0] for out in outputs])
+    N_spec_stream = np.hstack([out[1] for out in outputs])
+
+    np.testing.assert_allclose(N_stream, N_multirate, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(N_spec_stream, N_spec, rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.loudness_zwtv  # to skip or run only loudness zwicker time-varying tests
+def test_loudness_zwtv_time_resolution():
+    """Test function for the time_resolution parameter of loudness_zwtv
+
+    The outputs with the default 2 ms and a 10 ms time resolution, whose
+    total loudness is computed without the specific loudness for the frames
+    that are not returned, are compared to the ones with the 0.5 ms
+    resolution, for loudness_zwtv and LoudnessZwtvStream.
+    """
+    sig, fs = load(
+        "tests/input/Test signal 10 (tone pulse 1 kHz 10 ms 70 dB).wav",
+        wav_calib=2 * 2**0.5,
+    )
+    N, N_spec, _, time_axis = loudness_zwtv(sig, fs, time_resolution=0.0005)
+    N_10, N_spec_10, _, time_axis_10 = loudness_zwtv(sig, fs, time_resolution=0.01)
+    N_2, N_spec_2, _, _ = loudness_zwtv(sig, fs)
+
+    np.testing.assert_array_equal(N_2, N[::4])
+    np.testing.assert_array_equal(N_spec_2, N_spec[:, ::4])
+    np.testing.assert_array_equal(N_10, N[::20])
+    np.testing.assert_array_equal(N_spec_10, N_spec[:, ::20])
+    np.testing.assert_array_equal(time_axis_10, time_axis[::20])
+
+    stream = LoudnessZwtvStream(fs, time_resolution=0.01)
+    outputs = [stream.push(chunk) for chunk in np.array_split(sig, 7)]
+    outputs.append(stream.flush())
+    N_stream = np.concatenate([out[0] for out in outputs])
+    N_spec_stream = np.concatenate([out[1] for out in outputs], axis=1)
+    np.testing.assert_allclose(N_stream, N_10, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(N_spec_stream, N_spec_10, rtol=1e-10, atol=1e-12)
+
+    with pytest.raises(ValueError):
+        loudness_zwtv(sig, fs, time_resolution=0.0007)
+
+
+@pytest.mark.loudness_zwtv  # to skip or run only loudness zwicker time-varying tests
+def test_loudness_zwtv_workers():
+    """Test function for the parallel filtering of the bands of loudness_zwtv"""
+    sig, fs = load(
+        "tests/input/Test signal 10 (tone pulse 1 kHz 10 ms 70 dB).wav",
+        wav_calib=2 * 2**0.5,
+    )
+    for multirate in [False, True]:
+        N, N_spec, _, _ = loudness_zwtv(sig, fs, multirate=multirate)
+        N_workers, N_spec_workers, _, _ = loudness_zwtv(
+            sig, fs, multirate=multirate, workers=4
+        )
+        np.testing.assert_array_equal(N_workers, N)
+        np.testing.assert_array_equal(N_spec_workers, N_spec)
+
+
+@pytest.mark.loudness_zwtv  # to skip or run only loudness zwicker time-varying tests
+def test_temporal_weighting():
+    """Test function for the temporal weighting of loudness_zwtv
+
+    The recursion at 2 kHz is compared to the low-pass filtering of the
+    24 times interpolated loudness, and applied to several channels at once
+    and chunk by chunk.
+    """
+    loudness = np.concatenate(
+        (np.zeros(50), np.linspace(0, 20, 100), 20 * np.ones(200))
+    )
+    loudness = loudness + np.random.default_rng(0).uniform(0, 1, len(loudness))
+    np.testing.assert_allclose(
+        _temporal_weighting(loudness),
+        _temporal_weighting(loudness, interpolate=True),
+        rtol=1e-10,
+        atol=1e-12,
+    )
+
+    loudness = np.stack((loudness, 0.5 * loudness[::-1]))
+    filt_loudness = _temporal_weighting(loudness)
+    for i in range(2):
+        np.testing.assert_array_equal(
+            filt_loudness[i], _temporal_weighting(loudness[i])
+        )
+    state = {"lp_1": {"zi": np.zeros((2, 1))}, "lp_2": {"zi": np.zeros((2, 1))}}
+    filt_chunks = [
+        _temporal_weighting(loudness[:, :200], state, loudness[:, 200]),
+        _temporal_weighting(loudness[:, 200:], state),
+    ]
+    np.testing.assert_allclose(
+        np.concatenate(filt_chunks, axis=1), filt_loudness, rtol=1e-12, atol=1e-12
+    )
+
+
+@pytest.mark.loudness_zwtv  # to skip or run only loudness zwicker time-varying tests
+def test_loudness_zwtv_multichannel():
+    """Test function for the multichannel use of loudness_zwtv
+
+    The outputs for a (n_samples, n_channels) signal are compared to the
+    ones of each channel processed separately.
+    """
+    sig, fs = load(
+        "tests/input/Test signal 10 (tone pulse 1 kHz 10 ms 70 dB).wav",
+        wav_calib=2 * 2**0.5,
+    )
+    signals = np.stack((sig, 0.5 * sig, sig[::-1]), axis=1)
+    N, N_spec, bark_axis, time_axis = loudness_zwtv(signals, fs)
+
+    assert N.shape == (3, len(time_axis))
+    assert N_spec.shape == (3, len(bark_axis), len(time_axis))
+    for i in range(3):
+        N_channel, N_spec_channel, _, _ = loudness_zwtv(signals[:, i], fs)
+        np.testing.assert_allclose(N[i], N_channel, rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(
+            N_spec[i], N_spec_channel, rtol=1e-12, atol=1e-12
+        )
+
+
 # test de la fonction
 if __name__ == "__main__":
     test_loudness_zwtv()
+    test_loudness_zwtv_stream()
+    test_loudness_zwtv_multirate()
+    test_loudness_zwtv_multichannel()
+    test_loudness_zwtv_time_resolution()
+    test_temporal_weighting()
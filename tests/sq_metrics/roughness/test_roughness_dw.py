@@ -13,6 +13,14 @@ from scipy.fft import fft
 from mosqito.sq_metrics import roughness_dw, roughness_dw_freq
 from mosqito.utils.am_sine_generator import am_sine_generator
 from mosqito.sound_level_meter.comp_spectrum import comp_spectrum
+from mosqito.sq_metrics.roughness.roughness_dw._H_weighting import (
+    _H_weighting,
+    H_CHANNELS,
+)
+from mosqito.sq_metrics.roughness.roughness_dw._roughness_dw_main_calc import (
+    _temporal_excitation,
+    _envelopes,
+)
 
 
 @pytest.mark.roughness_dw  # to skip or run only Daniel and Weber roughness tests
@@ -98,6 +106,100 @@ def test_roughness_dw_freq():
     assert tst
 
 
+@pytest.mark.roughness_dw  # to skip or run only Daniel and Weber roughness tests
+def test_roughness_dw_segments():
+    """Test function for the roughness calculation by groups of segments
+
+    The roughness of each 200 ms segment, computed by groups of segments
+    with worker threads, must be identical to the one of the segment
+    computed alone.
+
+    Parameters
+    ----------
+    None
+
+    Outputs
+    -------
+    None
+    """
+    fs = 44100
+    time = np.arange(int(1.2 * fs)) / fs
+    xmod = np.sin(2 * np.pi * 70 * time)
+    stimulus, _ = am_sine_generator(xmod, fs=fs, fc=1000, spl_level=60)
+    stimulus += 0.01 * np.random.default_rng(0).standard_normal(len(time))
+
+    R, R_spec, _, time_axis = roughness_dw(stimulus, fs, overlap=0.5)
+    R_groups, R_spec_groups, _, _ = roughness_dw(
+        stimulus, fs, overlap=0.5, max_memory=50e6, workers=2
+    )
+    assert np.array_equal(R_groups, R)
+    assert np.array_equal(R_spec_groups, R_spec)
+
+    nperseg = int(0.2 * fs)
+    for i in [0, len(time_axis) - 1]:
+        start = i * nperseg // 2
+        R_segment, R_spec_segment, _, _ = roughness_dw(
+            stimulus[start : start + nperseg], fs
+        )
+        assert np.allclose(R_segment, R[i], rtol=1e-12, atol=0)
+        assert np.allclose(R_spec_segment[:, 0], R_spec[:, i], rtol=1e-12, atol=1e-15)
+
+
+@pytest.mark.roughness_dw  # to skip or run only Daniel and Weber roughness tests
+def test_roughness_dw_rfft():
+    """Test function for the real FFT and direct sum formulations of the
+    excitation and envelope stages
+
+    The band-pass filtered envelopes of random excitations computed with
+    real FFTs of the half spectra, or with a direct sum over the audible
+    components, must be equal to the ones computed with complex FFTs on the
+    full spectra.
+
+    Parameters
+    ----------
+    None
+
+    Outputs
+    -------
+    None
+    """
+    for fs in [44100, 48000]:
+        n = int(0.2 * fs)
+        hWeight = _H_weighting(n, fs)
+        # The weighting functions are computed once per (n, fs) pair
+        assert _H_weighting(n, fs) is hWeight
+        # Three segments with 0, 5 and 40 audible components
+        rng = np.random.default_rng(0)
+        audible_seg = np.repeat([1, 2], [5, 40])
+        audible_index = np.concatenate(
+            [np.sort(rng.choice(n // 2, size, replace=False)) for size in [5, 40]]
+        )
+        components = rng.standard_normal(45) + 1j * rng.standard_normal(45)
+        ampl = rng.random((45, 47))
+
+        # Complex FFTs of the full spectra, whose second half is zero
+        exc_full = np.zeros((3, 47, n), dtype=complex)
+        exc_full[audible_seg, :, audible_index] = ampl * components[:, None]
+        hWeight_full = np.zeros((47, n))
+        for H, channels in zip(hWeight, H_CHANNELS):
+            hWeight_full[channels, : n // 2 + 1] = H
+        temporal_excitation = np.abs(n * np.real(np.fft.ifft(exc_full)))
+        h0_ref = np.mean(temporal_excitation, axis=-1)
+        envelope_spec = np.fft.fft(temporal_excitation - h0_ref[:, :, None])
+        hBP_ref = 2 * np.real(np.fft.ifft(envelope_spec * hWeight_full))
+
+        # Inverse real FFTs, direct sums, and choice by the cost model
+        for max_direct in [0, 40, None]:
+            temporal_excitation = _temporal_excitation(
+                ampl, components, audible_seg, audible_index, 3, n, max_direct
+            )
+            h0, hBP = _envelopes(temporal_excitation, hWeight)
+            assert np.allclose(h0, h0_ref, rtol=1e-12, atol=0)
+            assert np.allclose(
+                hBP, hBP_ref, rtol=0, atol=1e-12 * np.max(np.abs(hBP_ref))
+            )
+
+
 def check_compliance(R):
     """Check the compliance of roughness calc. to Daniel and Weber article
     "Psychoacoustical roughness: implementation of an optimized model", 1997.
@@ -129,3 +231,5 @@ def check_compliance(R):
 if __name__ == "__main__":
     test_roughness_dw()
     test_roughness_dw_freq()
+    test_roughness_dw_segments()
+    test_roughness_dw_rfft()
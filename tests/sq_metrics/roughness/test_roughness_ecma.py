@@ -8,10 +8,46 @@ except ImportError:
 
 import numpy as np
 from scipy.fft import fft
+from scipy.signal import hilbert, decimate
 
 # Local application imports
-from mosqito.sq_metrics import roughness_ecma, roughness_ecma
+from mosqito.sq_metrics import roughness_ecma, RoughnessEcmaStream
 from mosqito.utils.am_sine_generator import am_sine_generator
+from mosqito.sq_metrics.loudness.loudness_ecma._preprocessing import _preprocessing
+from mosqito.sq_metrics.loudness.loudness_ecma._band_pass_signals import (
+    _band_pass_signals,
+)
+from mosqito.sq_metrics.loudness.loudness_ecma._ecma_time_segmentation import (
+    _ecma_time_segmentation,
+)
+from mosqito.sq_metrics.roughness.roughness_ecma._band_envelopes import (
+    _band_envelopes,
+)
+from mosqito.sq_metrics.roughness.roughness_ecma._peak_picking import (
+    _peak_picking,
+    _peak_picking_batch,
+)
+from mosqito.sq_metrics.roughness.roughness_ecma._weighting import (
+    _f_max,
+    _r_max,
+    _Q2_high,
+    _Q2_low,
+    _high_mod_rate_weighting,
+    _high_mod_rate_weighting_batch,
+    _low_mod_rate_weighting,
+    _low_mod_rate_weighting_batch,
+)
+from mosqito.sq_metrics.roughness.roughness_ecma._estimate_fund_mod_rate import (
+    _estimate_fund_mod_rate,
+    _estimate_fund_mod_rate_batch,
+)
+from mosqito.sq_metrics.roughness.roughness_ecma._running_percentile import (
+    _running_percentile,
+    _running_percentile_state,
+)
+from mosqito.sq_metrics.loudness.loudness_ecma._auditory_filters_centre_freq import (
+    _auditory_filters_centre_freq,
+)
 
 
 @pytest.mark.roughness_ecma  # to skip or run only ECMA 418-2 roughness tests
@@ -48,6 +84,237 @@ def test_roughness_ecma():
 
     assert tst
 
+@pytest.mark.roughness_ecma  # to skip or run only ECMA 418-2 roughness tests
+def test_band_envelopes():
+    """Test function for the envelopes computed on the continuous band
+    signals, compared to the block-wise envelopes of ECMA-418-2 away from
+    the block boundaries"""
+
+    time = np.linspace(0, 1, 48000)
+    xmod = np.sin(2 * np.pi * 70 * time)
+    stimulus, _ = am_sine_generator(xmod, fs=48000, fc=1000, spl_level=60)
+    signal, n_new = _preprocessing(stimulus, 16384, 4096)
+    bandpass_signals = _band_pass_signals(signal, 16384, 4096)
+    n_blocks = int(n_new // 4096)
+
+    envelopes = _band_envelopes(bandpass_signals, 16384, 4096, n_blocks)
+
+    block_array, _ = _ecma_time_segmentation(bandpass_signals, 16384, 4096, n_new)
+    reference = abs(hilbert(np.asarray(block_array)))
+    reference = decimate(decimate(reference, 8, axis=2), 4, axis=2)
+    reference = np.transpose(reference, (1, 0, 2))
+
+    assert envelopes.shape == reference.shape
+    np.testing.assert_allclose(
+        envelopes[:, :, 64:-64],
+        reference[:, :, 64:-64],
+        rtol=0,
+        atol=1e-3 * reference.max(),
+    )
+
+
+@pytest.mark.roughness_ecma  # to skip or run only ECMA 418-2 roughness tests
+def test_roughness_ecma_chunks():
+    """Test function for the roughness computed by groups of blocks, which
+    must be identical to the roughness computed on all the blocks at once"""
+
+    time = np.linspace(0, 5, 5 * 48000)
+    xmod = np.sin(2 * np.pi * 70 * time)
+    stimulus, _ = am_sine_generator(xmod, fs=48000, fc=1000, spl_level=60)
+
+    R, R_time, R_spec, _, _ = roughness_ecma(stimulus, fs=48000)
+    R_c, R_time_c, R_spec_c, _, _ = roughness_ecma(
+        stimulus, fs=48000, chunk_blocks=16
+    )
+
+    assert R_c == R
+    np.testing.assert_array_equal(R_time_c, R_time)
+    np.testing.assert_array_equal(R_spec_c, R_spec)
+
+
+@pytest.mark.roughness_ecma  # to skip or run only ECMA 418-2 roughness tests
+def test_roughness_ecma_float32():
+    """Test function for the roughness computed in single precision, which
+    must be close to the roughness computed in double precision"""
+
+    time = np.linspace(0, 1, 48000)
+    xmod = np.sin(2 * np.pi * 70 * time)
+    stimulus, _ = am_sine_generator(xmod, fs=48000, fc=1000, spl_level=60)
+
+    R, R_time, R_spec, _, _ = roughness_ecma(stimulus, fs=48000)
+    R_32, R_time_32, R_spec_32, _, _ = roughness_ecma(
+        stimulus, fs=48000, dtype="float32"
+    )
+
+    np.testing.assert_allclose(R_32, R, rtol=1e-3)
+    np.testing.assert_allclose(R_time_32, R_time, rtol=0, atol=1e-3 * R_time.max())
+    np.testing.assert_allclose(R_spec_32, R_spec, rtol=0, atol=1e-3 * R_spec.max())
+
+    with pytest.raises(ValueError):
+        roughness_ecma(stimulus, fs=48000, dtype="int16")
+
+
+@pytest.mark.roughness_ecma  # to skip or run only ECMA 418-2 roughness tests
+def test_roughness_ecma_bands():
+    """Test function for the roughness of a subset of the critical bands,
+    which must give the specific roughness of these bands"""
+
+    time = np.linspace(0, 1, 48000)
+    xmod = np.sin(2 * np.pi * 70 * time)
+    stimulus, _ = am_sine_generator(xmod, fs=48000, fc=1000, spl_level=60)
+
+    _, _, R_spec, bark_axis, _ = roughness_ecma(stimulus, fs=48000)
+    R_b, R_time_b, R_spec_b, bark_axis_b, _ = roughness_ecma(
+        stimulus, fs=48000, bark_range=(3, 12)
+    )
+
+    bands = np.arange(5, 24)
+    np.testing.assert_array_equal(bark_axis_b, bark_axis[bands])
+    np.testing.assert_array_equal(R_spec_b, R_spec[bands])
+    assert R_b == np.percentile(R_time_b, 90)
+
+
+@pytest.mark.roughness_ecma  # to skip or run only ECMA 418-2 roughness tests
+def test_roughness_ecma_multirate():
+    """Test function for the roughness computed with the multirate filter
+    bank, which must be close to the roughness computed at 48 kHz"""
+
+    time = np.linspace(0, 1, 48000)
+    xmod = np.sin(2 * np.pi * 70 * time)
+    stimulus, _ = am_sine_generator(xmod, fs=48000, fc=250, spl_level=60)
+
+    R, R_time, R_spec, _, _ = roughness_ecma(stimulus, fs=48000)
+    R_m, R_time_m, R_spec_m, _, _ = roughness_ecma(
+        stimulus, fs=48000, multirate=True
+    )
+
+    np.testing.assert_allclose(R_m, R, rtol=2e-3)
+    np.testing.assert_allclose(R_time_m, R_time, rtol=0, atol=2e-3 * R_time.max())
+    np.testing.assert_allclose(R_spec_m, R_spec, rtol=0, atol=2e-3 * R_spec.max())
+
+
+@pytest.mark.roughness_ecma  # to skip or run only ECMA 418-2 roughness tests
+def test_roughness_ecma_stream():
+    """Test function for the class RoughnessEcmaStream
+
+    The signal is pushed by chunks of various sizes, the concatenated
+    outputs must not depend on the chunks and be close to the ones of
+    roughness_ecma (block-wise envelopes).
+    """
+    time = np.linspace(0, 3, 3 * 48000)
+    xmod = np.sin(2 * np.pi * 70 * time)
+    stimulus, _ = am_sine_generator(xmod, fs=48000, fc=1000, spl_level=60)
+    stimulus[48000:96000] *= 0.3
+    _, R_time, _, bark_axis, time_axis = roughness_ecma(stimulus, fs=48000)
+
+    stream = RoughnessEcmaStream(48000)
+    for chunks in [
+        np.split(stimulus, [1, 5, 300, 5000, 20000, 20001, 100000]),
+        np.array_split(stimulus, 37),
+    ]:
+        outputs = [stream.push(chunk) for chunk in chunks]
+        outputs.append(stream.flush())
+        R_time_stream = np.concatenate([out[0] for out in outputs])
+        R_spec_stream = np.hstack([out[1] for out in outputs])
+        time_stream = np.concatenate([out[2] for out in outputs])
+
+        np.testing.assert_array_equal(time_stream, time_axis)
+        np.testing.assert_allclose(
+            R_time_stream, R_time, rtol=0, atol=1e-3 * R_time.max()
+        )
+        np.testing.assert_allclose(
+            0.5 * R_spec_stream.sum(axis=0), R_time_stream, rtol=1e-12
+        )
+        # Running estimate of the 90th percentile
+        assert abs(stream.R - np.percentile(R_time_stream, 90)) < 1e-3
+    np.testing.assert_array_equal(stream.bark_axis, bark_axis)
+
+
+@pytest.mark.roughness_ecma  # to skip or run only ECMA 418-2 roughness tests
+def test_running_percentile():
+    """Test function for the running percentile estimate, exact for the
+    first values and close to the percentile of all the values"""
+
+    rng = np.random.default_rng(0)
+    values = rng.standard_normal(20000)
+    state = _running_percentile_state(90)
+    assert _running_percentile(values[:0], state) is None
+    # Exact percentile of the first 50 values, pushed one by one
+    for i in range(50):
+        estimate = _running_percentile(values[i : i + 1], state)
+        assert estimate == np.percentile(values[: i + 1], 90)
+    for chunk in np.array_split(values[50:], 10):
+        estimate = _running_percentile(chunk, state)
+    assert abs(estimate - np.percentile(values, 90)) < 0.02
+
+    # Uniform values, with a small and a large number of values
+    values = rng.random(5000)
+    for n, tol in [(8, 0), (40, 0), (500, 0.03), (5000, 0.01)]:
+        state = _running_percentile_state(90)
+        estimate = _running_percentile(values[:n], state)
+        assert abs(estimate - np.percentile(values[:n], 90)) <= tol
+
+    with pytest.raises(ValueError):
+        _running_percentile_state(90, n_exact=4)
+
+
+@pytest.mark.roughness_ecma  # to skip or run only ECMA 418-2 roughness tests
+def test_spectral_weighting_batch():
+    """Test function for the spectral weighting applied to all the spectra
+    at once, which must give the amplitudes of the per-spectrum functions"""
+
+    rng = np.random.default_rng(0)
+    # Random spectra with up to 100 maxima, smooth spectra and flat maxima
+    Phi_E = np.concatenate(
+        (
+            rng.random((2, 53, 256)) ** 4,
+            np.abs(np.cumsum(rng.standard_normal((2, 53, 256)), axis=2)),
+            np.repeat(rng.random((2, 53, 128)) ** 4, 2, axis=2),
+        )
+    )
+    center_freq = _auditory_filters_centre_freq()
+    fmax = _f_max(center_freq)
+    rmax = _r_max(center_freq)
+    q2_high = _Q2_high(center_freq)
+    q2_low = _Q2_low(center_freq)
+
+    # Batch computation
+    f_p, Ai, N_peak = _peak_picking_batch(Phi_E)
+    band = np.broadcast_to(np.arange(53), N_peak.shape)
+    peak = np.arange(10) < N_peak[..., np.newaxis]
+    peak_band = np.broadcast_to(band[..., np.newaxis], Ai.shape)[peak]
+    Ai_tilde = np.zeros(Ai.shape)
+    Ai_tilde[peak] = _high_mod_rate_weighting_batch(
+        f_p[peak], Ai[peak], fmax[peak_band], rmax[peak_band], q2_high[peak_band]
+    )
+    mod_rate, A_hat, N_hat = _estimate_fund_mod_rate_batch(
+        f_p.reshape(-1, 10), Ai_tilde.reshape(-1, 10), N_peak.ravel()
+    )
+    amplitude = _low_mod_rate_weighting_batch(
+        mod_rate, A_hat, N_hat, fmax[band.ravel()], q2_low[band.ravel()]
+    )
+
+    # Computation spectrum by spectrum
+    for i, (l, z) in enumerate(np.ndindex(N_peak.shape)):
+        f_p_lz, Ai_lz = _peak_picking(Phi_E[l, z])
+        Ai_tilde_lz = np.array(
+            [
+                _high_mod_rate_weighting(f, A, fmax[z], rmax[z], q2_high[z])
+                for f, A in zip(f_p_lz, Ai_lz)
+            ]
+        )
+        mod_rate_lz, A_hat_lz = _estimate_fund_mod_rate(f_p_lz, Ai_tilde_lz)
+
+        assert N_peak[l, z] == len(f_p_lz)
+        np.testing.assert_array_equal(f_p[l, z, : N_peak[l, z]], f_p_lz)
+        np.testing.assert_array_equal(Ai_tilde[l, z, : N_peak[l, z]], Ai_tilde_lz)
+        assert mod_rate[i] == mod_rate_lz
+        np.testing.assert_array_equal(A_hat[i, : N_hat[i]], A_hat_lz)
+        assert amplitude[i] == _low_mod_rate_weighting(
+            mod_rate_lz, A_hat_lz, fmax[z], q2_low[z]
+        )
+
+
 def check_compliance(R):
     """Check the compliance of roughness calc. to Daniel and Weber article
     "Psychoacoustical roughness: implementation of an optimized model", 1997.
@@ -78,3 +345,7 @@ def check_compliance(R):
 # test de la fonction
 if __name__ == "__main__":
     test_roughness_ecma()
+    test_band_envelopes()
+    test_roughness_ecma_chunks()
+    test_roughness_ecma_stream()
+    test_spectral_weighting_batch()
@@ -37,7 +37,7 @@ def test_pr_ecma_st():
 
     # Compute tone-to-noise ratio
     t_pr, pr, prom, freq = pr_ecma_st(audio, fs, prominence=True)
-    np.testing.assert_almost_equal(t_pr, 32.20980078537321)
+    np.testing.assert_almost_equal(t_pr, 32.2095936429139)
     np.testing.assert_almost_equal(freq.astype(np.int32), [442, 1768])
     assert np.count_nonzero(prom == True) == 2
 
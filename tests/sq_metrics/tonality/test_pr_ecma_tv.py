@@ -37,7 +37,7 @@ def test_pr_ecma_perseg():
 
     # Compute tone-to-noise ratio
     t_pr, pr, prom, freq, time = pr_ecma_perseg(audio, fs, prominence=True)
-    np.testing.assert_almost_equal(max(t_pr), 34.02082433185258)
+    np.testing.assert_almost_equal(max(t_pr), 34.02037370469734)
     assert pr[np.argmin(np.abs(freq - 442)), :].all() != np.nan
     assert pr[np.argmin(np.abs(freq - 1768)), 2:3].all() != np.nan
     assert np.count_nonzero(prom == True) == 8
@@ -41,7 +41,7 @@ def test_tnr_ecma_st():
     audio, fs = load(signal["data_file"], wav_calib=0.01)
     # Compute tone-to-noise ratio
     t_tnr, tnr, prom, freq = tnr_ecma_st(audio, fs, prominence=True)
-    np.testing.assert_almost_equal(t_tnr, 32.7142766)
+    np.testing.assert_almost_equal(t_tnr, 32.7142729)
     np.testing.assert_almost_equal(freq.astype(np.int32), [442, 1768])
     assert np.count_nonzero(prom == True) == 2
 
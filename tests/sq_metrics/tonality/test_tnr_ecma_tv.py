@@ -40,7 +40,7 @@ def test_tnr_ecma_perseg():
 
     # Compute tone-to-noise ratio
     t_tnr, tnr, prom, freq, time = tnr_ecma_perseg(audio, fs, prominence=True)
-    np.testing.assert_almost_equal(max(t_tnr), 34.710964273840155)
+    np.testing.assert_almost_equal(max(t_tnr), 34.711163918869886)
     assert tnr[np.argmin(np.abs(freq - 442)), :].all() != np.nan
     assert tnr[np.argmin(np.abs(freq - 1768)), 2:3].all() != np.nan
     assert np.count_nonzero(prom == True) == 8
@@ -0,0 +1,53 @@
+# Optional package import
+try:
+    import pytest
+except ImportError:
+    raise RuntimeError("In order to perform the tests you need the 'pytest' package.")
+
+import numpy as np
+from scipy.signal import resample_poly
+from mosqito.utils import sine_wave_generator
+from mosqito.utils import resample, ResampleStream
+
+
+@pytest.mark.utils  # to skip or run only tests on utils module
+def test_resample():
+
+    fs = 44100
+    signal, _ = sine_wave_generator(
+        fs=fs,
+        d=1,
+        freq=1000,
+        spl_level=60,
+    )
+
+    signal_48k = resample(signal, fs, 48000)
+    np.testing.assert_array_equal(signal_48k, resample_poly(signal, 160, 147))
+    np.testing.assert_array_equal(resample(signal, fs, fs), signal)
+
+    # Chunk-wise resampling, single and multichannel
+    stream = ResampleStream(fs, 48000)
+    chunks = [stream.push(chunk) for chunk in np.array_split(signal, 7)]
+    chunks.append(stream.flush())
+    np.testing.assert_allclose(np.concatenate(chunks), signal_48k, atol=1e-12)
+
+    signals = np.stack((signal, 0.5 * signal), axis=1)
+    chunks = [stream.push(chunk) for chunk in np.array_split(signals, 3)]
+    chunks.append(stream.flush())
+    np.testing.assert_allclose(
+        np.concatenate(chunks), resample(signals, fs, 48000), atol=1e-12
+    )
+
+    # Flush without pushed samples, with the channels of the last chunk
+    assert stream.flush().shape == (0, 2)
+    assert stream.push(signals[:0]).shape == (0, 2)
+    assert stream.flush().shape == (0, 2)
+    stream = ResampleStream(48000, 48000)
+    chunks = [stream.push(chunk) for chunk in np.array_split(signals, 3)]
+    chunks.append(stream.flush())
+    np.testing.assert_array_equal(np.concatenate(chunks), signals)
+
+
+# test de la fonction
+if __name__ == "__main__":
+    test_resample()
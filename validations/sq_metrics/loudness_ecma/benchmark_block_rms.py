@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Standard imports
+import time
+import tracemalloc
+import numpy as np
+
+# Local application imports
+from mosqito.sq_metrics.loudness.loudness_ecma._ecma_time_segmentation import (
+    _ecma_time_segmentation,
+    _ecma_block_rms,
+)
+
+
+def _segmented_rms(signals, sb, sh, n_new):
+    """Block root-mean-square values computed from the block tensor"""
+    blocks, _ = _ecma_time_segmentation(signals, sb, sh, n_new)
+    blocks = np.clip(np.asarray(blocks), 0, None)
+    return np.sqrt(2 * np.mean(blocks**2, axis=2))
+
+
+def benchmark_block_rms(durations=[1, 5, 20], sb=2048, sh=1024):
+    """Computation time and memory peak of the ECMA-418-2 block
+    root-mean-square values, with and without the block tensor
+
+    The 53 band signals are white noises, zero-padded as in the
+    preprocessing of loudness_ecma.
+
+    Parameters
+    ----------
+    durations: list
+        Signal durations [s]
+    sb: int
+        Block size
+    sh: int
+        Hop size
+    """
+    fs = 48000
+    rng = np.random.default_rng(0)
+    methods = {"block tensor": _segmented_rms, "block sums": _ecma_block_rms}
+
+    print("duration [s] | method       | time [s] | memory peak [MB]")
+    for duration in durations:
+        n_samples = int(duration * fs)
+        n_new = sh * (int(np.ceil((n_samples + sh + sb) / sh)) - 1)
+        signals = [rng.standard_normal(sb + n_new) for _ in range(53)]
+        for name, method in methods.items():
+            start = time.time()
+            method(signals, sb, sh, n_new)
+            duration_calc = time.time() - start
+            tracemalloc.start()
+            method(signals, sb, sh, n_new)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                "{:12.0f} | {:12s} | {:8.3f} | {:16.1f}".format(
+                    duration, name, duration_calc, peak / 1e6
+                )
+            )
+
+
+if __name__ == "__main__":
+    benchmark_block_rms()
@@ -7,7 +7,7 @@ except ImportError:
     )
 
 
-from scipy.signal import gammatone as scipy_gamma, freqz
+from scipy.signal import gammatone as scipy_gamma, freqz, sosfreqz
 import numpy as np
 
 from mosqito.sq_metrics.loudness.loudness_ecma._gammatone import (
@@ -16,6 +16,9 @@ from mosqito.sq_metrics.loudness.loudness_ecma._gammatone import (
 from mosqito.sq_metrics.loudness.loudness_ecma._auditory_filters_centre_freq import (
     _auditory_filters_centre_freq,
 )
+from mosqito.sq_metrics.loudness.loudness_ecma._band_pass_signals import (
+    _gammatone_bank,
+)
 
 # Sampling frequency
 fs = 48000
@@ -75,3 +78,26 @@ plt.savefig(
     "./validations/sq_metrics/loudness_ecma/output/" + "comparison_auditory_filter.png",
     format="png",
 )
+plt.close()
+
+# Compare the second-order sections of the filter bank with the real part
+# of the complex filters of eq. 16 and 17, for all the bands
+sos_bank = _gammatone_bank()
+for band_number, freq in enumerate(centre_freq):
+    b, a = mosqito_gamma(freq)
+    # Frequency response of 2 * Re(h), h being the impulse response of b / a
+    w, h = freqz(b, a, worN=round(fs / 2), fs=fs, whole=True)
+    h_real = h + np.conj(np.roll(h[::-1], 1))
+    w, h_sos = sosfreqz(sos_bank[band_number], worN=round(fs / 2), fs=fs, whole=True)
+    deviation = np.abs(h_sos - h_real) / np.abs(h_real).max()
+    n_half = len(w) // 2
+    plt.semilogx(w[1:n_half], 20.0 * np.log10(deviation[1:n_half] + 1e-20))
+
+plt.title("Deviation of the second-order sections from eq. 16 and 17")
+plt.xlabel("Frequency [Hz]")
+plt.ylabel("Relative deviation [dB]")
+plt.grid(which="both", axis="both")
+plt.savefig(
+    "./validations/sq_metrics/loudness_ecma/output/" + "validation_gammatone_sos.png",
+    format="png",
+)
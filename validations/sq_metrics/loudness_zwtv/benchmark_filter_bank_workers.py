@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# Standard imports
+import os
+import time
+import numpy as np
+
+# Local application imports
+from mosqito.utils import load
+from mosqito.sound_level_meter import noct_spectrum
+from mosqito.sq_metrics.loudness.loudness_zwtv._third_octave_levels import (
+    _third_octave_levels,
+)
+from mosqito.sq_metrics.loudness.loudness_ecma._band_pass_signals import (
+    _band_pass_signals,
+)
+
+
+def benchmark_filter_bank_workers(duration=60, workers=None):
+    """Computation time of the filter banks versus the number of threads
+
+    The technical signal "hairdryer" from ISO 532-1 annex B5 is repeated
+    to reach the required duration.
+    It gives the speed-up figures of the experimental workers options,
+    which are only meaningful on a multi-core machine.
+
+    Parameters
+    ----------
+    duration: float
+        Signal duration [s]
+    workers: list
+        Numbers of threads, default is 1, 2, 4, ... up to the number of
+        CPU cores
+    """
+    if workers is None:
+        workers = [1]
+        while workers[-1] * 2 <= os.cpu_count():
+            workers.append(workers[-1] * 2)
+    sig, fs = load(
+        "input/ISO_532-1/Annex B.5/Test signal 16 (hairdryer).wav",
+        wav_calib=2 * 2**0.5,
+    )
+    sig = np.tile(sig, int(np.ceil(duration * fs / len(sig))))[: int(duration * fs)]
+
+    filter_banks = {
+        "_third_octave_levels": lambda n: _third_octave_levels(sig, fs, workers=n),
+        "_band_pass_signals": lambda n: _band_pass_signals(sig, 2048, 1024, n),
+        "noct_spectrum": lambda n: noct_spectrum(sig, fs, 24, 12600, workers=n),
+    }
+
+    print("{:d} CPU cores, {:d} s signal".format(os.cpu_count(), duration))
+    print("filter bank          | workers | time [s] | speed-up")
+    for name, filter_bank in filter_banks.items():
+        for n in workers:
+            start = time.time()
+            filter_bank(n)
+            elapsed = time.time() - start
+            if n == workers[0]:
+                reference = elapsed
+            print(
+                "{:20s} | {:7d} | {:8.2f} | {:8.2f}".format(
+                    name, n, elapsed, reference / elapsed
+                )
+            )
+
+
+if __name__ == "__main__":
+    benchmark_filter_bank_workers()
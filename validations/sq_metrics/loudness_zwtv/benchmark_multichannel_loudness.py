@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+# Standard imports
+import time
+import numpy as np
+
+# Local application imports
+from mosqito.utils import load
+from mosqito.sq_metrics import loudness_zwtv, loudness_zwst, loudness_ecma
+
+
+def benchmark_multichannel_loudness(n_channels=[1, 2, 4], duration=2):
+    """Computation time per channel of the multichannel loudness functions
+
+    Each loudness function is called once with a (n_samples, n_channels)
+    signal and compared to a loop over the channels. The channels are
+    built from the technical signals of ISO 532-1 annex B5.
+
+    Parameters
+    ----------
+    n_channels: list
+        Numbers of channels
+    duration: float
+        Signal duration [s]
+    """
+    files = [
+        "input/ISO_532-1/Annex B.5/Test signal 16 (hairdryer).wav",
+        "input/ISO_532-1/Annex B.5/Test signal 18 (hammer).wav",
+        "input/ISO_532-1/Annex B.5/Test signal 22 (ratchet wheel (large)).wav",
+    ]
+    signals = []
+    for file in files:
+        sig, fs = load(file, wav_calib=2 * 2**0.5)
+        n_rep = int(np.ceil(duration * fs / len(sig)))
+        signals.append(np.tile(sig, n_rep)[: int(duration * fs)])
+
+    metrics = {
+        "loudness_zwtv": lambda x: loudness_zwtv(x, fs),
+        "loudness_zwst": lambda x: loudness_zwst(x, fs),
+        "loudness_ecma": lambda x: loudness_ecma(x, fs),
+    }
+
+    print("metric        | channels | multichannel [s/ch] | loop [s/ch]")
+    for name, metric in metrics.items():
+        for n_ch in n_channels:
+            sig = np.stack(
+                [signals[i % len(signals)] for i in range(n_ch)], axis=1
+            )
+            start = time.time()
+            metric(sig)
+            t_multi = time.time() - start
+            start = time.time()
+            for i in range(n_ch):
+                metric(sig[:, i])
+            t_loop = time.time() - start
+            print(
+                "{:13s} | {:8d} | {:19.3f} | {:11.3f}".format(
+                    name, n_ch, t_multi / n_ch, t_loop / n_ch
+                )
+            )
+
+
+if __name__ == "__main__":
+    benchmark_multichannel_loudness()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+# Standard imports
+import time
+import tracemalloc
+import numpy as np
+
+# Local application imports
+from mosqito.utils import load
+from mosqito.sq_metrics.loudness.loudness_zwst._main_loudness import _main_loudness
+from mosqito.sq_metrics.loudness.loudness_zwtv._third_octave_levels import (
+    _third_octave_levels,
+)
+from mosqito.sq_metrics.loudness.loudness_zwtv._nonlinear_decay import _nl_loudness
+
+
+def benchmark_nl_loudness(durations=[1, 10, 30]):
+    """Computation time and peak memory of the nonlinear temporal decay
+
+    The core loudness of a technical signal from ISO 532-1 annex B5 is
+    repeated to reach the required durations.
+
+    Parameters
+    ----------
+    durations: list
+        Signal durations [s]
+    """
+    sig, fs = load(
+        "input/ISO_532-1/Annex B.5/Test signal 16 (hairdryer).wav",
+        wav_calib=2 * 2**0.5,
+    )
+    spec_third, _, _ = _third_octave_levels(sig, fs)
+    core_loudness = _main_loudness(spec_third, "free")
+
+    print("duration [s] | time [s] | peak memory [MB]")
+    for duration in durations:
+        n_time = int(duration * 2000)
+        n_rep = int(np.ceil(n_time / core_loudness.shape[1]))
+        core = np.tile(core_loudness, n_rep)[:, :n_time]
+
+        # Computation time and peak memory are measured separately since
+        # tracemalloc slows down the allocation of Python objects
+        start = time.time()
+        _nl_loudness(core)
+        end = time.time()
+        tracemalloc.start()
+        _nl_loudness(core)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            "{:12d} | {:8.2f} | {:16.1f}".format(duration, end - start, peak / 1e6)
+        )
+
+
+if __name__ == "__main__":
+    benchmark_nl_loudness()
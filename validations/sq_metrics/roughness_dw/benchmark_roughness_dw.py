@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+# Standard imports
+import time
+import numpy as np
+
+# Local application imports
+from mosqito.sq_metrics import roughness_dw
+from mosqito.utils.am_sine_generator import am_sine_generator
+
+
+def benchmark_roughness_dw(fs_vector=[44100, 48000], duration=2, n_runs=3):
+    """Computation time of roughness_dw for an amplitude-modulated tone and a
+    white noise
+
+    The roughness is computed on 200 ms segments without overlap, and each
+    computation time is the best of n_runs runs. The number of audible
+    spectral components, and thus the size of the excitation patterns, is
+    small for the tone and large for the noise.
+
+    With the array-based main calculation (excitation patterns of the 47
+    channels built at once and transformed with batched FFTs), the
+    computation time per segment of the white noise decreases from 0.69 s
+    to 0.056 s at 44.1 kHz and from 0.74 s to 0.059 s at 48 kHz, and the one
+    of the tone from 0.044 s to 0.039 s (44.1 kHz) and from 0.047 s to
+    0.041 s (48 kHz). The roughness values are unchanged (relative
+    deviations below 1e-14 on the tones of validation_roughness_danielweber).
+    With the real FFTs of the half spectra, the computation times per
+    segment decrease further to 0.035 s for the noise and 0.023 to 0.026 s
+    for the tone.
+
+    Parameters
+    ----------
+    fs_vector: list
+        Sampling frequencies [Hz]
+    duration: float
+        Signal duration [s]
+    n_runs: int
+        Number of runs per measure
+    """
+    print("fs [Hz] | signal      | time [s] | time per segment [s]")
+    for fs in fs_vector:
+        t = np.arange(int(duration * fs)) / fs
+        signals = {
+            "AM tone": am_sine_generator(np.sin(2 * np.pi * 70 * t), fs, 1000, 60)[0],
+            "white noise": 0.2 * np.random.default_rng(0).standard_normal(len(t)),
+        }
+        for name, signal in signals.items():
+            elapsed = np.inf
+            for _ in range(n_runs):
+                start = time.perf_counter()
+                R, _, _, _ = roughness_dw(signal, fs, overlap=0)
+                elapsed = min(elapsed, time.perf_counter() - start)
+            print(
+                "{:7d} | {:11s} | {:8.3f} | {:20.3f}".format(
+                    fs, name, elapsed, elapsed / len(R)
+                )
+            )
+
+
+if __name__ == "__main__":
+    benchmark_roughness_dw()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+# Standard imports
+import tracemalloc
+import numpy as np
+
+# Local application imports
+from mosqito.sq_metrics import roughness_ecma
+from mosqito.utils.am_sine_generator import am_sine_generator
+
+
+def benchmark_chunks_ecma(durations=[5, 10, 20], chunk_blocks=[None, 16, 64]):
+    """Memory peak of roughness_ecma depending on the number of time blocks
+    processed together
+
+    With chunk_blocks=16, the memory peak is about 160 MB whatever the
+    duration, while it grows by about 37 MB per second when all the blocks
+    are processed together (750 MB for 20 s).
+
+    Parameters
+    ----------
+    durations: list
+        Signal durations [s]
+    chunk_blocks: list
+        Numbers of blocks processed together (None for all the blocks)
+    """
+    fs = 48000
+
+    print("duration [s] | chunk_blocks | memory peak [MB]")
+    for duration in durations:
+        time = np.arange(int(duration * fs)) / fs
+        xmod = np.sin(2 * np.pi * 70 * time)
+        stimulus, _ = am_sine_generator(xmod, fs, 1000, 60)
+        for n_blocks in chunk_blocks:
+            tracemalloc.start()
+            roughness_ecma(stimulus, fs, chunk_blocks=n_blocks)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print("{:12.0f} | {:>12s} | {:16.1f}".format(duration, str(n_blocks), peak / 1e6))
+
+
+if __name__ == "__main__":
+    benchmark_chunks_ecma()
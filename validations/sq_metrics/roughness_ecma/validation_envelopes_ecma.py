@@ -0,0 +1,98 @@
+# Standard imports
+import sys
+import numpy as np
+from scipy.signal import hilbert, decimate
+
+# Local application imports
+from mosqito.sq_metrics import roughness_ecma
+from mosqito.sq_metrics.loudness.loudness_ecma._ecma_time_segmentation import (
+    _ecma_time_segmentation,
+)
+from mosqito.utils.am_sine_generator import am_sine_generator
+from input.references import ref_ecma
+
+# roughness_ecma module (the package exports the function under the same name)
+roughness_ecma_module = sys.modules[
+    "mosqito.sq_metrics.roughness.roughness_ecma.roughness_ecma"
+]
+
+
+def _block_envelopes(
+    bandpass_signals, sb, sh, n_blocks, downsampling_factor=32, start=0, *args
+):
+    """Envelopes computed block by block (ECMA-418-2 Formula 65), then
+    downsampled to 1500 Hz, size (n_blocks, 53, sb // downsampling_factor)"""
+    bandpass_signals = [signal[start:] for signal in bandpass_signals]
+    n_new = bandpass_signals[0].shape[0] - sb
+    block_array, _ = _ecma_time_segmentation(bandpass_signals, sb, sh, n_new)
+    envelopes = abs(hilbert(np.asarray(block_array)[:, :n_blocks]))
+    envelopes = decimate(envelopes, downsampling_factor // 4, axis=2)
+    envelopes = decimate(envelopes, 4, axis=2)
+    return np.transpose(envelopes, (1, 0, 2))
+
+
+def validation_envelopes_ecma(fc_vector, fm_vector):
+    """Deviation of the roughness computed with the envelopes of the
+    continuous band signals from the one computed with block-wise envelopes
+
+    roughness_ecma computes and downsamples the envelope of each band once,
+    on the continuous band-pass signal, before segmenting it into blocks.
+    The standard computes the envelope of each block, the results thus
+    differ by the edge effects of the Hilbert transform and of the
+    decimation filters at the block boundaries.
+
+    For the amplitude modulated tones of annex C of ECMA-418-2 (60 dB,
+    1.5 s), the relative deviation of the roughness values is below
+    2.5e-3, the largest deviations being found at fc = 125 Hz for the high
+    modulation frequencies, where the roughness is small. On the grid of
+    validation_roughness_ecma.py, the maximum deviations from the reference
+    values of the standard are unchanged: 10.8 %, 11.1 %, 4.2 %, 6.6 %,
+    9.5 %, 8.1 % and 13.5 % for fc = 125, 250, 500, 1000, 2000, 4000 and
+    8000 Hz.
+
+    Parameters
+    ----------
+    fc_vector: numpy.array
+        Carrier frequencies [Hz]
+    fm_vector: numpy.array
+        Modulation frequencies [Hz]
+
+    Outputs
+    -------
+    deviation : float
+        Maximum relative deviation of the roughness values
+    """
+    duration = 1.5
+    fs = 48000
+    time = np.linspace(0, duration, int(duration * fs))
+    level = 60
+
+    band_envelopes = roughness_ecma_module._band_envelopes
+    deviation = 0
+    print("fc [Hz] | fm [Hz] | R [asper] | R block-wise | R reference")
+    for fc in fc_vector:
+        for fm in fm_vector:
+            xmod = np.sin(2 * np.pi * fm * time)
+            stimulus, _ = am_sine_generator(xmod, fs, fc, level)
+            R, _, _, _, _ = roughness_ecma(stimulus, fs)
+            try:
+                roughness_ecma_module._band_envelopes = _block_envelopes
+                R_block, _, _, _, _ = roughness_ecma(stimulus, fs)
+            finally:
+                roughness_ecma_module._band_envelopes = band_envelopes
+            deviation = max(deviation, abs(R - R_block) / R_block)
+            print(
+                "{:7d} | {:7.1f} | {:9.4f} | {:12.4f} | {:11.4f}".format(
+                    fc, fm, R, R_block, ref_ecma(fc, fm)
+                )
+            )
+    print("Maximum relative deviation: {:.2e}".format(deviation))
+
+    return deviation
+
+
+# test de la fonction
+if __name__ == "__main__":
+    fc_vector = np.array([125, 1000, 8000])
+    fm_vector = np.logspace(np.log10(20), np.log10(250), 8, base=10)
+    validation_envelopes_ecma(fc_vector, fm_vector)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+# Standard imports
+import time
+import tracemalloc
+import numpy as np
+
+# Local application imports
+from mosqito.sq_metrics import roughness_ecma, loudness_ecma
+from mosqito.utils.am_sine_generator import am_sine_generator
+from input.references import ref_ecma
+
+
+def validation_float32_ecma(fc_vector, fm_vector, duration=10):
+    """Deviation of the single precision computation of roughness_ecma and
+    loudness_ecma from the double precision one, and gain in time and memory
+
+    The amplitude modulated tones of annex C of ECMA-418-2 (60 dB, 1.5 s)
+    are computed with dtype='float32' and dtype='float64'. Then the
+    computation time and memory peak of roughness_ecma are measured for a
+    signal of the given duration.
+
+    On the grid below, the maximum relative deviations are 6.5e-7 for the
+    roughness and 3.7e-9 for the loudness. For a 10 s signal, the memory
+    peak of roughness_ecma decreases from 313 MB to 162 MB and the
+    computation time from 4.1 s to 3.6 s: the recursive filters are
+    computed in double precision in both cases, and the FFTs are hardly
+    faster in single precision.
+
+    Parameters
+    ----------
+    fc_vector: numpy.array
+        Carrier frequencies [Hz]
+    fm_vector: numpy.array
+        Modulation frequencies [Hz]
+    duration: float, optional
+        Duration [s] of the signal used for the time and memory measures
+
+    Outputs
+    -------
+    deviation_R : float
+        Maximum relative deviation of the roughness values
+    deviation_N : float
+        Maximum relative deviation of the loudness values
+    """
+    fs = 48000
+    t = np.linspace(0, 1.5, int(1.5 * fs))
+    level = 60
+
+    deviation_R = 0
+    deviation_N = 0
+    print("fc [Hz] | fm [Hz] | R float64 | R float32 | R reference | N float64 | N float32")
+    for fc in fc_vector:
+        for fm in fm_vector:
+            xmod = np.sin(2 * np.pi * fm * t)
+            stimulus, _ = am_sine_generator(xmod, fs, fc, level)
+            R64 = roughness_ecma(stimulus, fs)[0]
+            R32 = roughness_ecma(stimulus, fs, dtype="float32")[0]
+            N64 = loudness_ecma(stimulus, fs)[0]
+            N32 = loudness_ecma(stimulus, fs, dtype="float32")[0]
+            deviation_R = max(deviation_R, abs(R32 - R64) / R64)
+            deviation_N = max(deviation_N, abs(N32 - N64) / N64)
+            print(
+                "{:7d} | {:7.1f} | {:9.4f} | {:9.4f} | {:11.4f} | {:9.4f} | {:9.4f}".format(
+                    fc, fm, R64, R32, ref_ecma(fc, fm), N64, N32
+                )
+            )
+    print("Maximum relative deviation of R: {:.2e}".format(deviation_R))
+    print("Maximum relative deviation of N: {:.2e}".format(deviation_N))
+
+    # Computation time and memory peak
+    t = np.arange(int(duration * fs)) / fs
+    stimulus, _ = am_sine_generator(np.sin(2 * np.pi * 70 * t), fs, 1000, level)
+    print("dtype   | time [s] | memory peak [MB]")
+    for dtype in ["float64", "float32"]:
+        start = time.perf_counter()
+        roughness_ecma(stimulus, fs, dtype=dtype)
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        roughness_ecma(stimulus, fs, dtype=dtype)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("{:7s} | {:8.2f} | {:16.1f}".format(dtype, elapsed, peak / 1e6))
+
+    return deviation_R, deviation_N
+
+
+# test de la fonction
+if __name__ == "__main__":
+    fc_vector = np.array([125, 250, 500, 1000, 2000, 4000, 8000])
+    fm_vector = np.logspace(np.log10(20), np.log10(250), 8, base=10)
+    validation_float32_ecma(fc_vector, fm_vector)